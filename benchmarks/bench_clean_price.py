@@ -0,0 +1,62 @@
+"""
+Micro-benchmark of main.clean_price against the original character-by-character parser.
+
+Run from the repository root:
+    python -m benchmarks.bench_clean_price
+"""
+import random
+import timeit
+from main import clean_price, clean_prices, _parse_price
+
+def legacy_clean_price(price_str):
+    """The original clean_price, kept verbatim for comparison."""
+    if price_str is None or price_str == "Error":
+        return None
+    price_str = ''.join(c for c in price_str if c.isdigit() or c in '.,')
+    if '.' in price_str and ',' in price_str:
+        if price_str.rfind(',') > price_str.rfind('.'):
+            price_str = price_str.replace('.', '').replace(',', '.')
+        else:
+            price_str = price_str.replace(',', '')
+    elif ',' in price_str:
+        if price_str.count(',') > 1 or (price_str.count(',') == 1 and len(price_str.split(',')[1]) == 3):
+            price_str = price_str.replace(',', '')
+        else:
+            price_str = price_str.replace(',', '.')
+    try:
+        return float(price_str)
+    except (ValueError, TypeError):
+        return None
+
+def make_quotes(count, distinct):
+    """Builds `count` quote strings drawn from `distinct` different values, like repeated live-tab reads."""
+    rng = random.Random(42)
+    pool = []
+    for _ in range(distinct):
+        value = rng.uniform(0.5, 120000)
+        pool.append(rng.choice([f"{value:,.2f}", f"$ {value:,.2f} USD", f"{value:.4f}"]))
+    return [rng.choice(pool) for _ in range(count)]
+
+def bench(label, func, repeat=5):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print(f"{label:<40} {best * 1000:8.2f} ms")
+    return best
+
+def main():
+    for distinct in (50, 100000):
+        quotes = make_quotes(100000, distinct)
+        assert [legacy_clean_price(q) for q in quotes[:1000]] == [clean_price(q) for q in quotes[:1000]]
+        print(f"\n100000 quotes, {distinct} distinct strings")
+        legacy = bench("legacy clean_price", lambda: [legacy_clean_price(q) for q in quotes])
+
+        def uncached():
+            _parse_price.cache_clear()
+            return [clean_price(q) for q in quotes]
+
+        bench("clean_price (cold cache)", uncached)
+        fast = bench("clean_price (warm cache)", lambda: [clean_price(q) for q in quotes])
+        batch = bench("clean_prices batch (warm cache)", lambda: clean_prices(quotes))
+        print(f"{'speed-up (warm, per call / batch)':<40} {legacy / fast:7.1f}x / {legacy / batch:.1f}x")
+
+if __name__ == "__main__":
+    main()
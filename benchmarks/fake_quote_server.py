@@ -0,0 +1,183 @@
+"""
+A local stand-in for a quote site, serving one price page per generated symbol.
+
+Every page shows its price in `<span class="price">`, the element the default
+tradingview.com locator looks for. Latency, jitter, a JavaScript rendering delay and
+a failure rate are configurable, so scraping behaviour can be measured offline.
+
+Run on its own to browse the pages:
+    python -m benchmarks.fake_quote_server --symbols 20 --port 8090
+"""
+import argparse
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+
+# The price is written by a script after `delay` ms, like a page that renders quotes client-side
+DEFERRED_PAGE = """<!DOCTYPE html>
+<html><head><title>{symbol}</title></head>
+<body>
+<h1>{symbol}</h1>
+<div class="quote"><span class="price" style="display:none"></span></div>
+<script>
+setTimeout(function () {{
+    var el = document.querySelector('.price');
+    el.textContent = '{price}';
+    el.style.display = 'inline';
+}}, {delay});
+</script>
+</body></html>
+"""
+
+# The price is in the markup itself, so the HTTP fast path can read it
+STATIC_PAGE = """<!DOCTYPE html>
+<html><head><title>{symbol}</title></head>
+<body>
+<h1>{symbol}</h1>
+<div class="quote"><span class="price">{price}</span></div>
+</body></html>
+"""
+
+# Served instead of the quote for a share of requests: a consent wall without the price element
+FAILURE_PAGE = """<!DOCTYPE html>
+<html><head><title>Before you continue</title></head>
+<body><div class="consent">We use cookies. <button>Accept</button></div></body></html>
+"""
+
+
+class QuoteServer:
+    """
+    Serves /quote/<symbol> pages whose prices follow a random walk.
+
+    Attributes:
+        requests (dict): The number of requests served per symbol.
+        failures (int): The number of failure pages or 503s served.
+    """
+
+    def __init__(self, symbols: int = 10, latency: float = 0.0, jitter: float = 0.0, render_delay: float = 0.0,
+                 failure_rate: float = 0.0, host: str = "127.0.0.1", port: int = 0, seed: int = 42):
+        """
+        Initializes and starts the server.
+
+        Args:
+            symbols (int): The number of symbol pages to generate.
+            latency (float): Seconds the server waits before answering.
+            jitter (float): The maximum random extra latency in seconds.
+            render_delay (float): Seconds before the page's script shows the price (0 serves it in the markup).
+            failure_rate (float): The share of requests answered with a 503 or a consent page.
+            host (str): The interface to bind.
+            port (int): The TCP port; 0 picks a free one.
+            seed (int): Seeds prices and failures so runs are repeatable.
+        """
+        self.symbols = [f"SYM{index:04d}" for index in range(symbols)]
+        self.latency = latency
+        self.jitter = jitter
+        self.render_delay = render_delay
+        self.failure_rate = failure_rate
+        self.requests = dict.fromkeys(self.symbols, 0)
+        self.failures = 0
+
+        self._rng = random.Random(seed)
+        self._prices = {symbol: self._rng.uniform(1, 100000) for symbol in self.symbols}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="quote-server", daemon=True)
+        self._thread.start()
+
+    def url(self, symbol: str) -> str:
+        """Returns the page URL of a symbol."""
+        return f"http://{self.host}:{self.port}/quote/{symbol}"
+
+    def price(self, symbol: str) -> float:
+        """Returns the symbol's current price."""
+        with self._lock:
+            return self._prices[symbol]
+
+    def _next_quote(self, symbol: str):
+        """Advances the symbol's random walk; returns (price, failure, delay) with failure None, 'outage' or 'consent'."""
+        with self._lock:
+            self.requests[symbol] += 1
+            price = self._prices[symbol] = max(0.01, self._prices[symbol] * (1 + self._rng.gauss(0, 0.001)))
+            failure = None
+            if self._rng.random() < self.failure_rate:
+                self.failures += 1
+                # Alternate between an outage and a page that loads but has no price on it
+                failure = "outage" if self.failures % 2 else "consent"
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        return price, failure, delay
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like a real site behind a CDN
+            disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+            def do_GET(self):
+                prefix, _, symbol = self.path.partition('/quote/')
+                symbol = unquote(symbol.split('?')[0])
+                if prefix or symbol not in server.requests:
+                    self._reply(404, "not found")
+                    return
+
+                price, failure, delay = server._next_quote(symbol)
+                if delay:
+                    time.sleep(delay)
+                if failure == "outage":
+                    self._reply(503, "service unavailable")
+                    return
+                if failure == "consent":
+                    self._reply(200, FAILURE_PAGE)
+                    return
+
+                text = f"{price:,.2f}"
+                if server.render_delay > 0:
+                    body = DEFERRED_PAGE.format(symbol=symbol, price=text, delay=int(server.render_delay * 1000))
+                else:
+                    body = STATIC_PAGE.format(symbol=symbol, price=text)
+                self._reply(200, body)
+
+            def _reply(self, status: int, body: str):
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def close(self):
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--symbols', type=int, default=10)
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--render-delay', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--port', type=int, default=8090)
+    args = parser.parse_args()
+
+    server = QuoteServer(args.symbols, args.latency, args.jitter, args.render_delay, args.failure_rate, port=args.port)
+    print(f"Serving {len(server.symbols)} symbols, e.g. {server.url(server.symbols[0])}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+A local fake of the Telegram Bot API's sendMessage method.
+
+It records every call and enforces a per-chat token bucket the way Telegram does,
+answering 429 with 'retry_after' once the bucket is empty. Point TelegramNotifier at it
+with `api_url=fake.url` or the TELEGRAM_API_URL environment variable.
+"""
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FakeTelegram:
+    """
+    Serves POST /bot<token>/sendMessage.
+
+    Attributes:
+        messages (list): (timestamp, chat_id, text) of every accepted message.
+        rejected (int): The number of requests answered with 429.
+    """
+
+    def __init__(self, rate_per_second: float = 1.0, burst: int = 3, latency: float = 0.0,
+                 host: str = "127.0.0.1", port: int = 0):
+        """
+        Initializes and starts the server.
+
+        Args:
+            rate_per_second (float): Messages per second allowed per chat.
+            burst (int): Messages a chat may send back to back.
+            latency (float): Seconds the server waits before answering.
+            host (str): The interface to bind.
+            port (int): The TCP port; 0 picks a free one.
+        """
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.latency = latency
+        self.messages = []
+        self.rejected = 0
+
+        self._buckets = {}  # chat_id -> (tokens, refilled_at)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-telegram", daemon=True)
+        self._thread.start()
+
+    @property
+    def url(self) -> str:
+        """The base URL to use instead of https://api.telegram.org."""
+        return f"http://{self.host}:{self.port}"
+
+    def _accept(self, chat_id, text: str):
+        """Takes a token for the chat; returns 0 if the message is accepted, else the seconds to wait."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, refilled_at = self._buckets.get(chat_id, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - refilled_at) * self.rate_per_second)
+            if tokens < 1:
+                self._buckets[chat_id] = (tokens, now)
+                self.rejected += 1
+                return max(1, math.ceil((1 - tokens) / self.rate_per_second))
+            self._buckets[chat_id] = (tokens - 1, now)
+            self.messages.append((time.time(), chat_id, text))
+            return 0
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                if not (self.path.startswith('/bot') and self.path.endswith('/sendMessage')):
+                    self._reply(404, {"ok": False, "error_code": 404, "description": "Not Found"})
+                    return
+                try:
+                    payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+                except ValueError:
+                    self._reply(400, {"ok": False, "error_code": 400, "description": "Bad Request"})
+                    return
+                if fake.latency:
+                    time.sleep(fake.latency)
+
+                retry_after = fake._accept(payload.get('chat_id'), payload.get('text', ''))
+                if retry_after:
+                    self._reply(429, {
+                        "ok": False, "error_code": 429,
+                        "description": f"Too Many Requests: retry after {retry_after}",
+                        "parameters": {"retry_after": retry_after},
+                    })
+                else:
+                    self._reply(200, {"ok": True, "result": {"message_id": len(fake.messages)}})
+
+            def _reply(self, status: int, body: dict):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def close(self):
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -0,0 +1,333 @@
+"""
+Offline end-to-end benchmark against a local fake quote site and a fake Telegram API.
+
+Modes:
+    http     scrape_asset() with the HTTP fetcher only; needs no browser.
+    scraper  scrape_asset() with a ScraperPool of real Selenium sessions (--hub, "local" by default).
+    main     the real main() loop, driven by a generated config.json in a temporary directory.
+
+It reports throughput, p50/p99 latency per asset, errors, Telegram traffic and the memory of
+this Python process over time (browser processes are not included).
+
+Run from the repository root, e.g.:
+    python -m benchmarks.harness --mode http --symbols 50 --duration 20 --latency 0.05 --jitter 0.05
+    python -m benchmarks.harness --mode scraper --symbols 10 --render-delay 0.5 --concurrency 2
+    python -m benchmarks.harness --mode main --symbols 10 --interval 5 --duration 60 --json report.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import re
+import resource
+import socket
+import tempfile
+import threading
+import time
+import _thread
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from benchmarks.fake_quote_server import QuoteServer
+from benchmarks.fake_telegram import FakeTelegram
+
+LOCATOR = {"by": "CLASS_NAME", "value": "price"}
+
+
+def rss_mb() -> float:
+    """Returns the resident memory of this process in MiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class MemorySampler:
+    """Samples the process RSS at a fixed interval in a background thread."""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.samples = []
+        self._started = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-sampler", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self.samples.append((round(time.monotonic() - self._started, 1), round(rss_mb(), 1)))
+            if self._stop.wait(self.interval):
+                return
+
+    def stop(self) -> list:
+        self._stop.set()
+        self._thread.join()
+        return self.samples
+
+
+def percentile(values: list, q: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * len(ordered) + 0.5)) - 1))]
+
+
+def histogram_quantile(q: float, buckets: list) -> float:
+    """Estimates a quantile from cumulative (upper_bound, count) buckets, like Prometheus does."""
+    total = buckets[-1][1]
+    if not total:
+        return 0.0
+    rank = q * total
+    lower_bound, lower_count = 0.0, 0
+    for bound, count in buckets:
+        if count >= rank:
+            if bound == float('inf'):
+                return lower_bound
+            return lower_bound + (bound - lower_bound) * (rank - lower_count) / max(1, count - lower_count)
+        lower_bound, lower_count = bound, count
+    return lower_bound
+
+
+class HttpOnlyScraper:
+    """Adapts HttpFetcher to the scraper interface scrape_asset() expects."""
+
+    def __init__(self, pool_size: int):
+        from scrapers.http_fetcher import HttpFetcher
+        self.fetcher = HttpFetcher(pool_size=pool_size)
+
+    def scrape(self, url: str, locator_info: dict) -> str:
+        return self.fetcher.fetch(url, locator_info) or "Error"
+
+    def close(self):
+        self.fetcher.close()
+
+
+def alerts_for(server: QuoteServer) -> dict:
+    """One 'above' rule per symbol at its starting price, so the random walk keeps crossing it."""
+    return {symbol: {"above": round(server.price(symbol), 2)} for symbol in server.symbols}
+
+
+def run_direct(args, server: QuoteServer, telegram: FakeTelegram) -> dict:
+    """Runs rounds of scrape_asset() over every symbol for the given duration."""
+    from main import scrape_asset
+    from scrapers.alerts import AlertEngine
+    from scrapers.config import Asset, Source
+    from scrapers.metrics import Metrics
+    from scrapers.notifications import NotificationDispatcher, TelegramNotifier
+
+    if args.mode == "http":
+        scraper = HttpOnlyScraper(args.concurrency)
+    else:
+        import functools
+        from scrapers.pool import ScraperPool
+        from scrapers.scraper import Scraper
+        from scrapers.waits import AdaptiveWait
+        waits = AdaptiveWait() if args.adaptive else None
+        factory = functools.partial(Scraper, lean_mode={"enabled": args.lean}, waits=waits)
+        scraper = ScraperPool(args.hub, args.concurrency, scraper_factory=factory)
+
+    assets = [
+        Asset(symbol, "bench", server.url(symbol), 0, LOCATOR, ".", None, (Source(server.url(symbol), LOCATOR, ".", {}),))
+        for symbol in server.symbols
+    ]
+    engine = AlertEngine(alerts_for(server))
+    notifier = NotificationDispatcher(
+        TelegramNotifier(session=requests.Session()), coalesce_window=1.0, rate_per_second=1.0, burst=3
+    )
+    metrics = Metrics()  # Only its success/error counters are used; latency is timed here exactly
+    latencies = {asset.name: [] for asset in assets}
+    cycles = 0
+
+    def timed(asset):
+        started = time.perf_counter()
+        scrape_asset(asset, scraper, engine, notifier, metrics=metrics)
+        return asset.name, time.perf_counter() - started
+
+    deadline = time.monotonic() + args.duration
+    started = time.monotonic()
+    # scrape_asset prints every price; stdout is swapped once here, as redirect_stdout is not thread-safe
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        while time.monotonic() < deadline:
+            for name, seconds in executor.map(timed, assets):
+                latencies[name].append(seconds)
+            cycles += 1
+    elapsed = time.monotonic() - started
+
+    notifier.close()
+    scraper.close()
+    scrapes = sum(len(values) for values in latencies.values())
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "cycles": cycles,
+        "cycles_per_minute": round(60 * cycles / elapsed, 2),
+        "scrapes": scrapes,
+        "scrapes_per_second": round(scrapes / elapsed, 2),
+        "latency_ms": {
+            name: {"p50": round(1000 * percentile(values, 0.5), 2), "p99": round(1000 * percentile(values, 0.99), 2)}
+            for name, values in latencies.items() if values
+        },
+        "errors": sum(entry.get("scrapes", {}).get("error", 0) for entry in metrics.summary().values()),
+        "all_latencies_ms": [1000 * value for values in latencies.values() for value in values],
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def parse_metrics(text: str) -> dict:
+    """Collects cycle histograms and scrape counters per asset from Prometheus text."""
+    buckets, scrapes = {}, {}
+    bucket_line = re.compile(r'price_scraper_phase_seconds_bucket\{asset="(.*?)",phase="cycle",le="(.*?)"\} (\d+)')
+    counter_line = re.compile(r'price_scraper_scrapes_total\{asset="(.*?)",outcome="(.*?)"\} (\d+)')
+    for line in text.splitlines():
+        match = bucket_line.match(line)
+        if match:
+            bound = float('inf') if match[2] == '+Inf' else float(match[2])
+            buckets.setdefault(match[1], []).append((bound, int(match[3])))
+            continue
+        match = counter_line.match(line)
+        if match:
+            scrapes.setdefault(match[1], {})[match[2]] = int(match[3])
+    return {"buckets": buckets, "scrapes": scrapes}
+
+
+def run_main(args, server: QuoteServer, telegram: FakeTelegram) -> dict:
+    """Runs the real main() in this thread until the duration is over."""
+    import main as app
+
+    metrics_port = free_port()
+    config = {
+        "settings": {
+            "scraping_interval_seconds": args.interval,
+            "selenium_hub_url": args.hub,
+            "scraper_pool_size": args.concurrency,
+            "max_concurrent_scrapes": args.concurrency,
+            "http_fast_path": args.mode_fast_path,
+            "config_reload_seconds": 0,
+            "history_dir": "history",
+            "lean_mode": {"enabled": args.lean},
+            "adaptive_wait": {"enabled": args.adaptive},
+            "notifications": {"coalesce_window_seconds": 1, "rate_per_second": 1, "burst": 3},
+            "metrics": {"enabled": True, "port": metrics_port},
+        },
+        "assets": {"bench": {symbol: {"url": server.url(symbol)} for symbol in server.symbols}},
+        "alerts": alerts_for(server),
+        "locators": {"tradingview.com": {**LOCATOR, "decimal_separator": "."}},
+    }
+    result = {}
+
+    def stop_after_duration():
+        time.sleep(args.duration)
+        try:
+            result["metrics"] = requests.get(f"http://127.0.0.1:{metrics_port}/metrics", timeout=5).text
+        except requests.exceptions.RequestException as e:
+            logging.error(f"Could not read metrics: {e}")
+        _thread.interrupt_main()
+
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            with open('config.json', 'w', encoding='utf-8') as f:
+                json.dump(config, f)
+            threading.Thread(target=stop_after_duration, daemon=True).start()
+            started = time.monotonic()
+            with contextlib.redirect_stdout(io.StringIO()):
+                try:
+                    app.main()
+                except KeyboardInterrupt:
+                    pass
+            elapsed = time.monotonic() - started
+        finally:
+            os.chdir(previous_dir)
+
+    parsed = parse_metrics(result.get("metrics", ""))
+    scrapes = sum(sum(outcomes.values()) for outcomes in parsed["scrapes"].values())
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "scrapes": scrapes,
+        "scrapes_per_second": round(scrapes / args.duration, 2),
+        "cycles_per_minute": round(60 * scrapes / len(server.symbols) / args.duration, 2),
+        "errors": sum(outcomes.get("error", 0) for outcomes in parsed["scrapes"].values()),
+        "latency_ms": {
+            asset: {
+                "p50": round(1000 * histogram_quantile(0.5, buckets), 2),
+                "p99": round(1000 * histogram_quantile(0.99, buckets), 2),
+            }
+            for asset, buckets in parsed["buckets"].items()
+        },
+    }
+
+
+def print_report(report: dict, top: int):
+    print(f"\nMode {report['mode']}: {report['symbols']} symbols for {report['elapsed_seconds']} s")
+    print(f"  throughput        {report['scrapes_per_second']} scrapes/s, {report['cycles_per_minute']} cycles/min")
+    if "overall_ms" in report:
+        print(f"  latency overall   p50 {report['overall_ms']['p50']} ms, p99 {report['overall_ms']['p99']} ms")
+    slowest = sorted(report["latency_ms"].items(), key=lambda item: item[1]["p99"], reverse=True)[:top]
+    for asset, values in slowest:
+        print(f"  {asset:<16}  p50 {values['p50']:>9} ms   p99 {values['p99']:>9} ms")
+    print(f"  errors            {report['errors']} of {report['scrapes']} scrapes")
+    print(f"  server            {report['server_requests']} requests, {report['server_failures']} failures injected")
+    print(f"  telegram          {report['telegram_messages']} messages accepted, {report['telegram_rejected']} rate-limited")
+    memory = report["memory_mb"]
+    if memory:
+        print(f"  memory (RSS MiB)  start {memory[0][1]}, peak {max(value for _, value in memory)}, end {memory[-1][1]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mode', choices=("http", "scraper", "main"), default="http")
+    parser.add_argument('--symbols', type=int, default=20)
+    parser.add_argument('--duration', type=float, default=15.0, help="Seconds to run.")
+    parser.add_argument('--concurrency', type=int, default=4, help="Parallel scrapes (pool size).")
+    parser.add_argument('--interval', type=float, default=5.0, help="Per-asset interval in main mode.")
+    parser.add_argument('--hub', default="local", help="Selenium hub URL, or 'local'.")
+    parser.add_argument('--lean', action='store_true', help="Enable lean mode in Selenium sessions.")
+    parser.add_argument('--adaptive', action='store_true', help="Use adaptive element waits in Selenium sessions.")
+    parser.add_argument('--no-fast-path', dest='mode_fast_path', action='store_false', help="Main mode: Selenium only.")
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--render-delay', type=float, default=0.0)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--telegram-rate', type=float, default=1.0)
+    parser.add_argument('--top', type=int, default=5, help="How many of the slowest assets to list.")
+    parser.add_argument('--json', help="Also write the full report to this file.")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    server = QuoteServer(args.symbols, args.latency, args.jitter, args.render_delay, args.failure_rate)
+    telegram = FakeTelegram(rate_per_second=args.telegram_rate)
+    os.environ.update(TELEGRAM_TOKEN="bench", TELEGRAM_CHAT_ID="1", TELEGRAM_API_URL=telegram.url)
+    sampler = MemorySampler()
+    try:
+        report = run_main(args, server, telegram) if args.mode == "main" else run_direct(args, server, telegram)
+    finally:
+        memory = sampler.stop()
+        server.close()
+        telegram.close()
+
+    all_latencies = report.pop("all_latencies_ms", None)
+    if all_latencies:
+        report["overall_ms"] = {"p50": round(percentile(all_latencies, 0.5), 2), "p99": round(percentile(all_latencies, 0.99), 2)}
+    report.update(
+        mode=args.mode,
+        symbols=args.symbols,
+        server_requests=sum(server.requests.values()),
+        server_failures=server.failures,
+        telegram_messages=len(telegram.messages),
+        telegram_rejected=telegram.rejected,
+        memory_mb=memory,
+    )
+    print_report(report, args.top)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,43 @@
 # main.py
+import argparse
 import json
-import time
+import asyncio
+import datetime
+import functools
 import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+# Taken before the heavier imports below, so the startup report includes them
+_STARTED = time.perf_counter()
+
+import requests
 from scrapers.scraper import Scraper
-from scrapers.notifications import TelegramNotifier
+from scrapers.live_tabs import LiveTabScraper
+from scrapers.pool import ScraperPool
+from scrapers.http_fetcher import HttpFetcher, FetchRouter
+from scrapers.scheduler import AssetScheduler
+from scrapers.history import PriceHistory
+from scrapers.alerts import AlertEngine
+from scrapers.config import AppConfig, ConfigError, ConfigWatcher
+from scrapers.driver_cache import DriverCache
+from scrapers.failure_capture import FailureCapture
+from scrapers.hub_balancer import HubBalancer
+from scrapers.notifications import TelegramNotifier, NotificationDispatcher
+from scrapers.metrics import Metrics, MetricsServer, NULL_METRICS
+from scrapers.waits import AdaptiveWait
+from scrapers.market_hours import MarketHours
+from scrapers.price_feed import PriceFeed, PriceFeedServer
+from scrapers.log_pipeline import LogPipeline, log_price
+from scrapers.replay import VirtualClock, open_ticks, replay
+from scrapers.work_queue import QueueCoordinator, QueueWorker, WorkQueue
 
 def load_json(filename):
     """Safely load a JSON file."""
@@ -14,40 +48,66 @@ def load_json(filename):
         logging.error(f"Error loading {filename}: {e}")
         return None
 
-def clean_price(price_str):
-    """
-    Cleans a price string by removing commas and other non-numeric characters,
-    then converts it to a float. It can handle both '.' and ',' as decimal separators.
-    """
-    if price_str is None or price_str == "Error":
-        return None
-    
-    # Remove any non-digit, non-comma, non-period characters
-    price_str = ''.join(c for c in price_str if c.isdigit() or c in '.,')
+# Sequence table for str.translate: deletes everything but digits and separators in one C-level pass.
+# It covers Latin, Cyrillic, Arabic, spaces and currency signs; rarer characters take the slow path.
+_PRICE_CHARS_TABLE = [chr(code) if chr(code).isdigit() or chr(code) in '.,' else None for code in range(0x2100)]
+
+def _normalize_separators(price_str, decimal_separator=None):
+    """Rewrites a digits-and-separators string into float() syntax."""
+    if decimal_separator == ',':
+        return price_str.replace('.', '').replace(',', '.')
+    if decimal_separator == '.':
+        return price_str.replace(',', '')
 
-    # If both separators are present, determine which is decimal
+    # No format hint: guess. If both separators are present, determine which is decimal
     if '.' in price_str and ',' in price_str:
         if price_str.rfind(',') > price_str.rfind('.'):
             # Format is "1.234,56" -> "1234.56"
-            price_str = price_str.replace('.', '').replace(',', '.')
-        else:
-            # Format is "1,234.56" -> "1234.56"
-            price_str = price_str.replace(',', '')
+            return price_str.replace('.', '').replace(',', '.')
+        # Format is "1,234.56" -> "1234.56"
+        return price_str.replace(',', '')
     # If only one comma is present
-    elif ',' in price_str:
+    if ',' in price_str:
         # If it's a thousands separator (e.g., "1,234" or "1,234,567")
-        if price_str.count(',') > 1 or (price_str.count(',') == 1 and len(price_str.split(',')[1]) == 3):
-             price_str = price_str.replace(',', '')
+        if price_str.count(',') > 1 or len(price_str.split(',')[1]) == 3:
+            return price_str.replace(',', '')
         # Otherwise, it's a decimal separator
-        else:
-             price_str = price_str.replace(',', '.')
+        return price_str.replace(',', '.')
+    return price_str
+
+@functools.lru_cache(maxsize=4096)
+def _parse_price(price_str, decimal_separator):
+    cleaned = price_str.translate(_PRICE_CHARS_TABLE)
+    if not cleaned.isascii():
+        # Slow path: non-ASCII digits, or characters beyond the table that translate leaves untouched
+        cleaned = ''.join(c for c in cleaned if c.isdigit() or c in '.,')
 
+    cleaned = _normalize_separators(cleaned, decimal_separator)
     try:
-        return float(price_str)
+        return float(cleaned)
     except (ValueError, TypeError):
-        logging.error(f"Could not convert string to float: {price_str}")
+        logging.error(f"Could not convert string to float: {cleaned}")
         return None
 
+def clean_price(price_str, decimal_separator=None):
+    """
+    Cleans a price string by removing commas and other non-numeric characters,
+    then converts it to a float. It can handle both '.' and ',' as decimal separators.
+
+    A `decimal_separator` hint ('.' or ',') from the asset or locator config removes the
+    guessing, so "1,234" parses as 1.234 for ',' and as 1234.0 for '.'. Results for
+    repeated strings come from a bounded LRU cache.
+    """
+    if price_str is None or price_str == "Error":
+        return None
+    return _parse_price(price_str, decimal_separator)
+
+def clean_prices(price_strs, decimal_separator=None):
+    """Cleans a batch of price strings with the same format hint; see clean_price."""
+    parse = _parse_price
+    return [None if price_str is None or price_str == "Error" else parse(price_str, decimal_separator)
+            for price_str in price_strs]
+
 def check_alerts(asset_name, price, alerts_config, notifier):
     """Check if the price triggers any alerts."""
     if asset_name not in alerts_config:
@@ -65,63 +125,544 @@ def check_alerts(asset_name, price, alerts_config, notifier):
     if message:
         notifier.send_alert(message)
 
-def main():
+def parse_scraped(source, scraped):
     """
-    Main function to run the scraper periodically.
+    Parse what was scraped from one source into (price, fields), or None if there is no price.
+    Numeric fields are cleaned like prices; text fields are kept as scraped.
     """
+    if not source.fields:
+        price = clean_price(scraped, source.decimal_separator)
+        return None if price is None else (price, {})
+    price = clean_price(scraped.get('price'), source.decimal_separator)
+    if price is None:
+        return None
+    fields = {}
+    for name, locator in source.fields.items():
+        value = scraped.get(name)
+        fields[name] = clean_price(value, source.decimal_separator) if locator['numeric'] else value
+    return price, fields
+
+def fetch_price(asset, scraper, metrics=NULL_METRICS):
+    """
+    Scrape one asset and parse what was scraped into (price, fields, source_url).
+    The price is None on failure, and the source is None when every source failed.
+    """
+    source = asset.sources[0]
+    if len(asset.sources) > 1:
+        # Alternative sources are hedged, so one slow or blocking provider does not stall the quote
+        result, index = scraper.scrape_first(
+            [(source.url, source.locator_info, source.fields) for source in asset.sources],
+            lambda index, scraped: parse_scraped(asset.sources[index], scraped),
+        )
+        source = asset.sources[index] if index is not None else None
+    else:
+        if source.fields:
+            # Every field comes from the same page load as the price
+            scraped = scraper.scrape_fields(source.url, source.locator_info, source.fields)
+        else:
+            scraped = scraper.scrape(source.url, source.locator_info)
+        with metrics.timer("parse"):
+            result = parse_scraped(source, scraped)
+    price, fields = result or (None, {})
+    if price is not None:
+        # Live tabs know when the price last changed on the page, not just when it was read;
+        # adapters such as the benchmark's HTTP-only scraper do not track changes at all
+        last_changed = getattr(scraper, 'last_changed', None)
+        changed_at = last_changed(source.url) if callable(last_changed) else None
+        if changed_at is not None:
+            fields = {**fields, 'changed_at': changed_at}
+    metrics.increment("scrapes", "success" if price is not None else "error")
+    return price, fields, source.url if source and price is not None else None
+
+def report_price(asset, price, fields, alert_engine, notifier, history=None, market=None, metrics=NULL_METRICS,
+                 latency_ms=None, source=None, feed=None):
+    """Report a scraped price, then record it, publish it on the price feed and check its alerts."""
+    message = f"Cena dla {asset.name}: {price if price is not None else 'Error'}"
+    if fields:
+        message += " (" + ", ".join(f"{name}: {value if value is not None else '-'}" for name, value in fields.items()) + ")"
+    log_price(message, asset.name, price, fields, latency_ms, source)
+
+    if price is not None:
+        if market:
+            market.remember(asset.name, price)
+        if history:
+            history.append(asset.name, price)
+        if feed:
+            feed.publish(asset.name, price, fields, source)
+        with metrics.timer("alert"):
+            alert_engine.check(asset.name, price, notifier)
+
+def scrape_asset(asset, scraper, alert_engine, notifier, history=None, metrics=None, market=None, feed=None):
+    """
+    Scrape one asset, report and record its price and check its alerts. Runs in a scheduler thread.
+    While the asset's market is closed, the last known price is reported instead, apart from heartbeat scrapes.
+    """
+    if market and not market.should_scrape(asset):
+        last_price = market.last_price(asset.name)
+        if last_price is not None:
+            log_price(f"Cena dla {asset.name}: {last_price} (rynek zamknięty)", asset.name, last_price)
+        return
+
+    metrics = metrics or NULL_METRICS
+    with metrics.track(asset.name):
+        started = time.perf_counter()
+        price, fields, source = fetch_price(asset, scraper, metrics)
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        report_price(asset, price, fields, alert_engine, notifier, history, market, metrics, latency_ms, source, feed)
+
+# Settings that shape the sessions and workers built at startup; changing them needs a restart
+RESTART_SETTINGS = (
+    'selenium_hubs', 'scraper_pool_size', 'max_concurrent_scrapes', 'watch_mode',
+    'http_fast_path', 'history_dir', 'sections',
+)
+
+def apply_config(old_config, new_config, scheduler, make_job, alert_engine):
+    """
+    Apply a reloaded config in place: reschedule added, changed and removed assets and
+    swap the alert rules, keeping scraper sessions and alert state alive.
+    """
+    old_assets = {asset.name: asset for asset in old_config.assets}
+    new_assets = {asset.name: asset for asset in new_config.assets}
+
+    for name in old_assets.keys() - new_assets.keys():
+        scheduler.remove(name)
+        logging.info(f"Usunięto aktywo: {name}")
+    for name, asset in new_assets.items():
+        if old_assets.get(name) != asset:
+            scheduler.add(name, asset.interval, make_job(asset))
+            logging.info(f"{'Zmieniono' if name in old_assets else 'Dodano'} aktywo: {name} (co {asset.interval:g} s)")
+
+    alert_engine.update(new_config.alerts)
+    scheduler.jitter = new_config.settings.jitter_seconds
+
+    for name in RESTART_SETTINGS:
+        if getattr(old_config.settings, name) != getattr(new_config.settings, name):
+            logging.warning(f"Zmiana ustawienia '{name}' wymaga restartu, aby zadziałała.")
+
+def report_stats(scraper, router, lean_mode, metrics=None):
+    """Log the fast-path and lean-mode statistics accumulated since startup, plus a JSON timing summary if metrics are given."""
+    if metrics:
+        logging.info(f"Metryki: {json.dumps(metrics.summary(), ensure_ascii=False, sort_keys=True)}")
+
+    if router:
+        routes = router.stats().values()
+        http_ok = sum(entry['http_ok'] for entry in routes)
+        selenium_ok = sum(entry['selenium_ok'] for entry in routes)
+        logging.info(f"Ścieżki pobierania: HTTP {http_ok}, Selenium {selenium_ok} (łącznie od startu).")
+
+    if getattr(scraper, 'hubs', None):
+        for hub in scraper.hubs.snapshot():
+            state = "OK" if hub['healthy'] else f"niedostępny ({hub['error'] or 'brak działających węzłów'})"
+            logging.info(f"Hub {hub['url']}: {state}, wolne sloty {hub['free']}/{hub['capacity']}.")
+
+    if lean_mode.get('enabled'):
+        saved = scraper.lean_stats()
+        logging.info(
+            f"Tryb lean: zablokowano {saved.get('requests_blocked', 0)} żądań "
+            f"(~{saved.get('bytes_avoided_estimate', 0) // 1024} KiB), "
+            f"pobrano {saved.get('bytes_downloaded', 0) // 1024} KiB (łącznie od startu)."
+        )
+
+def build_notifier(settings, metrics=NULL_METRICS):
+    """Build the alert dispatcher from the 'notifications' settings."""
+    # Alerts are delivered from a background worker, so a slow Telegram API never stalls scraping
+    notification_settings = settings.section('notifications')
+    return NotificationDispatcher(
+        TelegramNotifier(session=requests.Session()),
+        max_queue=notification_settings.get('queue_size', 1000),
+        coalesce_window=notification_settings.get('coalesce_window_seconds', 0),
+        rate_per_second=notification_settings.get('rate_per_second', 1.0),
+        burst=notification_settings.get('burst', 3),
+        metrics=metrics,
+    )
+
+def build_scraper(settings, metrics=NULL_METRICS):
+    """Build the scraper pool (and the HTTP fast-path router, if enabled) from the settings."""
+    # Watch mode keeps a live tab per asset instead of navigating on every cycle
+    scraper_class = LiveTabScraper if settings.watch_mode else Scraper
+    # Live tabs are cheaper than any fetch, so the HTTP fast path only applies outside watch mode
+    use_fast_path = settings.http_fast_path and not settings.watch_mode
+    # A placeholder that is not a price (a JS-only page before its scripts run) falls back to Selenium
+    router = FetchRouter(
+        HttpFetcher(pool_size=max(settings.scraper_pool_size, 4)),
+        is_price=lambda text: clean_price(text) is not None,
+    ) if use_fast_path else None
+    # Shared by all sessions, so every session learns from the latencies the others observe
+    waits = AdaptiveWait.from_settings(settings.section('adaptive_wait'))
+    # Failed scrapes leave a screenshot and the page source in screenshots_dir, written off the scrape path
+    failures = FailureCapture.from_settings(settings.section('failure_capture'), settings.screenshots_dir, metrics)
+    # With several hubs, every new session goes to the hub with the most free capacity
+    balancing = settings.section('hub_balancing')
+    hubs = HubBalancer.from_settings(settings.selenium_hubs, balancing) if settings.selenium_hub_url != "local" else None
+    pool_size = settings.scraper_pool_size
+    if hubs and balancing.get('auto_pool_size'):
+        # One session per free slot, so adding Grid nodes adds throughput after a restart
+        pool_size = max(pool_size, min(hubs.free_slots(), balancing.get('max_pool_size', 16)))
+    scraper_factory = functools.partial(
+        scraper_class, lean_mode=settings.section('lean_mode'), lifecycle=settings.section('session_lifecycle'),
+        metrics=metrics, waits=waits, driver_cache=DriverCache.from_settings(settings.section('driver_cache')),
+        failures=failures, hubs=hubs,
+    )
+    hedging = settings.section('hedging')
+    scraper = ScraperPool(
+        settings.selenium_hub_url, pool_size, scraper_factory=scraper_factory, router=router,
+        metrics=metrics, hedge_after=hedging.get('hedge_after_seconds') if hedging.get('enabled') else None,
+        failures=failures, hubs=hubs, affinity=settings.watch_mode,
+    )
+    return scraper, router
+
+class StartupTimer:
+    """Times the startup phases up to the first cycle and logs them as one line."""
+
+    # Polish names of the phases, in the order they are reported
+    LABELS = {
+        "imports": "importy",
+        "config": "konfiguracja",
+        "setup": "komponenty",
+        "sessions": "sesje przeglądarki (równolegle)",
+        "sessions_wait": "oczekiwanie na sesje",
+        "warm_up": "rozgrzewka",
+    }
+
+    def __init__(self, started=None, clock=time.perf_counter):
+        self.clock = clock
+        self.started = started if started is not None else clock()
+        self._last = self.started
+        self.phases = {}
+
+    def mark(self, phase):
+        """Ends a phase that ran on the main thread since the previous mark."""
+        now = self.clock()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    def timed(self, phase, func, *args):
+        """Runs func(*args) and records its duration as a phase; used for work overlapping other phases."""
+        began = self.clock()
+        try:
+            return func(*args)
+        finally:
+            self.phases[phase] = self.clock() - began
+
+    def report(self, metrics=NULL_METRICS):
+        """Logs the phase timings and the total time to the first cycle, and records them as metrics."""
+        total = self.clock() - self.started
+        parts = ", ".join(
+            f"{label} {self.phases[phase]:.2f} s" for phase, label in self.LABELS.items() if phase in self.phases
+        )
+        logging.info(f"Start gotowy po {total:.2f} s: {parts}.")
+        for phase, seconds in self.phases.items():
+            metrics.observe(f"startup_{phase}", seconds)
+        metrics.observe("startup_total", total)
+        return total
+
+def warm_up_sessions(scraper, assets, settings):
+    """Load one page per site before the first cycle, if the 'startup' settings allow it."""
+    if not settings.section('startup').get('warm_up', True):
+        return 0
+    urls = {}
+    for asset in assets:
+        # One page per origin warms DNS, TLS and the HTTP cache of every site without loading each asset
+        urls.setdefault(urlsplit(asset.url).netloc, asset.url)
+    return scraper.warm_up(list(urls.values()))
+
+def start_price_feed(settings):
+    """Start the streaming price feed if the 'price_feed' settings enable it. Returns (feed, server), or (None, None)."""
+    feed_settings = settings.section('price_feed')
+    if not feed_settings.get('enabled'):
+        return None, None
+    feed = PriceFeed(buffer_size=feed_settings.get('buffer_size', 256))
+    try:
+        server = PriceFeedServer(feed, feed_settings.get('host', '127.0.0.1'), feed_settings.get('port', 9109))
+    except OSError as e:
+        logging.error(f"Could not start the price feed: {e}")
+        return None, None
+    return feed, server
+
+def open_work_queue(settings):
+    """Open the shared work queue named in the 'work_queue' settings."""
+    queue_settings = settings.section('work_queue')
+    return WorkQueue(queue_settings.get('path', 'work_queue.db'), queue_settings.get('lease_seconds', 120))
+
+def run_worker(config, worker_id=None, config_path='config.json'):
+    """
+    Claim due jobs from the shared work queue and scrape them with this process's own sessions,
+    until interrupted. Results go back through the queue; the coordinator reports them.
+    """
+    settings = config.settings
+    queue = open_work_queue(settings)
+    scraper, _ = build_scraper(settings)
+    warm_up_sessions(scraper, config.assets, settings)
+    market = MarketHours.from_settings(settings.section('market_hours'))
+    assets = {asset.name: asset for asset in config.assets}
+
+    def fetch(name):
+        asset = assets.get(name)
+        # Assets missing from this worker's config, and closed markets between heartbeats, report nothing
+        if asset is None or (market and not market.should_scrape(asset)):
+            return None
+        price, fields, _ = fetch_price(asset, scraper)
+        return price, fields
+
+    def on_config_change(new_config):
+        nonlocal assets
+        assets = {asset.name: asset for asset in new_config.assets}
+
+    worker = QueueWorker(queue, fetch, worker_id, threads=scraper.size)
+    watcher = ConfigWatcher(config_path, load_json, on_config_change, settings.config_reload_seconds)
+    if settings.config_reload_seconds > 0:
+        watcher.start()
+
+    logging.info(f"Worker {worker.worker_id} pobiera zadania z {queue.path}.")
+    stop = threading.Event()
+    try:
+        worker.run(stop)
+    except KeyboardInterrupt:
+        logging.info("Otrzymano polecenie zamknięcia. Kończenie pracy...")
+    finally:
+        stop.set()
+        watcher.stop()
+        scraper.close()
+        queue.close()
+        logging.info(f"Worker {worker.worker_id} zamknięty.")
+
+def run_coordinator(config, config_path='config.json'):
+    """
+    Expand the tracked assets into jobs in the shared work queue, start the local worker processes
+    and report the results they send back: print, record and check alerts, as the single-process mode does.
+    """
+    settings = config.settings
+    queue = open_work_queue(settings)
+    notifier = build_notifier(settings)
+    alert_engine = AlertEngine(config.alerts)
+    history = PriceHistory(settings.history_dir, settings.history_fsync_seconds) if settings.history_dir else None
+    feed, feed_server = start_price_feed(settings)
+    assets = {asset.name: asset for asset in config.assets}
+
+    def on_result(name, price, fields):
+        asset = assets.get(name)
+        if asset:
+            report_price(asset, price, fields, alert_engine, notifier, history, feed=feed)
+
+    coordinator = QueueCoordinator(queue, on_result)
+    coordinator.sync(config.assets)
+
+    def on_config_change(new_config):
+        nonlocal assets
+        assets = {asset.name: asset for asset in new_config.assets}
+        coordinator.sync(new_config.assets)
+        alert_engine.update(new_config.alerts)
+
+    watcher = ConfigWatcher(config_path, load_json, on_config_change, settings.config_reload_seconds)
+    if settings.config_reload_seconds > 0:
+        watcher.start()
+
+    # More workers can join from other terminals with `python main.py worker`
+    workers = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), 'worker', '--config', config_path])
+        for _ in range(settings.section('work_queue').get('workers', 0))
+    ]
+    notifier.send_alert(f"🚀 Koordynator wystartował ({len(assets)} aktywów, {len(workers)} workerów).")
+
+    stop = threading.Event()
+    try:
+        coordinator.run(stop)
+    except KeyboardInterrupt:
+        logging.info("Otrzymano polecenie zamknięcia. Kończenie pracy...")
+    finally:
+        watcher.stop()
+        for process in workers:
+            process.terminate()
+        for process in workers:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        coordinator.drain()
+        notifier.close()
+        if history:
+            history.close()
+        if feed_server:
+            feed_server.close()
+        queue.close()
+        logging.info("Koordynator zamknięty. Do widzenia!")
+
+def run_replay(config, inputs, as_json=False):
+    """
+    Replay recorded prices through clean_price and the configured alert rules on a virtual clock,
+    and report which alerts would have fired and when. Nothing is scraped or sent.
+    """
+    clock = VirtualClock()
+    alert_engine = AlertEngine(config.alerts, clock=clock)
+    assets = {asset.name: asset for asset in config.assets}
+    default_locator = config.locators['tradingview.com'].as_dict()
+    skipped = Counter()
+    try:
+        ticks = open_ticks(inputs, lambda name: assets[name].locator_info if name in assets else default_locator, skipped)
+        report = replay(
+            ticks, alert_engine, clock, clean_price, {name: asset.decimal_separator for name, asset in assets.items()},
+            skipped,
+        )
+    except (OSError, ValueError) as e:
+        logging.critical(f"Nie można odczytać danych do odtworzenia: {e}")
+        return None
+
+    if as_json:
+        print(json.dumps(report.as_dict(), ensure_ascii=False))
+        return report
+    for timestamp, _, message in report.alerts:
+        when = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat(timespec='seconds')
+        print(f"{when} {message.replace(chr(10), ' ')}")
+    print(
+        f"Odtworzono {report.ticks} notowań {len(report.per_asset)} aktywów w {report.elapsed:.2f} s; "
+        f"alertów: {len(report.alerts)} (wyciszonych przez cooldown: {report.suppressed}), błędów parsowania: {sum(report.parse_errors.values())}, "
+        f"pominiętych rekordów: {sum(report.skipped.values())}."
+    )
+    return report
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Scrape asset prices and send Telegram alerts.")
+    parser.add_argument(
+        'role', nargs='?', choices=('standalone', 'coordinator', 'worker', 'replay'), default='standalone',
+        help="standalone runs everything in one process; coordinator and worker share a work queue; "
+             "replay feeds recorded prices through the alert rules",
+    )
+    parser.add_argument('inputs', nargs='*', help="replay: CSV/NDJSON files, history or HTML snapshot directories")
+    parser.add_argument('--config', default='config.json', help="the config file (default: config.json)")
+    parser.add_argument('--worker-id', help="the name a worker takes leases under (default: host and PID)")
+    parser.add_argument('--json', action='store_true', help="replay: print the report as JSON")
+    return parser.parse_args(argv)
+
+def main(argv=()):
+    """
+    Main function: load config.json, start the logging pipeline and run the role chosen on the command line.
+    """
+    startup = StartupTimer(_STARTED)
+    startup.mark("imports")
+    args = parse_args(argv)
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', force=True)
-    config = load_json('config.json')
-    if not config:
-        logging.critical("Could not load config.json. Application cannot start.")
+    raw_config = load_json(args.config)
+    if not raw_config:
+        logging.critical(f"Could not load {args.config}. Application cannot start.")
         return
 
-    # Extract settings from config
-    settings = config.get('settings', {})
-    assets_to_track = config.get('assets', {})
-    alerts_config = config.get('alerts', {})
-    locator_info = config.get('locators', {}).get('tradingview.com')
+    try:
+        config = AppConfig.from_dict(raw_config)
+    except ConfigError as e:
+        logging.critical(str(e))
+        return
+    startup.mark("config")
 
-    interval = settings.get('scraping_interval_seconds', 900)
-    selenium_hub_url = settings.get('selenium_hub_url')
+    if args.role == 'replay':
+        run_replay(config, args.inputs, args.json)
+        return
 
-    if not all([assets_to_track, alerts_config, locator_info, selenium_hub_url]):
-        logging.critical("Configuration is incomplete. Missing assets, alerts, locators, or selenium_hub_url.")
+    settings = config.settings
+    # Log lines are written from a background thread, so the scrape path never waits on disk
+    suffix = f"-worker-{os.getpid()}" if args.role == 'worker' else ("-coordinator" if args.role == 'coordinator' else "")
+    try:
+        pipeline = LogPipeline.from_settings(settings.section('logging'), settings.logs_dir, suffix)
+    except (ValueError, OSError) as e:
+        logging.critical(f"Invalid logging settings: {e}")
         return
+    if pipeline:
+        pipeline.start()
+    try:
+        if args.role == 'worker':
+            # A stopping coordinator terminates its workers; close their sessions like on Ctrl+C
+            signal.signal(signal.SIGTERM, signal.default_int_handler)
+            run_worker(config, args.worker_id, args.config)
+        elif args.role == 'coordinator':
+            run_coordinator(config, args.config)
+        else:
+            run_standalone(config, args.config, startup)
+    finally:
+        if pipeline:
+            pipeline.stop()
+
+def run_standalone(config, config_path='config.json', startup=None):
+    """Scrape, report and alert in this process, scheduling each asset on its own interval."""
+    settings = config.settings
+    startup = startup or StartupTimer()
+    lean_mode = settings.section('lean_mode')
+
+    metrics_settings = settings.section('metrics')
+    metrics = Metrics(enabled=metrics_settings.get('enabled', False))
+    metrics_server = None
+    if metrics.enabled and metrics_settings.get('port'):
+        try:
+            metrics_server = MetricsServer(metrics, metrics_settings.get('host', '127.0.0.1'), metrics_settings['port'])
+        except OSError as e:
+            logging.error(f"Could not start the metrics endpoint: {e}")
+    summary_metrics = metrics if metrics.enabled and metrics_settings.get('json_summary') else None
+
+    # Opening browser sessions takes seconds, so they open while the rest of the process is set up
+    opener = ThreadPoolExecutor(max_workers=1, thread_name_prefix="startup")
+    sessions = opener.submit(startup.timed, "sessions", build_scraper, settings, metrics)
+    opener.shutdown(wait=False)
+
+    notifier = build_notifier(settings, metrics)
+
+    # Alerts fire on threshold crossings only, instead of on every cycle past the level
+    alert_engine = AlertEngine(config.alerts)
+    history = PriceHistory(settings.history_dir, settings.history_fsync_seconds) if settings.history_dir else None
+
+    # Dashboards and bots read every tick from here instead of scraping the same pages again
+    feed, feed_server = start_price_feed(settings)
+
+    # Closed markets (nights, weekends, holidays) are not navigated to, apart from a slow heartbeat
+    market = MarketHours.from_settings(settings.section('market_hours'))
+    scheduler = AssetScheduler(max_concurrency=settings.max_concurrent_scrapes, jitter=settings.jitter_seconds)
+    startup.mark("setup")
+
+    scraper, router = sessions.result()
+    startup.mark("sessions_wait")
+    # The first cycle then measures the sites, not the browser's cold start
+    warm_up_sessions(scraper, config.assets, settings)
+    startup.mark("warm_up")
+
+    def make_job(asset):
+        return functools.partial(scrape_asset, asset, scraper, alert_engine, notifier, history, metrics, market, feed)
+
+    for asset in config.assets:
+        scheduler.add(asset.name, asset.interval, make_job(asset))
+
+    if router or lean_mode.get('enabled') or summary_metrics or scraper.hubs:
+        scheduler.add(
+            "__stats__", settings.scraping_interval_seconds,
+            functools.partial(report_stats, scraper, router, lean_mode, summary_metrics),
+        )
+
+    # Edits to config.json are applied in place, without a restart and the cold Chrome start it costs
+    def on_config_change(new_config):
+        nonlocal config
+        apply_config(config, new_config, scheduler, make_job, alert_engine)
+        config = new_config
 
-    notifier = TelegramNotifier()
-    scraper = Scraper(selenium_hub_url)
+    watcher = ConfigWatcher(config_path, load_json, on_config_change, settings.config_reload_seconds)
+    if settings.config_reload_seconds > 0:
+        watcher.start()
 
     notifier.send_alert("🚀 Scraper wystartował i rozpoczyna cykliczne sprawdzanie cen.")
+    startup.report(metrics)
 
     try:
-        while True:
-            logging.info("Rozpoczynam sprawdzanie cen...")
-
-            for category, assets in assets_to_track.items():
-                for asset_name, asset_details in assets.items():
-                    url = asset_details.get('url')
-                    if not url:
-                        logging.warning(f"URL not found for asset: {asset_name}")
-                        continue
-
-                    scraped_price_str = scraper.scrape(url, locator_info)
-                    price = clean_price(scraped_price_str)
-                    
-                    message = f"Cena dla {asset_name}: {price if price is not None else 'Error'}"
-                    print(message)
-                    logging.info(message)
-                    
-                    if price is not None:
-                        check_alerts(asset_name, price, alerts_config, notifier)
-            
-            logging.info(f"Zakończono sprawdzanie. Następne za {interval} sekund.")
-            time.sleep(interval)
+        asyncio.run(scheduler.run())
     except KeyboardInterrupt:
         logging.info("Otrzymano polecenie zamknięcia. Kończenie pracy...")
     finally:
+        watcher.stop()
+        scheduler.close()
         scraper.close()
+        notifier.close()
+        if history:
+            history.close()
+        if metrics_server:
+            metrics_server.close()
+        if feed_server:
+            feed_server.close()
         logging.info("Scraper zamknięty. Do widzenia!")
 
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
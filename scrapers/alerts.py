@@ -0,0 +1,256 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Optional
+from scrapers.indicators import INDICATORS, INDICATOR_LABELS, AssetIndicators
+
+
+def format_window(seconds: float) -> str:
+    """Formats a window length for messages, e.g. 3600 -> '1h', 1800 -> '30min'."""
+    if seconds % 3600 == 0:
+        return f"{seconds / 3600:g}h"
+    if seconds % 60 == 0:
+        return f"{seconds / 60:g}min"
+    return f"{seconds:g}s"
+
+
+class AlertRule:
+    """
+    A single level with hysteresis and cooldown, firing only when the level is crossed.
+    The level applies to the price, or to a rolling indicator of it when `indicator` is set.
+    """
+
+    __slots__ = (
+        "asset", "direction", "threshold", "hysteresis", "cooldown", "indicator", "window", "rearm_level", "last_fired",
+    )
+
+    def __init__(self, asset: str, direction: str, threshold: float, hysteresis: float = 0.0, cooldown: float = 0.0,
+                 indicator: Optional[str] = None, window: Optional[float] = None):
+        self.asset = asset
+        self.direction = direction
+        self.threshold = threshold
+        self.hysteresis = hysteresis
+        self.cooldown = cooldown
+        self.indicator = indicator
+        self.window = window
+        # An 'above' rule re-arms only once the price falls back below threshold - hysteresis (and vice versa)
+        self.rearm_level = threshold - hysteresis if direction == "above" else threshold + hysteresis
+        self.last_fired = None
+
+    @property
+    def series(self):
+        """What the level applies to: None for the price, else (indicator, window)."""
+        return (self.indicator, self.window) if self.indicator else None
+
+    @property
+    def key(self):
+        return (self.asset, self.series, self.direction, self.threshold)
+
+    def message(self, value: float, price: float) -> str:
+        if not self.indicator:
+            return f"🔔 ALERT for {self.asset} 🔔\nPrice is {self.direction.upper()} {self.threshold} at {price}"
+        label = f"{INDICATOR_LABELS[self.indicator]} ({format_window(self.window)})"
+        return (f"🔔 ALERT for {self.asset} 🔔\n{label} is {self.direction.upper()} {self.threshold} "
+                f"at {round(value, 4)} (price {price})")
+
+
+class _SortedRules:
+    """Rules kept sorted by one numeric attribute, so crossed rules form a prefix or suffix found by bisect."""
+
+    __slots__ = ("attr", "levels", "rules")
+
+    def __init__(self, attr: str):
+        self.attr = attr
+        self.levels = []
+        self.rules = []
+
+    def add(self, rule: AlertRule):
+        level = getattr(rule, self.attr)
+        index = bisect.bisect_right(self.levels, level)
+        self.levels.insert(index, level)
+        self.rules.insert(index, rule)
+
+    def pop_below(self, price: float) -> list:
+        """Removes and returns the rules whose level is strictly below the price."""
+        index = bisect.bisect_left(self.levels, price)
+        popped = self.rules[:index]
+        del self.levels[:index], self.rules[:index]
+        return popped
+
+    def pop_above(self, price: float) -> list:
+        """Removes and returns the rules whose level is strictly above the price."""
+        index = bisect.bisect_right(self.levels, price)
+        popped = self.rules[index:]
+        del self.levels[index:], self.rules[index:]
+        return popped
+
+
+class _AssetRules:
+    """The armed and triggered rule indexes of one asset."""
+
+    __slots__ = ("above_armed", "above_triggered", "below_armed", "below_triggered")
+
+    def __init__(self):
+        self.above_armed = _SortedRules("threshold")
+        self.above_triggered = _SortedRules("rearm_level")
+        self.below_armed = _SortedRules("threshold")
+        self.below_triggered = _SortedRules("rearm_level")
+
+    def triggered(self):
+        """Yields the rules that have fired and are waiting to re-arm."""
+        yield from self.above_triggered.rules
+        yield from self.below_triggered.rules
+
+    def all(self):
+        yield from self.above_armed.rules
+        yield from self.below_armed.rules
+        yield from self.triggered()
+
+    def add(self, rule: AlertRule, triggered: bool = False):
+        if rule.direction == "above":
+            (self.above_triggered if triggered else self.above_armed).add(rule)
+        else:
+            (self.below_triggered if triggered else self.below_armed).add(rule)
+
+    def cross(self, value: float) -> list:
+        """Moves the rules crossed by a new value to triggered and returns them."""
+        # Re-arm rules the value has moved back past by more than their hysteresis
+        for rule in self.above_triggered.pop_above(value):
+            self.above_armed.add(rule)
+        for rule in self.below_triggered.pop_below(value):
+            self.below_armed.add(rule)
+
+        fired = self.above_armed.pop_below(value) + self.below_armed.pop_above(value)
+        for rule in fired:
+            self.add(rule, triggered=True)
+        return fired
+
+
+def parse_rules(alerts_config: dict) -> list:
+    """
+    Expands config['alerts'] into AlertRule objects.
+
+    Each asset maps to a rule dict or a list of them. A rule dict may hold 'above' and/or
+    'below' levels plus optional 'hysteresis' (absolute), 'hysteresis_pct' and 'cooldown_seconds'.
+    With 'indicator' (one of INDICATORS) and 'window_seconds', the levels apply to that rolling
+    indicator instead of the price, e.g. {"indicator": "pct_change", "window_seconds": 3600, "above": 3, "below": -3}.
+
+    Raises:
+        ValueError: If an indicator is unknown or its window is not positive.
+    """
+    rules = []
+    for asset, entries in alerts_config.items():
+        for entry in entries if isinstance(entries, list) else [entries]:
+            indicator, window = entry.get('indicator'), None
+            if indicator is not None:
+                if indicator not in INDICATORS:
+                    raise ValueError(f"Unknown indicator {indicator!r} for {asset}")
+                window = float(entry.get('window_seconds', 0))
+                if window <= 0:
+                    raise ValueError(f"Indicator {indicator!r} for {asset} needs a positive 'window_seconds'")
+            for direction in ("above", "below"):
+                if direction not in entry:
+                    continue
+                threshold = entry[direction]
+                hysteresis = float(entry.get('hysteresis', abs(threshold) * entry.get('hysteresis_pct', 0) / 100))
+                rules.append(AlertRule(
+                    asset, direction, threshold, hysteresis, float(entry.get('cooldown_seconds', 0)), indicator, window,
+                ))
+    return rules
+
+
+class AlertEngine:
+    """
+    A stateful alert evaluator that fires each rule only when the price crosses its level.
+
+    Rules are precompiled into per-asset indexes sorted by level, so a tick with no crossings
+    costs a few bisects regardless of how many rules an asset has. Indicator rules get one
+    index per (indicator, window), fed from rolling windows that each tick updates incrementally.
+    """
+
+    def __init__(self, alerts_config: dict, clock=time.time):
+        """
+        Initializes the engine.
+
+        Args:
+            alerts_config (dict): The 'alerts' section of the config.
+            clock (callable): Returns the current time in seconds, used for cooldowns.
+        """
+        self.clock = clock
+        self.rules = {}  # asset -> {series: _AssetRules}
+        self.indicators = {}  # asset -> AssetIndicators, for assets with indicator rules
+        self.suppressed = 0  # Crossings silenced by a cooldown, since the engine was built
+        self._lock = threading.Lock()
+        self.update(alerts_config)
+
+    def update(self, alerts_config: dict):
+        """
+        Replaces the rule set, e.g. after a config reload. Rules that still exist with the same
+        asset, direction and level keep their crossing state and cooldown, so a reload never re-sends alerts.
+        Rolling windows that are still used keep their ticks.
+        """
+        with self._lock:
+            previous = {}
+            for series_rules in self.rules.values():
+                for state in series_rules.values():
+                    triggered = set(map(id, state.triggered()))
+                    for rule in state.all():
+                        previous[rule.key] = (id(rule) in triggered, rule.last_fired)
+
+            rules = {}
+            windows = {}
+            for rule in parse_rules(alerts_config):
+                was_triggered, rule.last_fired = previous.get(rule.key, (False, None))
+                rules.setdefault(rule.asset, {}).setdefault(rule.series, _AssetRules()).add(rule, triggered=was_triggered)
+                if rule.indicator:
+                    windows.setdefault(rule.asset, set()).add(rule.window)
+
+            indicators = {}
+            for asset, seconds in windows.items():
+                indicators[asset] = AssetIndicators(seconds)
+                old = self.indicators.get(asset)
+                if old:
+                    indicators[asset].windows.update({window: old.windows[window] for window in seconds & old.windows.keys()})
+            self.rules = rules
+            self.indicators = indicators
+
+    def evaluate(self, asset: str, price: float) -> list:
+        """
+        Updates the asset's rolling indicators and the crossing state of its rules with a new price.
+
+        Args:
+            asset (str): The asset name.
+            price (float): The new price.
+
+        Returns:
+            The alert messages to send; rules still in cooldown change state but stay silent.
+        """
+        with self._lock:
+            series_rules = self.rules.get(asset)
+            if series_rules is None:
+                return []
+
+            now = self.clock()
+            indicators = self.indicators.get(asset)
+            if indicators:
+                indicators.add(now, price)
+
+            messages = []
+            for series, state in series_rules.items():
+                value = price if series is None else indicators.value(*series)
+                if value is None:
+                    continue  # Not enough ticks in the window yet
+                for rule in state.cross(value):
+                    if rule.last_fired is not None and now - rule.last_fired < rule.cooldown:
+                        self.suppressed += 1
+                        logging.debug(f"Alert for {asset} at {rule.threshold} suppressed by cooldown.")
+                        continue
+                    rule.last_fired = now
+                    messages.append(rule.message(value, price))
+            return messages
+
+    def check(self, asset: str, price: float, notifier):
+        """Evaluates a price and sends every resulting alert through the notifier."""
+        for message in self.evaluate(asset, price):
+            notifier.send_alert(message)
@@ -0,0 +1,303 @@
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import urlsplit
+from selenium.webdriver.common.by import By
+from scrapers.alerts import parse_rules
+from scrapers.market_hours import parse_calendars
+from scrapers.scraper import FIELD_STRATEGIES
+
+# The locator strategies a config may name, e.g. "CSS_SELECTOR"
+LOCATOR_STRATEGIES = frozenset(name for name in dir(By) if name.isupper())
+
+
+class ConfigError(ValueError):
+    """Raised when config.json is incomplete or invalid."""
+
+
+@dataclass(frozen=True)
+class Locator:
+    """How to find the price element on a site."""
+
+    __slots__ = ("by", "value", "decimal_separator", "fields")
+    by: str
+    value: str
+    decimal_separator: Optional[str]
+    fields: dict  # Extra values read on the same page load: name -> {'by', 'value', 'numeric'}
+
+    @classmethod
+    def from_dict(cls, domain: str, data: dict) -> "Locator":
+        if data.get('by') not in LOCATOR_STRATEGIES or not data.get('value'):
+            raise ConfigError(f"Locator for {domain} needs a valid 'by' and a 'value'.")
+        fields = {}
+        for name, field in data.get('fields', {}).items():
+            if name == 'price' or not isinstance(field, dict) or field.get('by') not in FIELD_STRATEGIES or not field.get('value'):
+                raise ConfigError(f"Field '{name}' of the {domain} locator needs a valid 'by' and a 'value'.")
+            fields[name] = {'by': field['by'], 'value': field['value'], 'numeric': bool(field.get('numeric', True))}
+        return cls(data['by'], data['value'], data.get('decimal_separator'), fields)
+
+    def as_dict(self) -> dict:
+        """Returns the locator in the dict form the scrapers take."""
+        return {'by': self.by, 'value': self.value}
+
+
+@dataclass(frozen=True)
+class Source:
+    """One page quoting an asset, with the locator of its domain."""
+
+    __slots__ = ("url", "locator_info", "decimal_separator", "fields")
+    url: str
+    locator_info: dict
+    decimal_separator: Optional[str]
+    fields: dict  # The locator's extra fields; empty when only the price is read
+
+
+def locator_for(url: str, locators: dict, default: Locator) -> Locator:
+    """
+    Returns the locator of a URL's domain, trying parent domains too (www.tradingview.com
+    matches 'tradingview.com'), and the default locator when no domain matches.
+    """
+    labels = (urlsplit(url).hostname or "").split('.')
+    for start in range(len(labels) - 1):
+        locator = locators.get('.'.join(labels[start:]))
+        if locator:
+            return locator
+    return default
+
+
+@dataclass(frozen=True)
+class Asset:
+    """
+    A tracked asset with every per-asset lookup the scrape loop needs already resolved.
+    `url`, `locator_info` and `decimal_separator` describe the primary source, which is also `sources[0]`.
+    """
+
+    __slots__ = ("name", "category", "url", "interval", "locator_info", "decimal_separator", "calendar", "sources")
+    name: str
+    category: str
+    url: str
+    interval: float
+    locator_info: dict
+    decimal_separator: Optional[str]
+    calendar: Optional[str]  # The trading calendar name; None means the market never closes
+    sources: tuple
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    The 'settings' section. Scalar options are typed fields; feature sections
+    (lean_mode, session_lifecycle, notifications, ...) stay dicts for their components.
+    """
+
+    __slots__ = (
+        "scraping_interval_seconds", "selenium_hub_url", "selenium_hubs", "scraper_pool_size", "max_concurrent_scrapes",
+        "jitter_seconds", "category_intervals", "http_fast_path", "watch_mode", "config_reload_seconds",
+        "history_dir", "history_fsync_seconds", "logs_dir", "screenshots_dir", "sections",
+    )
+    scraping_interval_seconds: float
+    selenium_hub_url: str  # The first hub, or "local"
+    selenium_hubs: tuple  # Every configured hub; sessions are balanced across them when there are several
+    scraper_pool_size: int
+    max_concurrent_scrapes: int
+    jitter_seconds: float
+    category_intervals: dict
+    http_fast_path: bool
+    watch_mode: bool
+    config_reload_seconds: float
+    history_dir: Optional[str]
+    history_fsync_seconds: float
+    logs_dir: str
+    screenshots_dir: str
+    sections: dict
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Settings":
+        hubs = data.get('selenium_hub_url')
+        hubs = tuple(hubs) if isinstance(hubs, list) else (hubs,)
+        if not hubs or not all(isinstance(hub, str) and hub for hub in hubs):
+            raise ConfigError("selenium_hub_url must be a URL or a non-empty list of URLs.")
+        try:
+            pool_size = int(data.get('scraper_pool_size', 1))
+            settings = cls(
+                scraping_interval_seconds=float(data.get('scraping_interval_seconds', 900)),
+                selenium_hub_url=hubs[0],
+                selenium_hubs=hubs,
+                scraper_pool_size=pool_size,
+                max_concurrent_scrapes=int(data.get('max_concurrent_scrapes', pool_size)),
+                jitter_seconds=float(data.get('jitter_seconds', 0)),
+                category_intervals={category: float(value) for category, value in data.get('category_intervals', {}).items()},
+                http_fast_path=bool(data.get('http_fast_path', False)),
+                watch_mode=bool(data.get('watch_mode', False)),
+                config_reload_seconds=float(data.get('config_reload_seconds', 5)),
+                history_dir=data.get('history_dir'),
+                history_fsync_seconds=float(data.get('history_fsync_seconds', 5.0)),
+                logs_dir=data.get('logs_dir', 'logs'),
+                screenshots_dir=data.get('screenshots_dir', 'logs'),
+                sections={key: value for key, value in data.items() if isinstance(value, dict)},
+            )
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ConfigError(f"Invalid settings: {e}") from e
+        if settings.scraping_interval_seconds <= 0 or any(value <= 0 for value in settings.category_intervals.values()):
+            raise ConfigError("Scraping intervals must be positive.")
+        return settings
+
+    def section(self, name: str) -> dict:
+        """Returns a feature section such as 'lean_mode', or an empty dict."""
+        return self.sections.get(name, {})
+
+
+def asset_interval(category, asset_details, settings):
+    """
+    Returns the scraping interval for an asset: its own 'interval_seconds', then its
+    category's entry in 'category_intervals', then the global 'scraping_interval_seconds'.
+    """
+    default = settings.get('scraping_interval_seconds', 900)
+    category_interval = settings.get('category_intervals', {}).get(category, default)
+    return asset_details.get('interval_seconds', category_interval)
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """The validated, precompiled contents of config.json."""
+
+    __slots__ = ("settings", "locators", "assets", "alerts")
+    settings: Settings
+    locators: dict
+    assets: tuple
+    alerts: dict
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AppConfig":
+        """
+        Validates a raw config dict and resolves every per-asset lookup.
+
+        Raises:
+            ConfigError: If a required section is missing or a value is invalid.
+        """
+        raw_settings = data.get('settings', {})
+        assets_to_track = data.get('assets', {})
+        alerts = data.get('alerts', {})
+        raw_locators = data.get('locators', {})
+        if not all([assets_to_track, alerts, raw_locators.get('tradingview.com'), raw_settings.get('selenium_hub_url')]):
+            raise ConfigError("Configuration is incomplete. Missing assets, alerts, locators, or selenium_hub_url.")
+
+        settings = Settings.from_dict(raw_settings)
+        locators = {domain: Locator.from_dict(domain, entry) for domain, entry in raw_locators.items()}
+        # Pages on domains without a locator of their own use the tradingview.com one
+        default_locator = locators['tradingview.com']
+
+        market_hours = settings.section('market_hours')
+        try:
+            calendars = parse_calendars(market_hours)
+        except (TypeError, ValueError, KeyError, AttributeError) as e:
+            raise ConfigError(f"Invalid market hours: {e}") from e
+        category_calendars = market_hours.get('categories', {})
+
+        assets = []
+        for category, entries in assets_to_track.items():
+            for name, details in entries.items():
+                urls = ([details['url']] if details.get('url') else []) + list(details.get('urls', []))
+                if not urls:
+                    logging.warning(f"URL not found for asset: {name}")
+                    continue
+                sources = []
+                for url in urls:
+                    locator = locator_for(url, locators, default_locator)
+                    separator = details.get('decimal_separator', locator.decimal_separator)
+                    sources.append(Source(url, locator.as_dict(), separator, locator.fields))
+                primary = sources[0]
+                try:
+                    interval = float(asset_interval(category, details, raw_settings))
+                except (TypeError, ValueError) as e:
+                    raise ConfigError(f"Invalid scraping interval for asset {name}: {e}") from e
+                if interval <= 0:
+                    raise ConfigError(f"Scraping interval of asset {name} must be positive.")
+                assets.append(Asset(
+                    name=name,
+                    category=category,
+                    url=primary.url,
+                    interval=interval,
+                    locator_info=primary.locator_info,
+                    decimal_separator=primary.decimal_separator,
+                    calendar=details.get('calendar', category_calendars.get(category)),
+                    sources=tuple(sources),
+                ))
+                if assets[-1].calendar and assets[-1].calendar not in calendars:
+                    raise ConfigError(f"Unknown trading calendar '{assets[-1].calendar}' for asset {name}.")
+
+        try:
+            parse_rules(alerts)
+        except (TypeError, ValueError, AttributeError) as e:
+            raise ConfigError(f"Invalid alert rules: {e}") from e
+        return cls(settings, locators, tuple(assets), alerts)
+
+
+class ConfigWatcher:
+    """
+    Polls a config file's modification time and hands each valid new version to a callback,
+    so changes apply without restarting the process. Invalid edits are logged and ignored.
+    """
+
+    def __init__(self, path: str, loader, on_change, interval: float = 5.0):
+        """
+        Initializes the watcher.
+
+        Args:
+            path (str): The config file to watch.
+            loader (callable): Reads the file into a dict (or None on error).
+            on_change (callable): Called with the new AppConfig.
+            interval (float): Seconds between modification-time checks.
+        """
+        self.path = path
+        self.loader = loader
+        self.on_change = on_change
+        self.interval = interval
+        self._mtime = self._current_mtime()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _current_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def check(self) -> bool:
+        """Reloads the config if the file changed. Returns True if a new config was applied."""
+        mtime = self._current_mtime()
+        if mtime is None or mtime == self._mtime:
+            return False
+        self._mtime = mtime
+
+        data = self.loader(self.path)
+        if not data:
+            return False
+        try:
+            config = AppConfig.from_dict(data)
+        except ConfigError as e:
+            logging.error(f"Ignoring invalid {self.path}: {e}")
+            return False
+        logging.info(f"Reloading {self.path}.")
+        self.on_change(config)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error(f"Config reload failed: {e}")
+
+    def start(self):
+        """Starts polling in a background thread."""
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops polling."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
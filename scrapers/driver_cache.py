@@ -0,0 +1,98 @@
+import json
+import logging
+import os
+import shutil
+import time
+from typing import Optional
+
+# Offline mode can also be switched on from the environment, e.g. in a container without egress
+OFFLINE_ENV = "SCRAPER_OFFLINE"
+
+
+class DriverCache:
+    """
+    Remembers the chromedriver binary resolved for local runs, so a restart does not ask
+    webdriver_manager (and through it, the network) again.
+
+    A resolved path is reused while it exists and is younger than `max_age`. In offline mode,
+    a cached or PATH binary is used whatever its age, and nothing is downloaded.
+    """
+
+    def __init__(self, directory: str = ".driver_cache", max_age: float = 7 * 24 * 3600, offline: bool = False,
+                 installer=None, clock=time.time):
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str): Where the manifest of the resolved binary is kept.
+            max_age (float): Seconds after which the binary is resolved again when online.
+            offline (bool): Never download; also enabled by the SCRAPER_OFFLINE environment variable.
+            installer (callable, optional): Downloads a driver and returns its path; defaults to webdriver_manager.
+            clock (callable): Returns the current unix time in seconds.
+        """
+        self.directory = directory
+        self.max_age = max_age
+        self.offline = offline or os.environ.get(OFFLINE_ENV, "").lower() in ("1", "true", "yes")
+        self.installer = installer or _install_with_webdriver_manager
+        self.clock = clock
+
+    @classmethod
+    def from_settings(cls, settings: Optional[dict]) -> "DriverCache":
+        """Builds the cache from the 'driver_cache' settings section."""
+        settings = settings or {}
+        return cls(
+            directory=settings.get('dir', '.driver_cache'),
+            max_age=settings.get('max_age_hours', 168) * 3600,
+            offline=settings.get('offline', False),
+        )
+
+    @property
+    def manifest(self) -> str:
+        return os.path.join(self.directory, "chromedriver.json")
+
+    def _cached(self) -> Optional[dict]:
+        try:
+            with open(self.manifest, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry if os.access(entry.get('path', ''), os.X_OK) else None
+
+    def resolve(self) -> Optional[str]:
+        """
+        Returns the chromedriver path to use, resolving and caching it if needed.
+
+        Returns:
+            The binary path, or None when offline and no binary is available; Selenium Manager
+            then looks for a driver on its own.
+        """
+        entry = self._cached()
+        if entry and (self.offline or self.clock() - entry.get('resolved_at', 0) < self.max_age):
+            return entry['path']
+
+        if self.offline:
+            path = shutil.which("chromedriver")
+            if path is None:
+                logging.warning("Offline mode: no cached chromedriver and none on PATH.")
+            return path
+
+        try:
+            path = self.installer()
+        except Exception as e:
+            # A stale binary beats no binary when the download fails
+            logging.error(f"Could not resolve chromedriver: {e}")
+            return entry['path'] if entry else shutil.which("chromedriver")
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(self.manifest, 'w', encoding='utf-8') as f:
+                json.dump({"path": path, "resolved_at": self.clock()}, f)
+        except OSError as e:
+            logging.warning(f"Could not cache the chromedriver path: {e}")
+        return path
+
+
+def _install_with_webdriver_manager() -> str:
+    # Imported here: webdriver_manager is only needed for local runs and pulls in a lot of modules
+    from webdriver_manager.chrome import ChromeDriverManager
+    return ChromeDriverManager().install()
@@ -0,0 +1,201 @@
+import logging
+import threading
+import time
+
+
+class DriverManager:
+    """
+    Owns the WebDriver session of a scraper: health-checks it, reconnects with exponential
+    backoff, keeps an optional pre-warmed standby session for instant failover and recycles
+    sessions after a page count or JS heap ceiling to keep memory flat over long uptimes.
+    """
+
+    def __init__(self, factory, max_pages: int = 0, max_js_heap_mb: float = 0, memory_check_every: int = 20,
+                 warm_standby: bool = False, backoff_initial: float = 1.0, backoff_max: float = 60.0,
+                 health_check_interval: float = 60.0, clock=time.monotonic):
+        """
+        Initializes the manager and opens the first session.
+
+        Args:
+            factory (callable): Creates a new WebDriver, returning None on failure.
+            max_pages (int): Recycle the session after this many navigations (0 disables).
+            max_js_heap_mb (float): Recycle the session when the JS heap grows past this size (0 disables).
+            memory_check_every (int): Read Chrome performance metrics every this many navigations.
+            warm_standby (bool): Keep a second, idle session ready to take over.
+            backoff_initial (float): The first reconnect delay in seconds.
+            backoff_max (float): The upper bound of the reconnect delay in seconds.
+            health_check_interval (float): Seconds between routine health checks of an idle-looking session.
+            clock (callable): A monotonic clock returning seconds.
+        """
+        self.factory = factory
+        self.max_pages = max_pages
+        self.max_js_heap_mb = max_js_heap_mb
+        self.memory_check_every = max(1, memory_check_every)
+        self.warm_standby = warm_standby
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.health_check_interval = health_check_interval
+        self.clock = clock
+
+        self.generation = 0  # Bumped whenever the active session is replaced
+        self.pages = 0
+        self._failures = 0
+        self._standby = None
+        self._standby_thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.driver = factory()
+        self._last_health_check = clock()
+        self._next_attempt = 0.0
+        if self.driver is None:
+            self._schedule_retry()
+        if warm_standby:
+            self._spawn_standby()
+
+    def _spawn_standby(self):
+        """Starts creating a standby session in the background."""
+        if self._standby is not None or (self._standby_thread and self._standby_thread.is_alive()):
+            return
+
+        def create():
+            self._standby = self.factory()
+
+        self._standby_thread = threading.Thread(target=create, name="standby-driver", daemon=True)
+        self._standby_thread.start()
+
+    def _take_standby(self):
+        """Returns the standby session if one exists (waiting for one being created), else None."""
+        if self._standby_thread:
+            self._standby_thread.join()
+        standby, self._standby = self._standby, None
+        return standby
+
+    def _take_healthy_standby(self):
+        """
+        Returns the standby session if it still answers, else None. The Grid reaps sessions that
+        stay idle too long, so after a quiet spell the standby may be dead; it is then retired.
+        """
+        standby = self._take_standby()
+        if standby is not None and not self.is_healthy(standby):
+            logging.info("Standby WebDriver session is gone, opening a new session instead.")
+            self._quit_later(standby)
+            return None
+        return standby
+
+    def _schedule_retry(self):
+        self._failures += 1
+        delay = min(self.backoff_max, self.backoff_initial * 2 ** (self._failures - 1))
+        self._next_attempt = self.clock() + delay
+        logging.warning(f"WebDriver unavailable, next reconnect attempt in {delay:.0f}s.")
+
+    def _quit_later(self, driver):
+        """Quits a retired session without blocking the caller."""
+        if driver is None:
+            return
+
+        def quit_driver():
+            try:
+                driver.quit()
+            except Exception as e:
+                logging.debug(f"Error while quitting retired WebDriver: {e}")
+
+        threading.Thread(target=quit_driver, name="quit-driver", daemon=True).start()
+
+    def _replace(self, reason: str):
+        """Swaps the active session for the standby (or a fresh one) and retires the old one."""
+        logging.info(f"Replacing WebDriver session: {reason}.")
+        old, self.driver = self.driver, None
+        self._quit_later(old)
+        self.driver = (self._take_healthy_standby() if self.warm_standby else None) or self.factory()
+        self.generation += 1
+        self.pages = 0
+        self._last_health_check = self.clock()
+        if self.driver is None:
+            self._schedule_retry()
+        else:
+            self._failures = 0
+        if self.warm_standby:
+            self._spawn_standby()
+
+    def recycle(self, reason: str):
+        """Replaces the active session now, e.g. to move it to another hub; a standby session is replaced too."""
+        with self._lock:
+            if self._closed or self.driver is None:
+                return
+            if self.warm_standby:
+                self._quit_later(self._take_standby())
+            self._replace(reason)
+
+    def is_healthy(self, driver=None) -> bool:
+        """Checks that a session (the active one by default) still answers commands."""
+        driver = driver or self.driver
+        if driver is None:
+            return False
+        try:
+            driver.execute_script("return 1")
+            return True
+        except Exception as e:
+            logging.warning(f"WebDriver health check failed: {e}")
+            return False
+
+    def acquire(self):
+        """
+        Returns a usable WebDriver, reconnecting or failing over when needed.
+
+        Returns:
+            The active WebDriver, or None while the hub is unreachable and the backoff has not elapsed.
+        """
+        with self._lock:
+            if self._closed:
+                return None
+            if self.driver is None:
+                if self.clock() < self._next_attempt:
+                    return None
+                self._replace("reconnecting")
+            elif self.clock() - self._last_health_check >= self.health_check_interval:
+                self._last_health_check = self.clock()
+                if not self.is_healthy():
+                    self._replace("health check failed")
+            return self.driver
+
+    def report_failure(self):
+        """Health-checks the session after a WebDriver error and replaces it if it is dead."""
+        with self._lock:
+            self._last_health_check = self.clock()
+            if self.driver is not None and not self.is_healthy():
+                self._replace("session stopped responding")
+
+    def js_heap_mb(self) -> float:
+        """Reads the JS heap size of the active session from Chrome performance metrics."""
+        self.driver.execute_cdp_cmd("Performance.enable", {})
+        metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {}).get("metrics", [])
+        sizes = {metric["name"]: metric["value"] for metric in metrics}
+        return sizes.get("JSHeapTotalSize", 0) / (1024 * 1024)
+
+    def record_page(self):
+        """Counts a navigation and recycles the session once it hits the page or memory ceiling."""
+        with self._lock:
+            if self.driver is None:
+                return
+            self.pages += 1
+            if self.max_pages and self.pages >= self.max_pages:
+                self._replace(f"recycled after {self.pages} pages")
+            elif self.max_js_heap_mb and self.pages % self.memory_check_every == 0:
+                try:
+                    heap_mb = self.js_heap_mb()
+                except Exception as e:
+                    logging.debug(f"Could not read Chrome performance metrics: {e}")
+                    return
+                if heap_mb >= self.max_js_heap_mb:
+                    self._replace(f"JS heap at {heap_mb:.0f} MB")
+
+    def close(self):
+        """Quits the active and standby sessions."""
+        with self._lock:
+            self._closed = True
+            standby = self._take_standby() if self._standby_thread else None
+            for driver in (self.driver, standby):
+                if driver:
+                    driver.quit()
+            self.driver = None
@@ -0,0 +1,215 @@
+import base64
+import gzip
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+from collections import deque
+from typing import Optional
+from urllib.parse import urlsplit
+from scrapers.metrics import NULL_METRICS
+
+# Script and style bodies say nothing about why a price was missing, and make up most of a page
+_SCRIPT_OR_STYLE = re.compile(r"(<(script|style)\b[^>]*>).*?(</\2\s*>)", re.IGNORECASE | re.DOTALL)
+# Dots are left out too: a capture's files are grouped by the name before the first dot
+_UNSAFE_NAME_CHARS = re.compile(r"[^A-Za-z0-9_-]+")
+
+# Ends the writer thread
+_STOP = None
+
+
+def trim_page_source(source: str, max_chars: int) -> str:
+    """Empties script and style elements and cuts the page to at most `max_chars` characters."""
+    trimmed = _SCRIPT_OR_STYLE.sub(r"\1\3", source)
+    if len(trimmed) > max_chars:
+        trimmed = trimmed[:max_chars] + f"\n<!-- trimmed {len(trimmed) - max_chars} characters -->"
+    return trimmed
+
+
+class FailureCapture:
+    """
+    Saves what a failed scrape saw (screenshot, trimmed page source, URL, locator, timings)
+    without slowing the scrape path down.
+
+    The calling thread only decides whether to sample the failure and, if so, reads the raw
+    screenshot and page source from the browser, which must happen before the page changes.
+    Decoding, trimming, compression and the writes happen on a background thread. Captures are
+    kept as a ring: once `max_bytes` or `max_entries` is exceeded, the oldest are deleted.
+    Each asset is captured at most once per `min_interval`, so an outage leaves a few samples
+    instead of filling the disk.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 50 * 1024 * 1024, max_entries: int = 500,
+                 min_interval: float = 600.0, page_source_chars: int = 200000, queue_size: int = 16,
+                 metrics=None, clock=time.time):
+        """
+        Initializes the capture and starts its writer thread.
+
+        Args:
+            directory (str): Where captures are written.
+            max_bytes (int): The disk space all captures may use together.
+            max_entries (int): The number of captures kept.
+            min_interval (float): Seconds between two captures of the same asset.
+            page_source_chars (int): The page source is cut to this many characters.
+            queue_size (int): Captures that may wait for the writer before new ones are dropped.
+            metrics (Metrics, optional): Counts saved, sampled-out and dropped captures.
+            clock (callable): Returns the current unix time in seconds.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max(1, max_entries)
+        self.min_interval = min_interval
+        self.page_source_chars = page_source_chars
+        self.metrics = metrics or NULL_METRICS
+        self.clock = clock
+        self.dropped = 0
+        self._last_capture = {}
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=queue_size)
+        os.makedirs(directory, exist_ok=True)
+        self._ring = deque()  # (stem, [paths], bytes), oldest first
+        self._bytes = 0
+        self._load_ring()
+        self._thread = threading.Thread(target=self._run, name="failure-capture", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def from_settings(cls, settings: dict, screenshots_dir: str, metrics=None) -> Optional["FailureCapture"]:
+        """Builds the capture from the 'failure_capture' settings section, or returns None if it is not enabled."""
+        if not settings or not settings.get('enabled'):
+            return None
+        return cls(
+            os.path.join(screenshots_dir, settings.get('subdir', 'failures')),
+            max_bytes=int(settings.get('max_mb', 50) * 1024 * 1024),
+            max_entries=settings.get('max_entries', 500),
+            min_interval=settings.get('min_interval_seconds', 600),
+            page_source_chars=settings.get('page_source_chars', 200000),
+            queue_size=settings.get('queue_size', 16),
+            metrics=metrics,
+        )
+
+    def _load_ring(self):
+        """Picks up the captures of earlier runs, so the size cap covers them too."""
+        stems = {}
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.isfile(path):
+                stems.setdefault(name.split('.', 1)[0], []).append(path)
+        for stem in sorted(stems):
+            paths = stems[stem]
+            size = sum(os.path.getsize(path) for path in paths)
+            self._ring.append((stem, paths, size))
+            self._bytes += size
+        self._evict()
+
+    def _sample(self, key: str) -> bool:
+        now = self.clock()
+        with self._lock:
+            last = self._last_capture.get(key)
+            if last is not None and now - last < self.min_interval:
+                return False
+            self._last_capture[key] = now
+            return True
+
+    def capture(self, driver, url: str, locator_info: dict, reason: str, timings: Optional[dict] = None) -> bool:
+        """
+        Captures a failed scrape if its asset is due for a sample.
+
+        Args:
+            driver (WebDriver, optional): The session that failed; None records the metadata only,
+                e.g. when the session itself is broken.
+            url (str): The page that was scraped.
+            locator_info (dict): The locator that was waited for.
+            reason (str): Why the scrape failed.
+            timings (dict, optional): Phase durations in seconds, e.g. {'navigate': 1.2, 'wait': 15.0}.
+
+        Returns:
+            True if the capture was queued for writing.
+        """
+        asset = self.metrics.asset or None
+        if not self._sample(asset or url):
+            self.metrics.increment("failure_captures", "sampled_out")
+            return False
+
+        entry = {
+            "ts": self.clock(), "asset": asset, "url": url, "locator": locator_info, "reason": reason,
+            "timings_ms": {phase: round(seconds * 1000, 1) for phase, seconds in (timings or {}).items()},
+        }
+        screenshot = source = None
+        if driver is not None:
+            # Only the raw reads happen here; decoding and compression are left to the writer
+            try:
+                screenshot = driver.get_screenshot_as_base64()
+            except Exception as e:
+                entry["screenshot_error"] = str(e)
+            try:
+                source = driver.page_source
+            except Exception as e:
+                entry["page_source_error"] = str(e)
+
+        try:
+            self._queue.put_nowait((entry, screenshot, source))
+        except queue.Full:
+            self.dropped += 1
+            self.metrics.increment("failure_captures", "dropped")
+            return False
+        return True
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            try:
+                self._write(*item)
+            except Exception as e:
+                logging.warning(f"Could not save a failure capture: {e}")
+
+    def _write(self, entry: dict, screenshot: Optional[str], source: Optional[str]):
+        label = entry["asset"] or urlsplit(entry["url"]).netloc
+        stem = f"{int(entry['ts'] * 1000):013d}-{_UNSAFE_NAME_CHARS.sub('_', label)[:60]}"
+        files = []
+        if screenshot:
+            files.append((f"{stem}.png", base64.b64decode(screenshot)))
+            entry["screenshot"] = f"{stem}.png"
+        if source:
+            trimmed = trim_page_source(source, self.page_source_chars)
+            files.append((f"{stem}.html.gz", gzip.compress(trimmed.encode('utf-8'), compresslevel=6)))
+            entry["page_source"] = f"{stem}.html.gz"
+        files.append((f"{stem}.json", json.dumps(entry, ensure_ascii=False, indent=1).encode('utf-8')))
+
+        paths = []
+        for name, data in files:
+            path = os.path.join(self.directory, name)
+            with open(path, 'wb') as f:
+                f.write(data)
+            paths.append(path)
+        size = sum(len(data) for _, data in files)
+        self._ring.append((stem, paths, size))
+        self._bytes += size
+        self._evict()
+        self.metrics.increment("failure_captures", "saved", entry["asset"] or "")
+
+    def _evict(self):
+        # The newest capture is kept even if it alone exceeds the cap
+        while len(self._ring) > 1 and (self._bytes > self.max_bytes or len(self._ring) > self.max_entries):
+            _, paths, size = self._ring.popleft()
+            self._bytes -= size
+            for path in paths:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    @property
+    def disk_bytes(self) -> int:
+        """The disk space the kept captures use."""
+        return self._bytes
+
+    def close(self):
+        """Writes the queued captures and stops the writer thread."""
+        self._queue.put(_STOP)
+        self._thread.join()
@@ -0,0 +1,211 @@
+import bisect
+import logging
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from typing import Optional
+from urllib.parse import quote
+
+# One record per tick: timestamp (unix seconds) and price, both little-endian float64
+RECORD = struct.Struct('<dd')
+
+
+class _TimestampIndex:
+    """Exposes the timestamps of an interleaved (t, p) double view as a sequence for bisect."""
+
+    __slots__ = ("values",)
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values) // 2
+
+    def __getitem__(self, index):
+        return self.values[2 * index]
+
+
+class PriceSeries:
+    """
+    A zero-copy view of a run of records in a history file.
+
+    `timestamps` and `prices` are strided memoryviews over the memory-mapped file, so
+    slicing months of ticks copies nothing until the values are actually read.
+    """
+
+    def __init__(self, values: memoryview):
+        self.values = values
+        self.timestamps = values[0::2]
+        self.prices = values[1::2]
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __iter__(self):
+        return zip(self.timestamps, self.prices)
+
+
+class PriceHistory:
+    """
+    An append-only price store keeping one binary file of (timestamp, price) records per asset.
+
+    Appends go to a buffered file and cost O(1). A background thread flushes and fsyncs
+    dirty files in batches, so the scrape loop never waits on the disk. Reads memory-map the file.
+    """
+
+    def __init__(self, directory: str, fsync_interval: float = 5.0):
+        """
+        Initializes the store.
+
+        Args:
+            directory (str): The directory holding one '.bin' file per asset.
+            fsync_interval (float): Seconds between batched flush + fsync rounds.
+        """
+        self.directory = directory
+        self.fsync_interval = fsync_interval
+        os.makedirs(directory, exist_ok=True)
+
+        self._files = {}
+        self._latest = {}
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="history-fsync", daemon=True)
+        self._flusher.start()
+
+    def path(self, asset: str) -> str:
+        """Returns the history file path of an asset; names are percent-encoded so 'BTC/USDT' is safe."""
+        return os.path.join(self.directory, quote(asset, safe='') + '.bin')
+
+    def _file(self, asset: str):
+        handle = self._files.get(asset)
+        if handle is None:
+            path = self.path(asset)
+            if os.path.exists(path) and os.path.getsize(path) % RECORD.size:
+                # Drop a record torn by a crash mid-write, so new appends stay aligned
+                os.truncate(path, os.path.getsize(path) // RECORD.size * RECORD.size)
+            handle = self._files[asset] = open(path, 'ab')
+            last = self._read_last(asset)
+            if last:
+                self._latest[asset] = last
+        return handle
+
+    def _read_last(self, asset: str):
+        path = self.path(asset)
+        size = os.path.getsize(path) // RECORD.size * RECORD.size
+        if not size:
+            return None
+        with open(path, 'rb') as f:
+            f.seek(size - RECORD.size)
+            return RECORD.unpack(f.read(RECORD.size))
+
+    def append(self, asset: str, price: float, timestamp: Optional[float] = None):
+        """
+        Appends one tick. Timestamps are kept non-decreasing so range queries can bisect.
+
+        Args:
+            asset (str): The asset name.
+            price (float): The parsed price.
+            timestamp (float, optional): Unix seconds; defaults to now.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            handle = self._file(asset)
+            last = self._latest.get(asset)
+            if last and timestamp < last[0]:
+                timestamp = last[0]
+            handle.write(RECORD.pack(timestamp, price))
+            self._latest[asset] = (timestamp, price)
+            self._dirty.add(asset)
+
+    def latest(self, asset: str):
+        """Returns the most recent (timestamp, price) of an asset, or None if it has no history."""
+        with self._lock:
+            if asset not in self._latest and os.path.exists(self.path(asset)):
+                self._file(asset)
+            return self._latest.get(asset)
+
+    def _values(self, asset: str) -> memoryview:
+        """Maps the asset's history file and returns all complete records as a flat double view."""
+        with self._lock:
+            handle = self._files.get(asset)
+            if handle:
+                handle.flush()  # Make buffered appends visible to the mapping
+        path = self.path(asset)
+        if not os.path.exists(path):
+            return memoryview(b'').cast('d')
+        with open(path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size // RECORD.size * RECORD.size
+            if not size:
+                return memoryview(b'').cast('d')
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        # The view keeps the mapping alive; a partially written trailing record is ignored
+        return memoryview(mapped)[:size].cast('d')
+
+    def range(self, asset: str, t0: float, t1: float) -> PriceSeries:
+        """
+        Returns the ticks with t0 <= timestamp <= t1 without copying them.
+
+        Args:
+            asset (str): The asset name.
+            t0 (float): The start of the range in unix seconds.
+            t1 (float): The end of the range in unix seconds.
+        """
+        values = self._values(asset)
+        index = _TimestampIndex(values)
+        lo = bisect.bisect_left(index, t0)
+        hi = bisect.bisect_right(index, t1)
+        return PriceSeries(values[2 * lo:2 * max(lo, hi)])
+
+    def downsample(self, asset: str, t0: float, t1: float, bucket_seconds: float) -> list:
+        """
+        Aggregates a range into fixed-width buckets.
+
+        Returns:
+            A list of (bucket_start, open, high, low, close) tuples for buckets that have ticks.
+        """
+        buckets = []
+        current = None
+        for timestamp, price in self.range(asset, t0, t1):
+            start = t0 + math.floor((timestamp - t0) / bucket_seconds) * bucket_seconds
+            if current is None or current[0] != start:
+                if current:
+                    buckets.append(tuple(current))
+                current = [start, price, price, price, price]
+            else:
+                current[2] = max(current[2], price)
+                current[3] = min(current[3], price)
+                current[4] = price
+        if current:
+            buckets.append(tuple(current))
+        return buckets
+
+    def flush(self):
+        """Flushes and fsyncs every file with unsynced appends."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            handles = [self._files[asset] for asset in dirty]
+            for handle in handles:
+                handle.flush()
+        for handle in handles:
+            try:
+                os.fsync(handle.fileno())
+            except (OSError, ValueError) as e:
+                logging.error(f"Failed to fsync price history: {e}")
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.fsync_interval):
+            self.flush()
+
+    def close(self):
+        """Stops the background flusher, syncs pending appends and closes all files."""
+        self._stop.set()
+        self._flusher.join()
+        self.flush()
+        with self._lock:
+            for handle in self._files.values():
+                handle.close()
+            self._files = {}
@@ -0,0 +1,295 @@
+import logging
+import re
+import threading
+from html.parser import HTMLParser
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+
+# Elements that never have a closing tag, so they are never pushed on the open-element stack
+VOID_ELEMENTS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+})
+
+_COMPOUND_SELECTOR = re.compile(r"^([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)$")
+_SELECTOR_PART = re.compile(r"([.#])([\w-]+)")
+
+
+def _parse_compound(selector: str):
+    """Parses a compound CSS selector like 'span.price#main' into (tag, id, classes)."""
+    match = _COMPOUND_SELECTOR.match(selector)
+    if not match or not selector:
+        return None
+    tag, rest = match.groups()
+    element_id, classes = None, set()
+    for kind, name in _SELECTOR_PART.findall(rest):
+        if kind == "#":
+            element_id = name
+        else:
+            classes.add(name)
+    return (tag.lower() if tag else None, element_id, frozenset(classes))
+
+
+def compile_locator(locator_info: dict):
+    """
+    Translates a Selenium locator into a chain of compound selectors the HTML parser understands.
+
+    Only ID, CLASS_NAME, NAME, TAG_NAME and simple CSS selectors (tags, classes and ids
+    joined by descendant combinators) are supported.
+
+    Args:
+        locator_info (dict): A dictionary containing 'by' and 'value' for the element locator.
+
+    Returns:
+        A list of (tag, id, classes, name) tuples, or None if the locator cannot be matched without a browser.
+    """
+    by, value = locator_info.get('by'), locator_info.get('value', '')
+    if by == "ID":
+        return [(None, value, frozenset(), None)]
+    if by == "CLASS_NAME":
+        return [(None, None, frozenset({value}), None)]
+    if by == "NAME":
+        return [(None, None, frozenset(), value)]
+    if by == "TAG_NAME":
+        return [(value.lower(), None, frozenset(), None)]
+    if by == "CSS_SELECTOR":
+        chain = []
+        for part in value.split():
+            compound = _parse_compound(part)
+            if compound is None:
+                return None
+            chain.append(compound + (None,))
+        return chain or None
+    return None
+
+
+def _matches(compound, element) -> bool:
+    tag, element_id, classes, name = compound
+    el_tag, el_id, el_classes, el_name = element
+    return ((tag is None or tag == el_tag)
+            and (element_id is None or element_id == el_id)
+            and classes <= el_classes
+            and (name is None or name == el_name))
+
+
+class _ElementTextParser(HTMLParser):
+    """Collects the text of the first element matching a compiled locator chain."""
+
+    def __init__(self, chain):
+        super().__init__(convert_charrefs=True)
+        self.chain = chain
+        self.stack = []
+        self.capture_depth = None
+        self.parts = []
+        self.done = False
+
+    def _matches_chain(self) -> bool:
+        if not _matches(self.chain[-1], self.stack[-1]):
+            return False
+        # Remaining compounds must match ancestors in order (descendant combinator)
+        wanted = len(self.chain) - 2
+        for element in reversed(self.stack[:-1]):
+            if wanted < 0:
+                break
+            if _matches(self.chain[wanted], element):
+                wanted -= 1
+        return wanted < 0
+
+    def handle_starttag(self, tag, attrs):
+        if self.done or tag in VOID_ELEMENTS:
+            return
+        attrs = dict(attrs)
+        classes = frozenset((attrs.get('class') or '').split())
+        self.stack.append((tag, attrs.get('id'), classes, attrs.get('name')))
+        if self.capture_depth is None and self._matches_chain():
+            self.capture_depth = len(self.stack)
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        # Pop up to the matching open tag, implicitly closing anything left open inside it
+        for index in range(len(self.stack) - 1, -1, -1):
+            if self.stack[index][0] == tag:
+                del self.stack[index:]
+                break
+        if self.capture_depth is not None and len(self.stack) < self.capture_depth:
+            self.done = True
+
+    def handle_data(self, data):
+        if self.capture_depth is not None and not self.done:
+            self.parts.append(data)
+
+
+def extract_text(html: str, locator_info: dict) -> Optional[str]:
+    """
+    Extracts the text of the element described by a locator from raw HTML.
+
+    Args:
+        html (str): The page source.
+        locator_info (dict): A dictionary containing 'by' and 'value' for the element locator.
+
+    Returns:
+        The stripped element text, or None if the element is missing, empty or the locator is unsupported.
+    """
+    chain = compile_locator(locator_info)
+    if chain is None:
+        return None
+    parser = _ElementTextParser(chain)
+    parser.feed(html)
+    text = ' '.join(''.join(parser.parts).split())
+    return text or None
+
+
+class HttpFetcher:
+    """
+    A lightweight fetcher that reads server-rendered HTML over a pooled HTTP session,
+    without starting a browser.
+    """
+
+    def __init__(self, pool_size: int = 10, timeout: float = 5):
+        """
+        Initializes the fetcher.
+
+        Args:
+            pool_size (int): The number of keep-alive connections to keep per host.
+            timeout (float): The request timeout in seconds.
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+        })
+
+    def fetch(self, url: str, locator_info: dict) -> Optional[str]:
+        """
+        Fetches a page and extracts the located element's text from its HTML.
+
+        Args:
+            url (str): The URL of the page to fetch.
+            locator_info (dict): A dictionary containing 'by' and 'value' for the element locator.
+
+        Returns:
+            The element text, or None when the page cannot be fetched or the element is not in the HTML.
+        """
+        html = self._get(url)
+        return extract_text(html, locator_info) if html is not None else None
+
+    def fetch_fields(self, url: str, locator_info: dict, fields: dict) -> Optional[dict]:
+        """
+        Fetches a page once and extracts the price and every named field from the same HTML.
+
+        Args:
+            url (str): The URL of the page to fetch.
+            locator_info (dict): The locator of the price element.
+            fields (dict): Maps field names to locator dicts.
+
+        Returns:
+            A dict with 'price' and each field's text (None where missing), or None when the page
+            cannot be fetched, the price is not in the HTML or a field needs a browser to locate.
+        """
+        if any(compile_locator(locator) is None for locator in fields.values()):
+            return None
+        html = self._get(url)
+        price = extract_text(html, locator_info) if html is not None else None
+        if price is None:
+            return None
+        record = {name: extract_text(html, locator) for name, locator in fields.items()}
+        record['price'] = price
+        return record
+
+    def _get(self, url: str) -> Optional[str]:
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logging.debug(f"HTTP fast path failed for {url}: {e}")
+            return None
+        return response.text
+
+    def close(self):
+        """Closes the pooled HTTP session."""
+        self.session.close()
+
+
+class FetchRouter:
+    """
+    Tracks which extraction path works for each URL and routes it straight to the cheaper one.
+
+    URLs start on the HTTP fast path. After `miss_limit` consecutive misses they go directly
+    to Selenium, with the fast path re-probed every `probe_interval` scrapes in case the page changed.
+    A fetch whose price text is not a price (e.g. the "—" or "Loading…" placeholder a JS-only page
+    serves before its scripts run) counts as a miss, so the scrape falls back to Selenium.
+    """
+
+    def __init__(self, fetcher: HttpFetcher, miss_limit: int = 3, probe_interval: int = 20, is_price=None):
+        """
+        Initializes the router.
+
+        Args:
+            fetcher (HttpFetcher): Fetches and extracts over plain HTTP.
+            miss_limit (int): Consecutive misses after which a URL goes straight to Selenium.
+            probe_interval (int): How often (in scrapes) a URL on Selenium retries the fast path.
+            is_price (callable, optional): Takes the extracted price text and returns True if it parses;
+                without it any text counts as a hit.
+        """
+        self.fetcher = fetcher
+        self.miss_limit = miss_limit
+        self.probe_interval = probe_interval
+        self.is_price = is_price
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, url: str) -> dict:
+        return self._stats.setdefault(url, {
+            "http_ok": 0, "http_miss": 0, "selenium_ok": 0, "selenium_miss": 0,
+            "consecutive_http_miss": 0, "skipped": 0,
+        })
+
+    def prefers_http(self, url: str) -> bool:
+        """Returns True if the HTTP fast path should be tried for this URL."""
+        with self._lock:
+            entry = self._entry(url)
+            if entry["consecutive_http_miss"] < self.miss_limit:
+                return True
+            entry["skipped"] += 1
+            return entry["skipped"] % self.probe_interval == 0
+
+    def fetch(self, url: str, locator_info: dict, fields: Optional[dict] = None):
+        """
+        Tries the HTTP fast path and records the outcome; with `fields`, returns a record like HttpFetcher.fetch_fields.
+        Returns None on a miss, including when the price text does not parse.
+        """
+        text = self.fetcher.fetch_fields(url, locator_info, fields) if fields else self.fetcher.fetch(url, locator_info)
+        if text is not None and self.is_price:
+            price = text.get('price') if fields else text
+            if price is None or not self.is_price(price):
+                logging.debug(f"HTTP fast path for {url} found no price in '{price}', falling back to Selenium.")
+                text = None
+        with self._lock:
+            entry = self._entry(url)
+            if text is None:
+                entry["http_miss"] += 1
+                entry["consecutive_http_miss"] += 1
+            else:
+                entry["http_ok"] += 1
+                entry["consecutive_http_miss"] = 0
+                entry["skipped"] = 0
+        return text
+
+    def record_selenium(self, url: str, success: bool):
+        """Records the outcome of a Selenium fallback scrape."""
+        with self._lock:
+            self._entry(url)["selenium_ok" if success else "selenium_miss"] += 1
+
+    def stats(self) -> dict:
+        """Returns a copy of the per-URL path statistics."""
+        with self._lock:
+            return {url: dict(entry) for url, entry in self._stats.items()}
+
+    def close(self):
+        """Closes the underlying fetcher."""
+        self.fetcher.close()
@@ -0,0 +1,193 @@
+import json
+import logging
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+
+def parse_status(payload: dict) -> tuple:
+    """
+    Reads a Selenium Grid /status answer.
+
+    Grid 4 lists its nodes and their slots; a slot without a session is free, and only nodes
+    that are UP count. A Grid with at least one UP node is healthy even when every slot is busy
+    (it then reports ready: false); fullness shows in `free`, not in health. Older hubs and
+    standalone servers only say whether they are ready, which is counted as one slot.
+
+    Returns:
+        A (healthy, capacity, free) tuple.
+    """
+    value = payload.get('value', payload)
+    ready = bool(value.get('ready'))
+    nodes = value.get('nodes')
+    if nodes is None:
+        return ready, 1, 1 if ready else 0
+    capacity = free = 0
+    for node in nodes:
+        if str(node.get('availability', 'UP')).upper() != 'UP':
+            continue
+        slots = node.get('slots', [])
+        capacity += len(slots)
+        free += sum(1 for slot in slots if not slot.get('session'))
+    return capacity > 0, capacity, free
+
+
+def fetch_status(url: str, timeout: float) -> dict:
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+class HubState:
+    """What the last poll of one hub found, plus the sessions sent to it since."""
+
+    __slots__ = ("url", "healthy", "capacity", "free", "assigned", "error")
+
+    def __init__(self, url: str):
+        self.url = url
+        self.healthy = True  # Until the first poll says otherwise
+        self.capacity = 1
+        self.free = 1
+        self.assigned = 0
+        self.error = None
+
+    @property
+    def load(self) -> float:
+        """The share of the hub's slots in use, counting sessions sent since the last poll."""
+        if not self.capacity:
+            return 1.0
+        return (self.capacity - self.free + self.assigned) / self.capacity
+
+
+class HubBalancer:
+    """
+    Spreads WebDriver sessions over several Selenium hubs by their free capacity.
+
+    Each hub's /status is polled in the background for healthy nodes and free slots. New
+    sessions go to the healthy hub with the lowest load; a hub that fails its poll or has no
+    healthy node gets no new sessions, and should_move() tells scrapers to move their sessions
+    off it, or off a hub much busier than the least loaded one.
+    """
+
+    def __init__(self, hubs, poll_interval: float = 10.0, timeout: float = 3.0, rebalance_margin: float = 0.5,
+                 fetch=fetch_status):
+        """
+        Initializes the balancer and polls every hub once.
+
+        Args:
+            hubs (iterable): The hub URLs, as passed to webdriver.Remote.
+            poll_interval (float): Seconds between two polls of every hub.
+            timeout (float): Seconds a hub may take to answer its /status.
+            rebalance_margin (float): How much higher (as a share of slots) a hub's load must be than the
+                least loaded hub's before its sessions are moved.
+            fetch (callable): Takes (url, timeout) and returns the decoded /status JSON.
+        """
+        self.hubs = {url: HubState(url) for url in hubs}
+        if not self.hubs:
+            raise ValueError("At least one Selenium hub is needed.")
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.rebalance_margin = rebalance_margin
+        self.fetch = fetch
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._executor = ThreadPoolExecutor(max_workers=len(self.hubs), thread_name_prefix="hub-status")
+        self._thread = None
+        self.poll()
+
+    @classmethod
+    def from_settings(cls, hubs, settings: dict) -> Optional["HubBalancer"]:
+        """
+        Builds and starts the balancer for the configured hubs, or returns None for a single hub
+        unless the 'hub_balancing' settings section enables it anyway.
+        """
+        settings = settings or {}
+        if len(hubs) < 2 and not settings.get('enabled'):
+            return None
+        balancer = cls(
+            hubs,
+            poll_interval=settings.get('poll_interval_seconds', 10.0),
+            timeout=settings.get('timeout_seconds', 3.0),
+            rebalance_margin=settings.get('rebalance_margin', 0.5),
+        )
+        balancer.start()
+        return balancer
+
+    @staticmethod
+    def status_url(hub: str) -> str:
+        # Grid 4 also answers /status under /wd/hub, so the hub URL can be used as configured
+        return hub.rstrip('/') + '/status'
+
+    def _poll_one(self, hub: str) -> tuple:
+        try:
+            return parse_status(self.fetch(self.status_url(hub), self.timeout)) + (None,)
+        except Exception as e:
+            return False, 0, 0, str(e)
+
+    def poll(self):
+        """Polls every hub's /status in parallel and updates their states."""
+        results = dict(zip(self.hubs, self._executor.map(self._poll_one, list(self.hubs))))
+        with self._lock:
+            for url, (healthy, capacity, free, error) in results.items():
+                state = self.hubs[url]
+                if state.healthy and not healthy:
+                    logging.warning(f"Selenium hub {url} is unhealthy, draining it: {error or 'no healthy nodes'}")
+                elif healthy and not state.healthy:
+                    logging.info(f"Selenium hub {url} is healthy again.")
+                state.healthy, state.capacity, state.free, state.error = healthy, capacity, free, error
+                # The poll already counts the sessions sent before it
+                state.assigned = 0
+
+    def start(self):
+        """Starts polling in the background."""
+        def run():
+            while not self._stop.wait(self.poll_interval):
+                self.poll()
+
+        self._thread = threading.Thread(target=run, name="hub-balancer", daemon=True)
+        self._thread.start()
+
+    def choose(self) -> Optional[str]:
+        """Returns the healthy hub with the lowest load for a new session, or None if no hub is healthy."""
+        with self._lock:
+            healthy = [state for state in self.hubs.values() if state.healthy]
+            if not healthy:
+                return None
+            best = min(healthy, key=lambda state: (state.load, -state.free))
+            best.assigned += 1
+            return best.url
+
+    def should_move(self, hub: str) -> bool:
+        """True if sessions on the hub should move: it is unhealthy, or busier than the least loaded hub by the margin."""
+        with self._lock:
+            state = self.hubs.get(hub)
+            if state is None:
+                return False
+            others = [other for other in self.hubs.values() if other.healthy and other is not state and other.free > other.assigned]
+            if not others:
+                return False
+            if not state.healthy:
+                return True
+            return state.load - min(other.load for other in others) > self.rebalance_margin
+
+    def free_slots(self) -> int:
+        """The free slots of all healthy hubs, as of the last poll."""
+        with self._lock:
+            return sum(state.free for state in self.hubs.values() if state.healthy)
+
+    def snapshot(self) -> list:
+        """The state of every hub, for logs and stats."""
+        with self._lock:
+            return [
+                {"url": state.url, "healthy": state.healthy, "capacity": state.capacity, "free": state.free,
+                 "assigned": state.assigned, "error": state.error}
+                for state in self.hubs.values()
+            ]
+
+    def close(self):
+        """Stops polling."""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,122 @@
+import math
+from collections import deque
+from typing import Optional
+
+# The indicators an alert rule may name; each is computed over a time window
+INDICATORS = ("sma", "ema", "min", "max", "pct_change", "stddev", "stddev_pct")
+
+INDICATOR_LABELS = {
+    "sma": "Average",
+    "ema": "EMA",
+    "min": "Low",
+    "max": "High",
+    "pct_change": "Change %",
+    "stddev": "Volatility",
+    "stddev_pct": "Volatility %",
+}
+
+
+class RollingWindow:
+    """
+    The prices of one asset over the last `seconds`, with every indicator kept up to date
+    incrementally: running sums for the mean and standard deviation, monotonic deques for the
+    minimum and maximum, and a time-weighted EMA. Each tick costs O(1) amortized, whatever the window size.
+    """
+
+    __slots__ = ("seconds", "samples", "mins", "maxs", "seq", "total", "total_sq", "shift", "ema", "ema_ts")
+
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.samples = deque()  # (seq, timestamp, price), oldest first
+        self.mins = deque()  # (seq, price), increasing prices
+        self.maxs = deque()  # (seq, price), decreasing prices
+        self.seq = 0
+        # Sums of (price - shift) keep the variance accurate for prices far from zero
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.shift = None
+        self.ema = None
+        self.ema_ts = None
+
+    def add(self, timestamp: float, price: float):
+        """Adds a tick and evicts ticks that fell out of the window."""
+        if self.shift is None:
+            self.shift = price
+        offset = price - self.shift
+        seq = self.seq
+        self.seq += 1
+        self.samples.append((seq, timestamp, price))
+        self.total += offset
+        self.total_sq += offset * offset
+
+        while self.mins and self.mins[-1][1] >= price:
+            self.mins.pop()
+        self.mins.append((seq, price))
+        while self.maxs and self.maxs[-1][1] <= price:
+            self.maxs.pop()
+        self.maxs.append((seq, price))
+
+        if self.ema is None:
+            self.ema = price
+        else:
+            # The weight of the new tick grows with the time since the previous one
+            alpha = 1 - math.exp(-max(0.0, timestamp - self.ema_ts) / self.seconds)
+            self.ema += alpha * (price - self.ema)
+        self.ema_ts = timestamp
+
+        cutoff = timestamp - self.seconds
+        while len(self.samples) > 1 and self.samples[0][1] < cutoff:
+            old_seq, _, old_price = self.samples.popleft()
+            old_offset = old_price - self.shift
+            self.total -= old_offset
+            self.total_sq -= old_offset * old_offset
+            if self.mins[0][0] == old_seq:
+                self.mins.popleft()
+            if self.maxs[0][0] == old_seq:
+                self.maxs.popleft()
+
+    def _stddev(self) -> Optional[float]:
+        count = len(self.samples)
+        if count < 2:
+            return None
+        variance = (self.total_sq - self.total * self.total / count) / (count - 1)
+        return math.sqrt(max(0.0, variance))
+
+    def value(self, indicator: str) -> Optional[float]:
+        """Returns an indicator's current value, or None while the window holds too few ticks for it."""
+        count = len(self.samples)
+        if not count:
+            return None
+        if indicator == "sma":
+            return self.shift + self.total / count
+        if indicator == "ema":
+            return self.ema
+        if indicator == "min":
+            return self.mins[0][1]
+        if indicator == "max":
+            return self.maxs[0][1]
+        if indicator == "pct_change":
+            first, last = self.samples[0][2], self.samples[-1][2]
+            return (last - first) / first * 100 if count > 1 and first else None
+        if indicator == "stddev":
+            return self._stddev()
+        if indicator == "stddev_pct":
+            stddev, mean = self._stddev(), self.shift + self.total / count
+            return stddev / mean * 100 if stddev is not None and mean else None
+        raise ValueError(f"Unknown indicator {indicator!r}")
+
+
+class AssetIndicators:
+    """The rolling windows of one asset, one per distinct window length its rules use."""
+
+    __slots__ = ("windows",)
+
+    def __init__(self, seconds=()):
+        self.windows = {window: RollingWindow(window) for window in seconds}
+
+    def add(self, timestamp: float, price: float):
+        for window in self.windows.values():
+            window.add(timestamp, price)
+
+    def value(self, indicator: str, seconds: float) -> Optional[float]:
+        return self.windows[seconds].value(indicator)
@@ -0,0 +1,188 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from scrapers.scraper import EXTRACT_FIELDS_SCRIPT, Scraper, field_arguments
+from scrapers.waits import FetchAborted, PageErrorDetected
+
+# Attaches a MutationObserver to the price element and remembers when its text last changed
+INSTALL_OBSERVER_SCRIPT = """
+const el = arguments[0];
+if (window.__priceWatch) { window.__priceWatch.observer.disconnect(); }
+const state = {el: el, value: el.textContent.trim(), changedAt: Date.now()};
+state.observer = new MutationObserver(function () {
+    const value = state.el.textContent.trim();
+    if (value !== state.value) { state.value = value; state.changedAt = Date.now(); }
+});
+state.observer.observe(el, {childList: true, characterData: true, subtree: true});
+window.__priceWatch = state;
+return state.value;
+"""
+
+# Reads the observed value in a single round trip; null means the element is gone or was never observed
+READ_OBSERVER_SCRIPT = """
+const state = window.__priceWatch;
+if (!state || !state.el.isConnected) { return null; }
+return {value: state.value, changedAt: state.changedAt};
+"""
+
+
+class LiveTabScraper(Scraper):
+    """
+    A scraper that keeps one browser tab open per URL and reads prices that update in place,
+    instead of navigating to the page on every scrape.
+    """
+
+    def __init__(self, selenium_hub_url: str, max_tabs: int = 50, **kwargs):
+        """
+        Initializes the LiveTabScraper.
+
+        Args:
+            selenium_hub_url (str): The URL of the Selenium Grid hub.
+            max_tabs (int): The maximum number of tabs kept open; the least recently read tab is closed first.
+        """
+        self.max_tabs = max_tabs
+        self.tabs = OrderedDict()
+        self._changed_at = {}
+        super().__init__(selenium_hub_url, **kwargs)
+        self._generation = self.manager.generation
+
+    def _open_tab(self, url: str, locator_info: dict) -> str:
+        """Opens (or reuses the initial blank) tab for a URL and installs the observer."""
+        if self.tabs:
+            if len(self.tabs) >= self.max_tabs:
+                self._close_tab(next(iter(self.tabs)))
+            self.driver.switch_to.new_window('tab')
+        self.tabs[url] = self.driver.current_window_handle
+        with self.metrics.timer("navigate"):
+            self.driver.get(url)
+        value = self._install_observer(url, locator_info)
+        self.manager.record_page()
+        return value
+
+    def _close_tab(self, url: str):
+        handle = self.tabs.pop(url)
+        self._changed_at.pop(url, None)
+        self.driver.switch_to.window(handle)
+        self.driver.close()
+        if self.tabs:
+            self.driver.switch_to.window(next(reversed(self.tabs.values())))
+
+    def _discard_tab(self, url: str):
+        """Closes a tab after an error, as far as the session still allows, and forgets it."""
+        if url not in self.tabs:
+            return
+        try:
+            self._close_tab(url)
+        except Exception as e:
+            logging.debug(f"Could not close the live tab for {url}: {e}")
+            self.tabs.pop(url, None)
+            self._changed_at.pop(url, None)
+
+    def last_changed(self, url: str) -> Optional[float]:
+        """The unix time the watched price of the URL last changed, or None before the first change was seen."""
+        return self._changed_at.get(url)
+
+    def _install_observer(self, url: str, locator_info: dict) -> str:
+        """Waits for the locator element and starts observing it."""
+        with self.metrics.timer("wait"):
+            element = self._wait_for_element(url, locator_info)
+        value = self.driver.execute_script(INSTALL_OBSERVER_SCRIPT, element)
+        self._changed_at[url] = None
+        return value
+
+    def scrape(self, url: str, locator_info: dict) -> str:
+        """
+        Reads the current value from the URL's live tab, opening the tab on first use and
+        reloading it when the observed element has gone stale.
+
+        Args:
+            url (str): The URL of the page to watch.
+            locator_info (dict): A dictionary containing 'by' and 'value' for the element locator.
+
+        Returns:
+            The current text of the watched element, or "Error" if not found or on error.
+        """
+        self._rebalance()
+        self._aborted.clear()
+        if not self.manager.acquire():
+            logging.error("WebDriver not available. Scraping aborted.")
+            return "Error"
+
+        if self.manager.generation != self._generation:
+            # The session was replaced, so every tab handle belongs to a browser that is gone
+            self.tabs.clear()
+            self._changed_at.clear()
+            self._generation = self.manager.generation
+
+        started = time.perf_counter()
+        try:
+            if url not in self.tabs:
+                return self._open_tab(url, locator_info)
+
+            self.tabs.move_to_end(url)
+            with self.metrics.timer("extract"):
+                self.driver.switch_to.window(self.tabs[url])
+                state = self.driver.execute_script(READ_OBSERVER_SCRIPT)
+            if state is None:
+                logging.info(f"Watched element went stale, reloading {url}")
+                with self.metrics.timer("navigate"):
+                    self.driver.refresh()
+                value = self._install_observer(url, locator_info)
+                self.manager.record_page()
+                return value
+
+            self._changed_at[url] = state['changedAt'] / 1000.0
+            return state['value']
+        except TimeoutException:
+            logging.error(f"Timeout while waiting for element at {url}")
+            self._capture_failure(url, locator_info, "timeout", {}, started)
+            return "Error"
+        except FetchAborted:
+            # Only the wait was cut short; with no observer installed the next scrape reloads the tab
+            logging.debug(f"Reading the live tab for {url} was aborted, its result is no longer needed.")
+            return "Error"
+        except PageErrorDetected as e:
+            # The tab stays open; with no observer installed the next scrape reloads it
+            logging.error(f"Error page detected at {url} ('{e}'), not waiting for the price.")
+            self._capture_failure(url, locator_info, f"error page: {e}", {}, started)
+            return "Error"
+        except WebDriverException as e:
+            # The tab itself may be gone; forget it so the next scrape opens a fresh one
+            logging.error(f"An error occurred while reading the live tab for {url}: {e}")
+            self._capture_failure(url, locator_info, f"webdriver: {e}", {}, started, with_page=False)
+            self._discard_tab(url)
+            self.manager.report_failure()
+            return "Error"
+        except Exception as e:
+            logging.error(f"An error occurred while scraping {url}: {e}")
+            self._capture_failure(url, locator_info, str(e), {}, started)
+            return "Error"
+
+    def scrape_fields(self, url: str, locator_info: dict, fields: dict) -> dict:
+        """
+        Reads the observed price from the URL's live tab, then every other field in one
+        execute_script round trip on the same tab, without navigating.
+
+        Returns:
+            A dict with 'price' and each field's text; values are None where not found or on error.
+        """
+        record = dict.fromkeys(fields)
+        price = self.scrape(url, locator_info)
+        record['price'] = None if price == "Error" else price
+        if record['price'] is None or not fields:
+            return record
+        try:
+            with self.metrics.timer("extract"):
+                values = self.driver.execute_script(EXTRACT_FIELDS_SCRIPT, field_arguments(locator_info, fields)[1:])
+            record.update(values or {})
+        except WebDriverException as e:
+            logging.error(f"Could not read the fields of {url}: {e}")
+        return record
+
+    def close(self):
+        """Closes every tab and the WebDriver session."""
+        self.tabs.clear()
+        self._changed_at.clear()
+        super().close()
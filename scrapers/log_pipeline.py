@@ -0,0 +1,189 @@
+import datetime
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Optional
+
+# The structured fields a record may carry through `extra=`
+RECORD_FIELDS = ("asset", "price", "fields", "latency_ms", "source")
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# The logger price lines go to, so they can be told apart from diagnostics
+PRICE_LOG = logging.getLogger("prices")
+
+_active = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON line with its structured fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.datetime.fromtimestamp(record.created, datetime.timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for name in RECORD_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                entry[name] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class PriceChangeFilter(logging.Filter):
+    """
+    Thins out price lines whose price did not change since the asset's previous line.
+
+    Modes: "all" keeps every line, "change_only" drops unchanged ones and "sample" keeps every
+    `sample_every`-th unchanged one. Lines without a price (errors, diagnostics) always pass.
+    """
+
+    def __init__(self, mode: str = "all", sample_every: int = 10):
+        super().__init__()
+        if mode not in ("all", "change_only", "sample"):
+            raise ValueError(f"Unknown logging mode {mode!r}")
+        self.mode = mode
+        self.sample_every = max(1, sample_every)
+        self._last = {}  # asset -> (price, unchanged lines since the last kept one)
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        price = getattr(record, "price", None)
+        if self.mode == "all" or price is None:
+            return True
+        asset = getattr(record, "asset", None)
+        with self._lock:
+            last_price, unchanged = self._last.get(asset, (None, 0))
+            if price != last_price:
+                self._last[asset] = (price, 0)
+                return True
+            unchanged += 1
+            keep = self.mode == "sample" and unchanged % self.sample_every == 0
+            self._last[asset] = (price, unchanged)
+            return keep
+
+
+class DroppingQueueHandler(QueueHandler):
+    """A QueueHandler that drops records when the queue is full instead of blocking or raising."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """
+    Moves log I/O off the calling threads: records are filtered and queued by a QueueHandler on
+    the root logger, then formatted and written by a QueueListener thread, as JSON lines to a
+    size-rotated file in `logs_dir` and as plain text to the console.
+    """
+
+    def __init__(self, path: Optional[str], max_bytes: int = 10 * 1024 * 1024, backup_count: int = 5,
+                 mode: str = "all", sample_every: int = 10, console: bool = True, queue_size: int = 10000):
+        """
+        Initializes the pipeline.
+
+        Args:
+            path (str, optional): The JSON lines file; None logs to the console only.
+            max_bytes (int): The size at which the file is rotated.
+            backup_count (int): How many rotated files are kept.
+            mode (str): "all", "change_only" or "sample"; see PriceChangeFilter.
+            sample_every (int): In "sample" mode, one in this many unchanged price lines is kept.
+            console (bool): Also write plain-text lines to stderr.
+            queue_size (int): Records that may wait for the writer before new ones are dropped.
+        """
+        handlers = []
+        if path:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            file_handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            file_handler.setFormatter(JsonFormatter())
+            handlers.append(file_handler)
+        if console:
+            console_handler = logging.StreamHandler(sys.stderr)
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(console_handler)
+        self.path = path
+        self.handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.handler.addFilter(PriceChangeFilter(mode, sample_every))
+        self.listener = QueueListener(self.handler.queue, *handlers, respect_handler_level=True)
+        self._previous_handlers = []
+
+    @classmethod
+    def from_settings(cls, settings: dict, logs_dir: str, suffix: str = "") -> Optional["LogPipeline"]:
+        """
+        Builds the pipeline from the 'logging' settings section, or returns None if it is not enabled.
+
+        Args:
+            settings (dict): The 'logging' section.
+            logs_dir (str): The directory the file goes to.
+            suffix (str): Appended to the file name, so each process writes (and rotates) its own file.
+        """
+        if not settings or not settings.get('enabled'):
+            return None
+        path = None
+        if settings.get('file', 'scraper.jsonl'):
+            stem, extension = os.path.splitext(settings.get('file', 'scraper.jsonl'))
+            path = os.path.join(logs_dir, f"{stem}{suffix}{extension}")
+        return cls(
+            path,
+            max_bytes=settings.get('max_bytes', 10 * 1024 * 1024),
+            backup_count=settings.get('backup_count', 5),
+            mode=settings.get('mode', 'all'),
+            sample_every=settings.get('sample_every', 10),
+            console=settings.get('console', True),
+            queue_size=settings.get('queue_size', 10000),
+        )
+
+    @property
+    def dropped(self) -> int:
+        """The number of records dropped because the writer fell behind."""
+        return self.handler.dropped
+
+    def start(self):
+        """Routes the root logger through the queue and starts the writer thread."""
+        global _active
+        root = logging.getLogger()
+        self._previous_handlers = root.handlers[:]
+        root.handlers = [self.handler]
+        self.listener.start()
+        _active = self
+
+    def stop(self):
+        """Writes out the queued records, stops the writer and restores the previous handlers."""
+        global _active
+        _active = None
+        self.listener.stop()
+        logging.getLogger().handlers = self._previous_handlers
+        for handler in self.listener.handlers:
+            handler.close()
+        if self.dropped:
+            logging.warning(f"Dropped {self.dropped} log records because the log writer fell behind.")
+
+
+def log_price(message: str, asset: str, price: Optional[float], fields: Optional[dict] = None,
+              latency_ms: Optional[float] = None, source: Optional[str] = None):
+    """
+    Reports a scraped price. With a running pipeline it is one structured record, filtered and
+    written off-thread; without one it is printed and logged as plain text.
+    """
+    if _active is None:
+        print(message)
+        logging.info(message)
+        return
+    PRICE_LOG.info(message, extra={
+        "asset": asset, "price": price, "fields": fields or None, "latency_ms": latency_ms, "source": source,
+    })
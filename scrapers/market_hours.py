@@ -0,0 +1,178 @@
+import datetime
+import threading
+import time
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def parse_days(spec: str) -> frozenset:
+    """
+    Parses a weekday spec such as "mon-fri", "sun-thu" or "mon,wed,fri" into weekday numbers (Monday is 0).
+
+    Raises:
+        ValueError: If a day name is unknown.
+    """
+    if spec in ("daily", "*"):
+        return frozenset(range(7))
+    days = set()
+    for part in spec.lower().split(','):
+        first, _, last = part.strip().partition('-')
+        start = WEEKDAYS.index(first)
+        end = WEEKDAYS.index(last) if last else start
+        days.update((start + offset) % 7 for offset in range((end - start) % 7 + 1))
+    return frozenset(days)
+
+
+def _parse_time(value: str) -> datetime.time:
+    return datetime.time.fromisoformat(value)
+
+
+class TradingSession:
+    """One daily trading window; a close at or before the open means the session ends the next day."""
+
+    __slots__ = ("days", "open", "close")
+
+    def __init__(self, days: frozenset, open_time: datetime.time, close_time: datetime.time):
+        self.days = days
+        self.open = open_time
+        self.close = close_time
+
+    @property
+    def overnight(self) -> bool:
+        return self.close <= self.open
+
+
+class TradingCalendar:
+    """The trading sessions, time zone, holidays and early closes of one market."""
+
+    def __init__(self, timezone: str, sessions: list, holidays=(), early_closes: Optional[dict] = None):
+        """
+        Initializes the calendar.
+
+        Args:
+            timezone (str): The IANA time zone the session times are in, e.g. "Europe/Warsaw".
+            sessions (list): TradingSession objects.
+            holidays (iterable): Dates (datetime.date) on which no session opens.
+            early_closes (dict, optional): Maps a date to the time the market closes early that day.
+        """
+        self.timezone = ZoneInfo(timezone)
+        self.sessions = sessions
+        self.holidays = frozenset(holidays)
+        self.early_closes = early_closes or {}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TradingCalendar":
+        """
+        Builds a calendar from config data like:
+            {"timezone": "Europe/Warsaw", "sessions": [{"days": "mon-fri", "open": "09:00", "close": "17:05"}],
+             "holidays": ["2026-12-24"], "early_closes": {"2026-12-31": "14:00"}}
+
+        Raises:
+            ValueError: If the time zone, a day spec, a time or a date is invalid.
+            KeyError: If a required key is missing.
+        """
+        try:
+            timezone = ZoneInfo(data['timezone'])
+        except Exception as e:
+            raise ValueError(f"Unknown time zone {data.get('timezone')!r}") from e
+        sessions = [
+            TradingSession(parse_days(entry.get('days', 'mon-fri')), _parse_time(entry['open']), _parse_time(entry['close']))
+            for entry in data['sessions']
+        ]
+        holidays = [datetime.date.fromisoformat(day) for day in data.get('holidays', [])]
+        early_closes = {
+            datetime.date.fromisoformat(day): _parse_time(close) for day, close in data.get('early_closes', {}).items()
+        }
+        return cls(timezone.key, sessions, holidays, early_closes)
+
+    def _trades_on(self, session: TradingSession, day: datetime.date) -> bool:
+        return day.weekday() in session.days and day not in self.holidays
+
+    def is_open(self, timestamp: float) -> bool:
+        """Returns True if any session is open at the given unix time."""
+        local = datetime.datetime.fromtimestamp(timestamp, self.timezone)
+        today, now = local.date(), local.time()
+        yesterday = today - datetime.timedelta(days=1)
+        for session in self.sessions:
+            if session.overnight:
+                if self._trades_on(session, today) and now >= session.open:
+                    return True
+                if self._trades_on(session, yesterday) and now < min(session.close, self.early_closes.get(today, session.close)):
+                    return True
+            elif self._trades_on(session, today):
+                if session.open <= now < min(session.close, self.early_closes.get(today, session.close)):
+                    return True
+        return False
+
+
+def parse_calendars(market_hours: dict) -> dict:
+    """
+    Builds every calendar of the 'market_hours' settings section.
+
+    Returns:
+        A dict mapping calendar names to TradingCalendar objects.
+    """
+    return {name: TradingCalendar.from_dict(data) for name, data in market_hours.get('calendars', {}).items()}
+
+
+class MarketHours:
+    """
+    Decides whether an asset should be scraped now, given its market's trading calendar.
+
+    Assets without a calendar (crypto, forex) are always open. Closed assets are skipped,
+    except for one heartbeat scrape every `heartbeat` seconds; in between, their last
+    known price is served from memory.
+    """
+
+    def __init__(self, calendars: dict, heartbeat: float = 3600.0, clock=time.time):
+        """
+        Initializes the gate.
+
+        Args:
+            calendars (dict): Maps calendar names to TradingCalendar objects.
+            heartbeat (float): Seconds between scrapes of a closed market (0 never scrapes it while closed).
+            clock (callable): Returns the current unix time in seconds.
+        """
+        self.calendars = calendars
+        self.heartbeat = heartbeat
+        self.clock = clock
+        self._last_scraped = {}
+        self._last_prices = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, market_hours: dict) -> Optional["MarketHours"]:
+        """Builds the gate from the 'market_hours' settings section, or returns None if it is not enabled."""
+        if not market_hours or not market_hours.get('enabled'):
+            return None
+        return cls(parse_calendars(market_hours), market_hours.get('heartbeat_seconds', 3600))
+
+    def is_open(self, asset) -> bool:
+        """Returns True if the asset's market is open now (always, for assets without a calendar)."""
+        calendar = self.calendars.get(asset.calendar) if asset.calendar else None
+        return calendar is None or calendar.is_open(self.clock())
+
+    def should_scrape(self, asset) -> bool:
+        """Returns True if the asset should be scraped now: its market is open or a heartbeat is due."""
+        if self.is_open(asset):
+            return True
+        now = self.clock()
+        with self._lock:
+            last = self._last_scraped.get(asset.name)
+            # The first closed-market scrape after startup fetches the price that is then served from memory
+            if last is not None and (self.heartbeat <= 0 or now - last < self.heartbeat):
+                return False
+            self._last_scraped[asset.name] = now
+            return True
+
+    def remember(self, asset_name: str, price: float):
+        """Stores the latest scraped price of an asset."""
+        with self._lock:
+            self._last_prices[asset_name] = price
+
+    def last_price(self, asset_name: str) -> Optional[float]:
+        """Returns the last scraped price of an asset, or None."""
+        with self._lock:
+            return self._last_prices.get(asset_name)
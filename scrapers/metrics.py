@@ -0,0 +1,281 @@
+import bisect
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds in seconds; they span a parsed string (microseconds) up to a slow page load
+PHASE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_PREFIX = "price_scraper"
+
+
+class Histogram:
+    """Latency observations counted into fixed buckets, as Prometheus histograms expect."""
+
+    __slots__ = ("buckets", "counts", "count", "total", "max")
+
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # The last slot is the +Inf bucket
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile as the upper bound of the bucket holding it (capped at the max seen)."""
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class _Timer:
+    """Times a `with` block with perf_counter and records it as one phase observation."""
+
+    __slots__ = ("metrics", "phase", "asset", "started")
+
+    def __init__(self, metrics, phase: str, asset):
+        self.metrics = metrics
+        self.phase = phase
+        self.asset = asset
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.phase, time.perf_counter() - self.started, self.asset)
+        return False
+
+
+class _AssetBinding:
+    """Binds an asset to the calling thread for the duration of a `with` block."""
+
+    __slots__ = ("metrics", "asset", "previous")
+
+    def __init__(self, metrics, asset: str):
+        self.metrics = metrics
+        self.asset = asset
+
+    def __enter__(self):
+        self.previous = self.metrics.asset
+        self.metrics._local.asset = self.asset
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics._local.asset = self.previous
+        return False
+
+
+class _AssetScope(_Timer):
+    """Binds an asset to the thread for the duration of a `track()` block and times it as a cycle."""
+
+    __slots__ = ("previous",)
+
+    def __init__(self, metrics, asset: str):
+        super().__init__(metrics, "cycle", asset)
+
+    def __enter__(self):
+        self.previous = self.metrics.asset
+        self.metrics._local.asset = self.asset
+        return super().__enter__()
+
+    def __exit__(self, *exc_info):
+        super().__exit__(*exc_info)
+        self.metrics._local.asset = self.previous
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """
+    Phase timings and outcome counters for the scrape hot path.
+
+    Phases (navigate, wait, extract, parse, alert, notify, cycle, ...) are kept as per-asset
+    latency histograms. The asset is bound per thread by `track()`, so code deeper in the
+    call stack (e.g. Scraper.scrape) can time its phases without knowing which asset it serves.
+    A disabled instance makes every call a no-op.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: tuple = PHASE_BUCKETS):
+        """
+        Initializes the registry.
+
+        Args:
+            enabled (bool): When false, nothing is recorded.
+            buckets (tuple): Histogram bucket upper bounds in seconds.
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def asset(self) -> str:
+        """The asset bound to the calling thread, or '' outside of `track()`."""
+        return getattr(self._local, 'asset', '')
+
+    def track(self, asset: str):
+        """
+        Binds an asset to the calling thread and times the whole block as its 'cycle' phase.
+
+        Usage:
+            with metrics.track("BTC/USDT"):
+                ...
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _AssetScope(self, asset)
+
+    def bind(self, asset: str):
+        """Binds an asset to the calling thread without timing anything, e.g. in a helper thread."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _AssetBinding(self, asset)
+
+    def timer(self, phase: str, asset: str = None):
+        """Returns a context manager recording the duration of its block under the given phase."""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, phase, asset)
+
+    def observe(self, phase: str, seconds: float, asset: str = None):
+        """Records one phase duration for an asset (the thread's bound asset by default)."""
+        if not self.enabled:
+            return
+        key = (self.asset if asset is None else asset, phase)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def increment(self, name: str, outcome: str, asset: str = None):
+        """Increments a counter such as ('scrapes', 'error') for an asset."""
+        if not self.enabled:
+            return
+        key = (name, self.asset if asset is None else asset, outcome)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+
+    def render(self) -> str:
+        """Returns every metric in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = sorted(
+                (key, list(h.counts), h.count, h.total) for key, h in self._histograms.items()
+            )
+            counters = sorted(self._counters.items())
+
+        name = f"{METRIC_PREFIX}_phase_seconds"
+        lines = [f"# HELP {name} Time spent in each scrape phase.", f"# TYPE {name} histogram"]
+        for (asset, phase), counts, count, total in histograms:
+            labels = f'asset="{_escape(asset)}",phase="{_escape(phase)}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{{labels},le="{bound:g}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+
+        declared = set()
+        for (counter, asset, outcome), value in counters:
+            name = f"{METRIC_PREFIX}_{counter}_total"
+            if name not in declared:
+                declared.add(name)
+                lines.append(f"# TYPE {name} counter")
+            lines.append(f'{name}{{asset="{_escape(asset)}",outcome="{_escape(outcome)}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> dict:
+        """
+        Returns a JSON-friendly digest: per asset and phase the count, mean, p50, p95 and max
+        in milliseconds, plus every counter.
+        """
+        result = {}
+        with self._lock:
+            for (asset, phase), histogram in self._histograms.items():
+                result.setdefault(asset, {}).setdefault('phases', {})[phase] = {
+                    'count': histogram.count,
+                    'mean_ms': round(1000 * histogram.total / histogram.count, 3),
+                    'p50_ms': round(1000 * histogram.quantile(0.5), 3),
+                    'p95_ms': round(1000 * histogram.quantile(0.95), 3),
+                    'max_ms': round(1000 * histogram.max, 3),
+                }
+            for (counter, asset, outcome), value in self._counters.items():
+                result.setdefault(asset, {}).setdefault(counter, {})[outcome] = value
+        return result
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Shared no-op instance for components created without metrics
+NULL_METRICS = Metrics(enabled=False)
+
+
+class MetricsServer:
+    """Serves `Metrics.render()` at /metrics over HTTP from a background thread."""
+
+    def __init__(self, metrics: Metrics, host: str = "127.0.0.1", port: int = 9108):
+        """
+        Initializes and starts the server.
+
+        Args:
+            metrics (Metrics): The registry to expose.
+            host (str): The interface to bind; keep the default to stay local.
+            port (int): The TCP port; 0 picks a free one.
+        """
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the application log
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        logging.info(f"Metrics endpoint listening on http://{host}:{self.port}/metrics")
+
+    def close(self):
+        """Stops the server."""
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
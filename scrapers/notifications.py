@@ -1,17 +1,37 @@
 # notifications.py
 import os
+import queue
 import logging
+import threading
+import time
+from typing import Optional, Union
 import requests
+from scrapers.metrics import NULL_METRICS
+
+# Telegram rejects messages longer than 4096 characters
+TELEGRAM_MESSAGE_LIMIT = 4096
+
+# What a notifier's send_alert() reports; a positive number instead asks to retry after that many seconds
+SENT = "sent"
+FAILED = "failed"
+SKIPPED = "skipped"  # The notifier is not configured, so nothing was sent
 
 class TelegramNotifier:
     """
     A class to handle sending alerts to Telegram.
     """
 
-    def __init__(self):
+    def __init__(self, session: Optional[requests.Session] = None, api_url: Optional[str] = None):
         """
         Initializes the notifier, getting token and chat ID from environment variables.
+
+        Args:
+            session (requests.Session, optional): A keep-alive session to reuse connections across alerts.
+            api_url (str, optional): The Bot API base URL; defaults to TELEGRAM_API_URL or the public API.
+                Benchmarks point it at a local fake.
         """
+        self.http = session or requests
+        self.api_url = (api_url or os.getenv("TELEGRAM_API_URL") or "https://api.telegram.org").rstrip('/')
         self.token = os.getenv("TELEGRAM_TOKEN")
         self.chat_id = os.getenv("TELEGRAM_CHAT_ID")
         self.is_configured = self.token is not None and self.chat_id is not None
@@ -19,17 +39,21 @@ class TelegramNotifier:
         if not self.is_configured:
             logging.warning("Telegram token or chat ID not set. Notifications are disabled.")
 
-    def send_alert(self, message: str):
+    def send_alert(self, message: str) -> Union[str, float]:
         """
         Sends an alert message to Telegram if configured.
 
         Args:
             message (str): The message to send.
+
+        Returns:
+            The 'retry_after' seconds if Telegram rate-limited the request, otherwise SENT,
+            FAILED, or SKIPPED when Telegram is not configured.
         """
         if not self.is_configured:
-            return
+            return SKIPPED
 
-        url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+        url = f"{self.api_url}/bot{self.token}/sendMessage"
         payload = {
             "chat_id": self.chat_id,
             "text": message,
@@ -37,9 +61,157 @@ class TelegramNotifier:
         }
 
         try:
-            response = requests.post(url, json=payload, timeout=10)
+            response = self.http.post(url, json=payload, timeout=10)
+            if response.status_code == 429:
+                retry_after = float(response.json().get("parameters", {}).get("retry_after", 1))
+                logging.warning(f"Telegram rate limit hit, retry after {retry_after}s.")
+                return retry_after
             response.raise_for_status()  # Raise an exception for bad status codes
             logging.info("Telegram alert sent successfully.")
-        except requests.exceptions.RequestException as e:
+            return SENT
+        except (requests.exceptions.RequestException, ValueError) as e:
             logging.error(f"Failed to send Telegram alert: {e}")
+            return FAILED
+
+
+class NotificationDispatcher:
+    """
+    Sends alerts from a background worker so scraping never waits on Telegram.
+
+    Alerts go into a bounded queue. The worker coalesces alerts raised within the same
+    window into one message, paces sends with a token bucket and honours 'retry_after'.
+    """
+
+    def __init__(self, notifier, max_queue: int = 1000, coalesce_window: float = 0.0,
+                 rate_per_second: float = 1.0, burst: int = 3, max_retries: int = 3, metrics=None):
+        """
+        Initializes the dispatcher and starts its worker thread.
+
+        Args:
+            notifier: The notifier that actually delivers messages (e.g. TelegramNotifier).
+            max_queue (int): The maximum number of pending alerts; further alerts are dropped.
+            coalesce_window (float): Seconds to wait for more alerts to merge into one message (0 disables).
+            rate_per_second (float): The sustained send rate allowed per chat.
+            burst (int): The number of messages that may be sent back to back.
+            max_retries (int): How many times a rate-limited message is retried.
+            metrics (Metrics, optional): Records send latency and delivery outcomes.
+        """
+        self.notifier = notifier
+        self.coalesce_window = coalesce_window
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.max_retries = max_retries
+        self.dropped = 0
+        self.metrics = metrics or NULL_METRICS
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._stop = threading.Event()
+        self._carry = None
+        self._worker = threading.Thread(target=self._run, name="notifications", daemon=True)
+        self._worker.start()
+
+    def send_alert(self, message: str):
+        """Queues an alert without blocking; drops it if the queue is full."""
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+            self.metrics.increment("notifications", "dropped", asset="")
+            logging.warning(f"Notification queue full, dropping alert ({self.dropped} dropped so far).")
+
+    def _next_batch(self) -> Optional[str]:
+        """Blocks for the next message and merges alerts arriving within the coalesce window."""
+        if self._carry is not None:
+            parts, self._carry = [self._carry], None
+        else:
+            try:
+                parts = [self._queue.get(timeout=0.5)]
+            except queue.Empty:
+                return None
+            if parts[0] is None:
+                return None  # Wake-up sentinel from close()
+
+        deadline = time.monotonic() + (0 if self._stop.is_set() else self.coalesce_window)
+        size = len(parts[0])
+        while self.coalesce_window > 0:
+            try:
+                remaining = deadline - time.monotonic()
+                message = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if message is None:
+                continue
+            if size + 2 + len(message) > TELEGRAM_MESSAGE_LIMIT:
+                self._carry = message  # Starts the next batch instead of overflowing this one
+                break
+            parts.append(message)
+            size += 2 + len(message)
+        return "\n\n".join(parts)
+
+    def _take_token(self):
+        """Waits until the token bucket allows another send."""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate_per_second)
+            self._refilled_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            # A plain sleep: the wait is at most one token long, and ending it early on close() would
+            # only send the flushed alerts faster than the chat's rate limit allows
+            time.sleep((1 - self._tokens) / self.rate_per_second)
+
+    def _deliver(self, message: str) -> str:
+        """
+        Sends one message, retrying while it is rate limited.
+
+        Returns:
+            SENT, FAILED or SKIPPED, as counted in the 'notifications' metric. A notifier that
+            returns nothing is taken to have sent the message.
+        """
+        outcome = self._send(message)
+        self.metrics.increment("notifications", outcome, asset="")
+        return outcome
+
+    def _send(self, message: str) -> str:
+        for _ in range(self.max_retries + 1):
+            self._take_token()
+            try:
+                with self.metrics.timer("notify", asset=""):
+                    result = self.notifier.send_alert(message)
+            except Exception as e:
+                logging.error(f"Notifier failed: {e}")
+                return FAILED
+            if result in (SENT, FAILED, SKIPPED):
+                return result
+            if isinstance(result, bool) or not isinstance(result, (int, float)) or result <= 0:
+                return SENT
+            self.metrics.increment("notifications", "rate_limited", asset="")
+            # Telegram asked us to back off: drain the bucket and wait as instructed, unless closing
+            self._tokens = 0
+            if self._stop.wait(result):
+                logging.error(f"Dropping a rate-limited Telegram alert on shutdown instead of waiting {result}s.")
+                return FAILED
+        logging.error("Giving up on a Telegram alert after repeated rate limiting.")
+        return FAILED
+
+    def _run(self):
+        while not (self._stop.is_set() and self._queue.empty() and self._carry is None):
+            message = self._next_batch()
+            if message is not None:
+                self._deliver(message)
+
+    def close(self, timeout: float = 10.0):
+        """
+        Stops accepting work, flushes pending alerts and waits for the worker to finish.
+        A message waiting out Telegram's 'retry_after' is dropped instead of delaying shutdown.
+        """
+        self._stop.set()
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # The worker is busy anyway and will notice the stop flag
+        self._worker.join(timeout)
 
@@ -0,0 +1,325 @@
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Optional
+from scrapers.metrics import NULL_METRICS
+from scrapers.scraper import Scraper
+
+class _Race:
+    """The sessions the attempts of one scrape_first() call hold, so the losers can be aborted once one wins."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._settled = False
+        self._running = set()
+
+    def start(self, scraper) -> bool:
+        """Registers an attempt about to scrape; False if the race is already won and it should not start."""
+        with self._lock:
+            if self._settled:
+                return False
+            self._running.add(scraper)
+            return True
+
+    def finish(self, scraper):
+        with self._lock:
+            self._running.discard(scraper)
+
+    def settle(self):
+        """Ends the race and aborts the attempts still scraping."""
+        with self._lock:
+            self._settled = True
+            # Under the lock, so a scraper is only aborted while the losing attempt still holds it
+            for scraper in self._running:
+                abort = getattr(scraper, 'abort', None)
+                if abort:
+                    abort()
+            self._running.clear()
+
+
+class ScraperPool:
+    """
+    A pool of Scraper sessions that spreads scraping work across several
+    WebDriver sessions running in parallel against the same Selenium hub,
+    or across several hubs when the sessions share a HubBalancer.
+    """
+
+    def __init__(self, selenium_hub_url: str, size: int = 1, scraper_factory=Scraper, router=None, metrics=None, hedge_after=None,
+                 failures=None, hubs=None, affinity=False):
+        """
+        Initializes the pool and opens all of its sessions.
+
+        Args:
+            selenium_hub_url (str): The URL of the Selenium Grid hub (or "local").
+            size (int): The number of WebDriver sessions to keep open.
+            scraper_factory (callable): Builds a scraper for a given hub URL.
+            router (FetchRouter, optional): Enables the HTTP fast path with Selenium as fallback.
+            metrics (Metrics, optional): Records the time spent fetching over HTTP and waiting for a free session.
+            hedge_after (float, optional): Seconds after which scrape_first() starts the next source while the
+                previous one is still running; None only moves on when a source fails.
+            failures (FailureCapture, optional): The failure capture shared by the sessions; closed with the pool.
+            hubs (HubBalancer, optional): The balancer shared by the sessions when there are several hubs; closed with the pool.
+            affinity (bool): Pin every URL to one session, spreading URLs evenly, so live tabs are opened
+                once per URL instead of once per URL in every session.
+        """
+        self.selenium_hub_url = selenium_hub_url
+        self.router = router
+        self.metrics = metrics or NULL_METRICS
+        self.hedge_after = hedge_after
+        self.failures = failures
+        self.hubs = hubs
+        self.size = max(1, int(size))
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="scraper")
+        # Separate from _executor, so hedged attempts never wait behind (or deadlock) scrape_many()
+        self._hedge_executor = ThreadPoolExecutor(max_workers=2 * self.size, thread_name_prefix="hedge")
+
+        # Sessions are opened in parallel, so startup costs one Chrome start instead of N
+        self._scrapers = list(self._executor.map(lambda _: scraper_factory(selenium_hub_url), range(self.size)))
+        self._idle = list(self._scrapers)
+        self._available = threading.Condition()
+        self._affinity = {} if affinity else None  # url -> the scraper it is pinned to
+
+        logging.info(f"Scraper pool ready with {self.size} session(s).")
+
+    def _owner(self, url: Optional[str]):
+        """The session a URL is pinned to, pinning it to the session with the fewest URLs on first use."""
+        if self._affinity is None or url is None:
+            return None
+        owner = self._affinity.get(url)
+        if owner is None:
+            pinned = Counter(self._affinity.values())
+            owner = self._affinity[url] = min(self._scrapers, key=lambda scraper: pinned[scraper])
+        return owner
+
+    def _take(self, url: Optional[str], block: bool = True):
+        """Takes the URL's session (any session without affinity) off the idle list; None if not blocking and it is busy."""
+        with self._available:
+            while True:
+                owner = self._owner(url)
+                if owner is None and self._idle:
+                    return self._idle.pop()
+                if owner is not None and owner in self._idle:
+                    self._idle.remove(owner)
+                    return owner
+                if not block:
+                    return None
+                self._available.wait()
+
+    def _give_back(self, scraper):
+        with self._available:
+            self._idle.append(scraper)
+            self._available.notify_all()
+
+    @contextmanager
+    def acquire(self, url: Optional[str] = None, reserved=None):
+        """
+        Borrows an idle scraper from the pool (the URL's pinned one, with affinity), blocking until it is free.
+        A `reserved` scraper, already taken off the idle list, is used as is and given back the same way.
+        """
+        if reserved is None:
+            # A long session wait means the pool (or the Grid behind it) is too small
+            with self.metrics.timer("session_wait"):
+                reserved = self._take(url)
+        try:
+            yield reserved
+        finally:
+            self._give_back(reserved)
+
+    def scrape(self, url: str, locator_info: dict) -> str:
+        """
+        Scrapes a single URL, trying the HTTP fast path first when a router is set
+        and falling back to the first free WebDriver session.
+
+        Args:
+            url (str): The URL of the page to scrape.
+            locator_info (dict): A dictionary containing 'by' and 'value' for the element locator.
+
+        Returns:
+            The text content of the found element, or "Error" if not found or on error.
+        """
+        return self._route(url, locator_info, None)
+
+    def scrape_fields(self, url: str, locator_info: dict, fields: dict) -> dict:
+        """
+        Scrapes the price and several named fields of a URL with one page load, routed like scrape().
+
+        Returns:
+            A dict with 'price' and each field's text; values are None where not found or on error.
+        """
+        return self._route(url, locator_info, fields)
+
+    def _route(self, url: str, locator_info: dict, fields: Optional[dict], reserved=None, race: Optional[_Race] = None):
+        if self.router and self.router.prefers_http(url):
+            with self.metrics.timer("http_fetch"):
+                result = self.router.fetch(url, locator_info, fields)
+            if result is not None:
+                if reserved is not None:
+                    self._give_back(reserved)
+                return result
+
+        with self.acquire(url, reserved) as scraper:
+            if race and not race.start(scraper):
+                # Another source already won while this one waited for a session
+                return {**dict.fromkeys(fields), 'price': None} if fields else "Error"
+            try:
+                if fields:
+                    result = scraper.scrape_fields(url, locator_info, fields)
+                else:
+                    result = scraper.scrape(url, locator_info)
+            finally:
+                if race:
+                    race.finish(scraper)
+
+        if self.router:
+            price = result.get('price') if fields else result
+            self.router.record_selenium(url, price not in (None, "Error"))
+        return result
+
+    def scrape_first(self, sources: list, parse):
+        """
+        Scrapes alternative sources of the same quote and returns the first value that parses.
+
+        The first source starts at once. The next one starts when the previous fails, or when
+        it has not answered within `hedge_after` seconds and another session is idle; a hedge
+        never waits for a session, as that would only queue it behind the slow source. Once a
+        value is found, sources that have not started are cancelled and ones still loading are
+        aborted, so their sessions return to the pool.
+
+        Args:
+            sources (list): (url, locator_info) or (url, locator_info, fields) tuples, most preferred first.
+                Sources with fields are read with scrape_fields() and parsed as records.
+            parse (callable): Takes (index, result) and returns the parsed value, or None if the result is unusable.
+
+        Returns:
+            A (value, source_index) tuple, or (None, None) if every source failed.
+        """
+        asset = self.metrics.asset
+        race = _Race()
+
+        def attempt(index, reserved):
+            url, locator_info, *fields = sources[index]
+            with self.metrics.bind(asset):
+                return parse(index, self._route(url, locator_info, fields[0] if fields else None, reserved, race))
+
+        pending = {}
+        reservations = {}  # future -> the idle session reserved for its hedge
+        launched = 0
+        hedging = self.hedge_after is not None
+
+        def launch(reserved=None):
+            nonlocal launched
+            try:
+                future = self._hedge_executor.submit(attempt, launched, reserved)
+            except Exception:
+                if reserved is not None:
+                    self._give_back(reserved)
+                raise
+            pending[future] = launched
+            if reserved is not None:
+                reservations[future] = reserved
+            launched += 1
+
+        def reserve_hedge():
+            """An idle session for the next source, False if there is none; None if the source needs no session."""
+            url = sources[launched][0]
+            if self.router and self.router.prefers_http(url):
+                return None
+            return self._take(url, block=False) or False
+
+        launch()
+        try:
+            while pending:
+                hedge_timeout = self.hedge_after if hedging and launched < len(sources) else None
+                done, _ = wait(pending, timeout=hedge_timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    reserved = reserve_hedge()
+                    if reserved is False:
+                        # Every session is busy, so a hedge would only queue; wait for the sources running
+                        self.metrics.increment("hedges", "skipped")
+                        hedging = False
+                        continue
+                    self.metrics.increment("hedges", "launched")
+                    launch(reserved)
+                    continue
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        logging.error(f"Scraping {sources[index][0]} failed: {e}")
+                        value = None
+                    if value is not None:
+                        if index:
+                            self.metrics.increment("hedges", "won")
+                        return value, index
+                    if launched < len(sources):
+                        launch()  # Fail over at once instead of waiting for the hedge budget
+            return None, None
+        finally:
+            for future in pending:
+                # A hedge cancelled before it ran never gives its reserved session back itself
+                if future.cancel() and future in reservations:
+                    self._give_back(reservations[future])
+            race.settle()
+
+    def scrape_many(self, jobs: list) -> list:
+        """
+        Scrapes many URLs in parallel across all sessions of the pool.
+
+        Args:
+            jobs (list): A list of (url, locator_info) tuples.
+
+        Returns:
+            A list of scraped strings in the same order as the jobs.
+        """
+        return list(self._executor.map(lambda job: self.scrape(*job), jobs))
+
+    def warm_up(self, urls: list) -> int:
+        """
+        Loads the given pages once across all sessions in parallel, so every session has navigated
+        at least once and every page has been loaded by some session before the first cycle.
+
+        Returns:
+            The number of successful navigations.
+        """
+        if not urls:
+            return 0
+        # Spread the pages over the sessions; with fewer pages than sessions, pages are reused
+        plan = [(scraper, urls[index % len(urls)::self.size]) for index, scraper in enumerate(self._scrapers)]
+
+        def run(step):
+            scraper, pages = step
+            warm_up = getattr(scraper, 'warm_up', None)
+            return sum(1 for url in pages if warm_up and warm_up(url))
+
+        return sum(self._executor.map(run, plan))
+
+    def last_changed(self, url: str):
+        """When the URL's price last changed, as seen by the live tab of its pinned session; None without affinity."""
+        with self._available:
+            owner = self._affinity.get(url) if self._affinity else None
+        return owner.last_changed(url) if owner is not None else None
+
+    def lean_stats(self) -> dict:
+        """Returns the lean-mode request and byte savings summed across all sessions."""
+        totals = {}
+        for scraper in self._scrapers:
+            for key, value in getattr(scraper, 'lean_stats', {}).items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+    def close(self):
+        """Shuts down the worker threads and closes every WebDriver session."""
+        self._executor.shutdown(wait=True)
+        self._hedge_executor.shutdown(wait=True)
+        if self.router:
+            self.router.close()
+        for scraper in self._scrapers:
+            scraper.close()
+        self._scrapers = []
+        if self.failures:
+            self.failures.close()
+        if self.hubs:
+            self.hubs.close()
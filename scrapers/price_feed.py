@@ -0,0 +1,198 @@
+import json
+import logging
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+# Put on a subscriber's queue to end its stream
+_END = None
+
+
+class Subscriber:
+    """One connected client: its asset filter and a bounded buffer of ticks not yet sent."""
+
+    def __init__(self, assets: Optional[frozenset], buffer_size: int):
+        self.assets = assets
+        self.queue = queue.Queue(maxsize=buffer_size)
+        self.dropped = False
+
+    def wants(self, asset: str) -> bool:
+        return self.assets is None or asset in self.assets
+
+
+class PriceFeed:
+    """
+    Fans every parsed tick out to streaming subscribers and keeps the latest tick per asset.
+
+    Publishing never blocks: each subscriber has a bounded buffer, and a subscriber whose buffer
+    is full is disconnected instead of slowing the scrape loop down. It can reconnect and gets
+    the latest prices again as a snapshot.
+    """
+
+    def __init__(self, buffer_size: int = 256, clock=time.time):
+        """
+        Initializes the feed.
+
+        Args:
+            buffer_size (int): Ticks buffered per subscriber before it is dropped as too slow.
+            clock (callable): Returns the current unix time in seconds.
+        """
+        self.buffer_size = buffer_size
+        self.clock = clock
+        self.dropped = 0
+        self._latest = {}
+        self._subscribers = set()
+        self._lock = threading.Lock()
+
+    def publish(self, asset: str, price: float, fields: Optional[dict] = None, source: Optional[str] = None):
+        """Records a tick as the asset's latest and queues it for every subscriber that wants it."""
+        tick = {"asset": asset, "price": price, "ts": round(self.clock(), 3)}
+        if fields:
+            tick["fields"] = fields
+        if source:
+            tick["source"] = source
+        with self._lock:
+            self._latest[asset] = tick
+            subscribers = [subscriber for subscriber in self._subscribers if subscriber.wants(asset)]
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(tick)
+            except queue.Full:
+                self._drop(subscriber)
+
+    def _drop(self, subscriber: Subscriber):
+        with self._lock:
+            if subscriber not in self._subscribers:
+                return
+            self._subscribers.discard(subscriber)
+            self.dropped += 1
+        subscriber.dropped = True
+        # Make room for the end marker, so the stream closes instead of serving stale ticks
+        while True:
+            try:
+                subscriber.queue.get_nowait()
+            except queue.Empty:
+                break
+        try:
+            subscriber.queue.put_nowait(_END)
+        except queue.Full:
+            pass  # A concurrent publish refilled the buffer; the stream sees `dropped` instead
+        logging.warning("Dropped a price feed subscriber that fell behind.")
+
+    def snapshot(self, assets: Optional[frozenset] = None) -> list:
+        """Returns the latest tick of every asset (or of the given ones), sorted by asset."""
+        with self._lock:
+            return [tick for name, tick in sorted(self._latest.items()) if assets is None or name in assets]
+
+    def subscribe(self, assets: Optional[frozenset] = None) -> Subscriber:
+        """Registers a subscriber; its buffer starts with the snapshot of the assets it wants."""
+        subscriber = Subscriber(assets, self.buffer_size)
+        with self._lock:
+            for tick in [tick for name, tick in sorted(self._latest.items()) if subscriber.wants(name)]:
+                if not subscriber.queue.full():
+                    subscriber.queue.put_nowait(tick)
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def close(self):
+        """Ends every open stream."""
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, set()
+        for subscriber in subscribers:
+            try:
+                subscriber.queue.put_nowait(_END)
+            except queue.Full:
+                subscriber.dropped = True
+
+
+class PriceFeedServer:
+    """
+    Streams a PriceFeed over HTTP from a background thread:
+
+        GET /prices?assets=BTC/USDT,ETH/USDT   newline-delimited JSON, one tick per line
+        GET /events?assets=...                 the same ticks as Server-Sent Events
+        GET /snapshot?assets=...               the latest ticks as one JSON array
+
+    Streams start with the latest price of every requested asset. Without `assets`, every asset is sent.
+    """
+
+    def __init__(self, feed: PriceFeed, host: str = "127.0.0.1", port: int = 9109, keepalive: float = 15.0):
+        """
+        Initializes and starts the server.
+
+        Args:
+            feed (PriceFeed): The feed to serve.
+            host (str): The interface to bind; keep the default to stay local.
+            port (int): The TCP port; 0 picks a free one.
+            keepalive (float): Seconds of silence after which a stream sends a keep-alive line.
+        """
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                requested = parse_qs(parts.query).get('assets')
+                assets = frozenset(name for value in requested for name in value.split(',') if name) if requested else None
+                if parts.path == '/snapshot':
+                    self._send_snapshot(assets)
+                elif parts.path in ('/prices', '/events'):
+                    self._stream(assets, sse=parts.path == '/events')
+                else:
+                    self.send_error(404)
+
+            def _send_snapshot(self, assets):
+                body = json.dumps(feed.snapshot(assets), ensure_ascii=False).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _stream(self, assets, sse: bool):
+                subscriber = feed.subscribe(assets)
+                try:
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/event-stream' if sse else 'application/x-ndjson')
+                    self.send_header('Cache-Control', 'no-cache')
+                    self.end_headers()
+                    while True:
+                        try:
+                            tick = subscriber.queue.get(timeout=keepalive)
+                        except queue.Empty:
+                            if subscriber.dropped:
+                                break
+                            self.wfile.write(b": keepalive\n\n" if sse else b"\n")
+                            self.wfile.flush()
+                            continue
+                        if tick is _END or subscriber.dropped:
+                            break
+                        line = json.dumps(tick, ensure_ascii=False)
+                        self.wfile.write((f"data: {line}\n\n" if sse else f"{line}\n").encode('utf-8'))
+                        self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client went away
+                finally:
+                    feed.unsubscribe(subscriber)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.feed = feed
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="price-feed-http", daemon=True)
+        self._thread.start()
+        logging.info(f"Price feed listening on http://{host}:{self.port}/prices")
+
+    def close(self):
+        """Ends every stream and stops the server."""
+        self.feed.close()
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
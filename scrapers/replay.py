@@ -0,0 +1,239 @@
+"""
+Replays recorded prices through the price parser and the alert rules with a virtual clock, to see
+which alerts a config would have sent and when, without waiting for the live loop.
+
+Supported inputs, each read as a stream in timestamp order and merged across inputs (records that
+cannot be read are skipped and counted per input):
+    *.csv      rows of timestamp,asset,price (a header row is skipped)
+    *.ndjson   lines like {"ts": 1760000000, "asset": "BTC/USDT", "price": 60000.5}, e.g. from the price feed
+               or the JSON log file ("ts" may also be an ISO 8601 string)
+    a directory of PriceHistory '.bin' files
+    a directory of HTML snapshots: one sub-directory per (percent-encoded) asset name holding
+               '<unix timestamp>.html' pages, parsed with the asset's locator like the HTTP fast path
+"""
+import csv
+import datetime
+import heapq
+import json
+import os
+import time
+from collections import Counter
+from typing import Iterator, Optional
+from urllib.parse import unquote
+from scrapers.history import RECORD
+from scrapers.http_fetcher import extract_text
+
+# Records read per system call from history files
+HISTORY_CHUNK_RECORDS = 65536
+
+
+class VirtualClock:
+    """A clock that shows the timestamp of the tick being replayed."""
+
+    __slots__ = ("now",)
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _timestamp(value) -> float:
+    """Reads unix seconds, given as a number or as an ISO 8601 string."""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def read_csv(path: str, skipped: Optional[Counter] = None) -> Iterator[tuple]:
+    """Yields (timestamp, asset, raw_price) from a CSV file of timestamp,asset,price rows."""
+    skipped = Counter() if skipped is None else skipped
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.reader(f):
+            if not row or not any(row) or row[0].lower() in ('timestamp', 'ts'):
+                continue
+            try:
+                if len(row) < 3 or not row[1]:
+                    raise ValueError("missing column")
+                tick = _timestamp(row[0]), row[1], row[2]
+            except ValueError:
+                skipped[path] += 1
+                continue
+            yield tick
+
+
+def read_ndjson(path: str, skipped: Optional[Counter] = None) -> Iterator[tuple]:
+    """
+    Yields (timestamp, asset, raw_price) from newline-delimited JSON. Lines without a price (e.g. other
+    log records) are passed over; malformed lines are skipped and counted.
+    """
+    skipped = Counter() if skipped is None else skipped
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                if entry.get('asset') is None or entry.get('price') is None:
+                    continue
+                tick = _timestamp(entry.get('ts', entry.get('timestamp'))), entry['asset'], entry['price']
+            except (ValueError, TypeError, AttributeError):
+                skipped[path] += 1
+                continue
+            yield tick
+
+
+def _read_history_file(path: str, asset: str) -> Iterator[tuple]:
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(RECORD.size * HISTORY_CHUNK_RECORDS)
+            chunk = chunk[:len(chunk) // RECORD.size * RECORD.size]
+            if not chunk:
+                return
+            for timestamp, price in RECORD.iter_unpack(chunk):
+                yield timestamp, asset, price
+
+
+def read_history(directory: str) -> Iterator[tuple]:
+    """Yields (timestamp, asset, price) from every PriceHistory file in a directory, merged by time."""
+    streams = [
+        _read_history_file(os.path.join(directory, name), unquote(name[:-len('.bin')]))
+        for name in sorted(os.listdir(directory)) if name.endswith('.bin')
+    ]
+    return heapq.merge(*streams, key=lambda tick: tick[0])
+
+
+def read_snapshots(directory: str, locate, skipped: Optional[Counter] = None) -> Iterator[tuple]:
+    """
+    Yields (timestamp, asset, raw_price) by parsing saved pages with their asset's locator.
+
+    Args:
+        directory (str): Holds one sub-directory of '<timestamp>.html' files per asset.
+        locate (callable): Takes an asset name and returns its locator dict.
+        skipped (Counter, optional): Counts pages whose name is not a timestamp, per directory.
+    """
+    skipped = Counter() if skipped is None else skipped
+
+    def pages(asset_dir, asset):
+        timed = []
+        for name in os.listdir(asset_dir):
+            if not name.endswith('.html'):
+                continue
+            try:
+                timed.append((_timestamp(name[:-len('.html')]), name))
+            except ValueError:
+                skipped[directory] += 1
+        for timestamp, name in sorted(timed):
+            with open(os.path.join(asset_dir, name), encoding='utf-8', errors='replace') as f:
+                yield timestamp, asset, extract_text(f.read(), locate(asset))
+
+    streams = []
+    for entry in sorted(os.listdir(directory)):
+        asset_dir = os.path.join(directory, entry)
+        if os.path.isdir(asset_dir):
+            streams.append(pages(asset_dir, unquote(entry)))
+    return heapq.merge(*streams, key=lambda tick: tick[0])
+
+
+def open_ticks(paths: list, locate=None, skipped: Optional[Counter] = None) -> Iterator[tuple]:
+    """
+    Opens every input as a stream and merges them by timestamp.
+
+    Args:
+        paths (list): Files and directories as described in the module docstring.
+        locate (callable, optional): Locator lookup for HTML snapshot directories.
+        skipped (Counter, optional): Filled with the number of unreadable records per input as the streams are read.
+
+    Raises:
+        ValueError: If an input's type cannot be told from its name or contents.
+    """
+    streams = []
+    for path in paths:
+        if os.path.isdir(path):
+            if any(name.endswith('.bin') for name in os.listdir(path)):
+                streams.append(read_history(path))
+            elif locate is not None:
+                streams.append(read_snapshots(path, locate, skipped))
+            else:
+                raise ValueError(f"{path} holds no history files")
+        elif path.endswith('.csv'):
+            streams.append(read_csv(path, skipped))
+        elif path.endswith(('.ndjson', '.jsonl', '.json')):
+            streams.append(read_ndjson(path, skipped))
+        else:
+            raise ValueError(f"Unknown replay input {path}")
+    return heapq.merge(*streams, key=lambda tick: tick[0])
+
+
+class ReplayReport:
+    """What a replay saw: tick and parse-failure counts per asset, skipped records per input, the alerts and the run time."""
+
+    def __init__(self):
+        self.ticks = 0
+        self.parse_errors = {}
+        self.skipped = {}  # input path -> records that could not be read
+        self.per_asset = {}
+        self.alerts = []  # (timestamp, asset, message)
+        self.suppressed = 0  # Crossings silenced by a cooldown
+        self.first = None
+        self.last = None
+        self.elapsed = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "ticks": self.ticks,
+            "ticks_per_second": round(self.ticks / self.elapsed) if self.elapsed else None,
+            "from": self.first,
+            "to": self.last,
+            "per_asset": self.per_asset,
+            "parse_errors": self.parse_errors,
+            "skipped_records": self.skipped,
+            "suppressed_by_cooldown": self.suppressed,
+            "alerts": [{"ts": ts, "asset": asset, "message": message} for ts, asset, message in self.alerts],
+        }
+
+
+def replay(ticks, engine, clock: VirtualClock, parse, separators: Optional[dict] = None,
+           skipped: Optional[Counter] = None) -> ReplayReport:
+    """
+    Feeds ticks through the alert engine, one at a time, with the clock set to each tick's time.
+    Alerts are recorded in the report instead of being sent.
+
+    Args:
+        ticks (iterable): (timestamp, asset, raw_price) tuples in time order; raw prices may be text or numbers.
+        engine (AlertEngine): Built with `clock`, so cooldowns and indicator windows run on replayed time.
+        clock (VirtualClock): The engine's clock.
+        parse (callable): Takes (text, decimal_separator) and returns a float or None, i.e. clean_price.
+        separators (dict, optional): Maps asset names to their decimal separator hint.
+        skipped (Counter, optional): The counter passed to open_ticks(); copied into the report once the ticks are read.
+
+    Returns:
+        A ReplayReport.
+    """
+    report = ReplayReport()
+    separators = separators or {}
+    per_asset = report.per_asset
+    suppressed_before = engine.suppressed
+    started = time.perf_counter()
+    for timestamp, asset, raw in ticks:
+        if isinstance(raw, (int, float)) and not isinstance(raw, bool):
+            price = float(raw)
+        else:
+            price = parse(raw, separators.get(asset)) if isinstance(raw, str) else None
+        report.ticks += 1
+        per_asset[asset] = per_asset.get(asset, 0) + 1
+        if price is None:
+            report.parse_errors[asset] = report.parse_errors.get(asset, 0) + 1
+            continue
+        clock.now = timestamp
+        for message in engine.evaluate(asset, price):
+            report.alerts.append((timestamp, asset, message))
+        if report.first is None:
+            report.first = timestamp
+        report.last = timestamp
+    report.elapsed = time.perf_counter() - started
+    report.skipped = dict(skipped or {})
+    report.suppressed = engine.suppressed - suppressed_before
+    return report
@@ -0,0 +1,161 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ScheduledJob:
+    """A recurring job with its own interval and drift-free deadline."""
+
+    __slots__ = ("key", "interval", "func", "deadline", "due", "runs", "skipped")
+
+    def __init__(self, key: str, interval: float, func):
+        self.key = key
+        self.interval = interval
+        self.func = func
+        self.deadline = 0.0  # Nominal slot on the job's own grid, without jitter
+        self.due = 0.0  # The moment the job actually starts, jitter included
+        self.runs = 0
+        self.skipped = 0
+
+
+class AssetScheduler:
+    """
+    A deadline-driven asyncio scheduler running blocking jobs in a thread pool.
+
+    Every job keeps its own interval. Deadlines follow a fixed grid, so the real period
+    does not grow with job duration, and runs missed while a job was still busy (or
+    waiting for a free slot) are skipped instead of piling up.
+    """
+
+    def __init__(self, max_concurrency: int = 1, jitter: float = 0.0, clock=time.monotonic):
+        """
+        Initializes the scheduler.
+
+        Args:
+            max_concurrency (int): The maximum number of jobs running at the same time.
+            jitter (float): The maximum random delay in seconds added to each run.
+            clock (callable): A monotonic clock returning seconds.
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.jitter = max(0.0, float(jitter))
+        self.clock = clock
+        self.jobs = {}
+        self._heap = []
+        self._counter = itertools.count()  # Tie-breaker, so jobs are never compared directly
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="job")
+        self._wakeup = None
+        self._semaphore = None
+        self._loop = None
+        self._lock = threading.Lock()  # add() and remove() may be called from other threads, e.g. on config reload
+
+    def add(self, key: str, interval: float, func):
+        """
+        Adds a recurring job whose first run is due immediately.
+
+        Args:
+            key (str): A unique job name, e.g. the asset name.
+            interval (float): Seconds between runs.
+            func (callable): A blocking callable without arguments.
+        """
+        job = ScheduledJob(key, float(interval), func)
+        job.deadline = self.clock()
+        with self._lock:
+            self.jobs[key] = job
+            self._push(job)
+        self._wake()
+
+    def remove(self, key: str):
+        """Removes a job; a run that is already in flight finishes but is not rescheduled."""
+        with self._lock:
+            self.jobs.pop(key, None)
+        self._wake()
+
+    def _wake(self):
+        """Wakes the run loop so it re-reads the heap, from whichever thread the change came."""
+        if self._loop is None or self._wakeup is None:
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is self._loop:
+            self._wakeup.set()
+        elif not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _push(self, job: ScheduledJob):
+        job.due = job.deadline + (random.uniform(0, self.jitter) if self.jitter else 0.0)
+        heapq.heappush(self._heap, (job.due, next(self._counter), job))
+
+    def _reschedule(self, job: ScheduledJob):
+        """Moves the job to its next future slot, skipping any slots that have already passed."""
+        job.deadline += job.interval
+        now = self.clock()
+        if job.deadline < now:
+            missed = int((now - job.deadline) // job.interval) + 1
+            job.deadline += missed * job.interval
+            job.skipped += missed
+            logging.warning(f"Job {job.key} is overdue, skipping {missed} run(s).")
+        with self._lock:
+            if self.jobs.get(job.key) is job:
+                self._push(job)
+        self._wake()
+
+    async def _execute(self, job: ScheduledJob):
+        loop = asyncio.get_running_loop()
+        try:
+            async with self._semaphore:
+                await loop.run_in_executor(self._executor, job.func)
+            job.runs += 1
+        except Exception as e:
+            logging.error(f"Job {job.key} failed: {e}")
+        finally:
+            self._reschedule(job)
+
+    async def run(self):
+        """Runs the jobs until cancelled."""
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._loop = asyncio.get_running_loop()
+        running = set()
+
+        while True:
+            with self._lock:
+                # Drop entries of removed or re-added jobs
+                while self._heap and self.jobs.get(self._heap[0][2].key) is not self._heap[0][2]:
+                    heapq.heappop(self._heap)
+                head = self._heap[0] if self._heap else None
+                # Clearing under the lock means a change made after this point still wakes us
+                self._wakeup.clear()
+
+            if head is None:
+                await self._wakeup.wait()
+                continue
+
+            due, _, job = head
+            delay = due - self.clock()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            with self._lock:
+                if not self._heap or self._heap[0] is not head:
+                    continue  # Another thread changed the schedule meanwhile; re-read it
+                heapq.heappop(self._heap)
+            task = asyncio.create_task(self._execute(job))
+            running.add(task)
+            task.add_done_callback(running.discard)
+            # KeyboardInterrupt/SystemExit already stop the loop; mark them retrieved so asyncio does not log them again
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+
+    def close(self):
+        """Stops the worker threads, waiting for runs that are in flight."""
+        self._executor.shutdown(wait=True)
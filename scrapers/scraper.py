@@ -1,25 +1,116 @@
 # scrapers/scraper.py
+import json
 import logging
+import threading
+import time
+import weakref
 from selenium import webdriver
+from selenium.webdriver.remote.command import Command
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
+from scrapers.driver_cache import DriverCache
+from scrapers.driver_manager import DriverManager
+from scrapers.metrics import NULL_METRICS
+from scrapers.waits import FetchAborted, PageErrorDetected
+
+# URL patterns used to block whole resource types through the DevTools protocol
+RESOURCE_TYPE_PATTERNS = {
+    "Image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico"],
+    "Font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "Media": ["*.mp4", "*.webm", "*.mp3", "*.ogg", "*.m3u8"],
+    "Stylesheet": ["*.css"],
+}
+
+# Rough median transfer sizes per resource type, used to estimate the bytes a blocked request would have cost
+ESTIMATED_RESOURCE_BYTES = {
+    "Image": 30000,
+    "Font": 25000,
+    "Media": 200000,
+    "Stylesheet": 10000,
+    "Script": 20000,
+}
+DEFAULT_RESOURCE_BYTES = 5000
+
+# Reads the text of several located elements in one round trip; arguments[0] is a list of [name, by, value]
+EXTRACT_FIELDS_SCRIPT = """
+const record = {};
+for (const [name, by, value] of arguments[0]) {
+    let el = null;
+    try {
+        if (by === 'ID') { el = document.getElementById(value); }
+        else if (by === 'CLASS_NAME') { el = document.getElementsByClassName(value)[0] || null; }
+        else if (by === 'NAME') { el = document.getElementsByName(value)[0] || null; }
+        else if (by === 'TAG_NAME') { el = document.getElementsByTagName(value)[0] || null; }
+        else if (by === 'XPATH') {
+            el = document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        else { el = document.querySelector(value); }
+    } catch (e) { el = null; }
+    const text = el ? (el.innerText || el.textContent || '').trim() : '';
+    record[name] = text || null;
+}
+return record;
+"""
+
+# The locator strategies EXTRACT_FIELDS_SCRIPT understands
+FIELD_STRATEGIES = frozenset({"ID", "CLASS_NAME", "NAME", "TAG_NAME", "XPATH", "CSS_SELECTOR"})
+
+
+def field_arguments(locator_info: dict, fields: dict) -> list:
+    """Builds the EXTRACT_FIELDS_SCRIPT argument: the price locator first, then every named field."""
+    return [["price", locator_info['by'], locator_info['value']]] + [
+        [name, locator['by'], locator['value']] for name, locator in fields.items()
+    ]
 
 class Scraper:
     """
     A unified scraper for fetching data from websites using Selenium.
     """
 
-    def __init__(self, selenium_hub_url: str):
+    def __init__(self, selenium_hub_url: str, lean_mode: dict = None, lifecycle: dict = None, metrics=None, waits=None,
+                 driver_cache=None, failures=None, hubs=None):
         """
         Initializes the Scraper.
 
         Args:
             selenium_hub_url (str): The URL of the Selenium Grid hub.
+            lean_mode (dict, optional): Lean page-load settings. When 'enabled' is true, the page-load
+                strategy is relaxed, images are disabled and configured URL patterns and resource types are blocked.
+            lifecycle (dict, optional): Session lifecycle settings (recycling, warm standby, reconnect backoff).
+            metrics (Metrics, optional): Records the navigate, wait and extract phase timings.
+            waits (AdaptiveWait, optional): Adapts element wait timeouts to each site's observed latency;
+                without it every wait uses a fixed 15 s timeout.
+            driver_cache (DriverCache, optional): Resolves the local chromedriver binary without a download
+                on every start; only used when selenium_hub_url is "local".
+            failures (FailureCapture, optional): Saves a screenshot and the page source of sampled failed scrapes.
+            hubs (HubBalancer, optional): Picks the hub of every new session by free capacity, instead of
+                always using selenium_hub_url, and moves sessions off drained or overloaded hubs.
         """
         self.selenium_hub_url = selenium_hub_url
-        self.driver = self._create_driver()
+        self.driver_cache = driver_cache
+        self.failures = failures
+        self.hubs = hubs
+        self._session_hubs = weakref.WeakKeyDictionary()  # WebDriver -> the hub it was opened on
+        self._aborted = threading.Event()
+        self.metrics = metrics or NULL_METRICS
+        self.waits = waits
+        self.lean_mode = lean_mode if lean_mode and lean_mode.get('enabled') else None
+        self.lean_stats = {"requests_blocked": 0, "bytes_avoided_estimate": 0, "bytes_downloaded": 0}
+        lifecycle = lifecycle or {}
+        self.manager = DriverManager(
+            self._create_driver,
+            max_pages=lifecycle.get('max_pages_per_session', 0),
+            max_js_heap_mb=lifecycle.get('max_js_heap_mb', 0),
+            warm_standby=lifecycle.get('warm_standby', False),
+            backoff_initial=lifecycle.get('reconnect_backoff_seconds', 1.0),
+            backoff_max=lifecycle.get('reconnect_backoff_max_seconds', 60.0),
+            health_check_interval=lifecycle.get('health_check_interval_seconds', 60.0),
+        )
+
+    @property
+    def driver(self):
+        """The active WebDriver session, or None if none is available."""
+        return self.manager.driver
 
     def _create_driver(self):
         """
@@ -32,22 +123,32 @@ class Scraper:
             options.add_argument("--headless")
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
+            if self.lean_mode:
+                self._apply_lean_options(options)
 
             if self.selenium_hub_url == "local":
                 # Use a local webdriver for E2E tests or local runs
                 from selenium.webdriver.chrome.service import Service as ChromeService
-                from webdriver_manager.chrome import ChromeDriverManager
-                
+
                 logging.info("Using local Chrome driver.")
-                service = ChromeService(ChromeDriverManager().install())
+                path = (self.driver_cache or DriverCache()).resolve()
+                service = ChromeService(path) if path else ChromeService()
                 driver = webdriver.Chrome(service=service, options=options)
             else:
                 # Use a remote webdriver for production (Docker) setup
-                logging.info(f"Connecting to remote WebDriver at {self.selenium_hub_url}")
+                hub_url = self.hubs.choose() if self.hubs else self.selenium_hub_url
+                if hub_url is None:
+                    logging.error("No healthy Selenium hub is available.")
+                    return None
+                logging.info(f"Connecting to remote WebDriver at {hub_url}")
                 driver = webdriver.Remote(
-                    command_executor=self.selenium_hub_url,
+                    command_executor=hub_url,
                     options=options
                 )
+                if self.hubs:
+                    self._session_hubs[driver] = hub_url
+            if self.lean_mode:
+                self._block_resources(driver)
             return driver
         except WebDriverException as e:
             logging.error(f"Failed to create WebDriver: {e}")
@@ -57,6 +158,73 @@ class Scraper:
             logging.error(f"An unexpected error occurred during WebDriver creation: {e}")
             return None
 
+    def _apply_lean_options(self, options):
+        """Configures the browser options for lean page loads."""
+        options.page_load_strategy = self.lean_mode.get('page_load_strategy', 'eager')
+        if self.lean_mode.get('disable_images', True):
+            options.add_argument("--blink-settings=imagesEnabled=false")
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        # The performance log is how blocked and downloaded requests are counted
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+    def _blocked_url_patterns(self) -> list:
+        """Returns every URL pattern to block, including those derived from blocked resource types."""
+        patterns = list(self.lean_mode.get('blocked_url_patterns', []))
+        for resource_type in self.lean_mode.get('blocked_resource_types', []):
+            patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+        return patterns
+
+    def _block_resources(self, driver):
+        """Blocks the configured URL patterns through the Chrome DevTools protocol."""
+        patterns = self._blocked_url_patterns()
+        if not patterns:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+            logging.info(f"Lean mode: blocking {len(patterns)} URL pattern(s).")
+        except Exception as e:
+            logging.warning(f"Lean mode: could not block resources through DevTools: {e}")
+
+    def _collect_lean_stats(self):
+        """Drains the performance log and accumulates blocked and downloaded request statistics."""
+        try:
+            entries = self.driver.execute(Command.GET_LOG, {"type": "performance"})["value"]
+        except Exception as e:
+            logging.debug(f"Lean mode: performance log unavailable: {e}")
+            return
+
+        for entry in entries:
+            try:
+                event = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            params = event.get("params", {})
+            if event.get("method") == "Network.loadingFailed" and params.get("blockedReason"):
+                self.lean_stats["requests_blocked"] += 1
+                self.lean_stats["bytes_avoided_estimate"] += ESTIMATED_RESOURCE_BYTES.get(params.get("type"), DEFAULT_RESOURCE_BYTES)
+            elif event.get("method") == "Network.loadingFinished":
+                self.lean_stats["bytes_downloaded"] += int(params.get("encodedDataLength", 0))
+
+    def _wait_for_element(self, url: str, locator_info: dict):
+        """Waits until the located element is visible and returns it."""
+        if self.waits:
+            return self.waits.until_visible(self.driver, url, locator_info, abort=self._aborted)
+        # Imported here: selenium's support package pulls in the whole remote WebDriver and slows startup
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        locator_method = getattr(By, locator_info['by'])
+        visible = EC.visibility_of_element_located((locator_method, locator_info['value']))
+
+        def condition(driver):
+            if self._aborted.is_set():
+                raise FetchAborted()
+            return visible(driver)
+
+        wait = WebDriverWait(self.driver, 15) # Increased wait time for robustness
+        return wait.until(condition)
+
     def scrape(self, url: str, locator_info: dict) -> str:
         """
         Scrapes a single piece of data from the given URL.
@@ -68,29 +236,125 @@ class Scraper:
         Returns:
             The text content of the found element, or "Error" if not found or on error.
         """
-        if not self.driver:
+        return self._load_and_read(url, locator_info, lambda element: element.text.strip(), "Error")
+
+    def scrape_fields(self, url: str, locator_info: dict, fields: dict) -> dict:
+        """
+        Scrapes the price and several named fields after a single navigation. Once the price
+        element is visible, every field is read in one execute_script round trip.
+
+        Args:
+            url (str): The URL of the page to scrape.
+            locator_info (dict): The locator of the price element, which is waited for.
+            fields (dict): Maps field names (e.g. 'change_pct', 'volume') to locator dicts.
+
+        Returns:
+            A dict with 'price' and each field's text; values are None where not found or on error.
+        """
+        failure = dict.fromkeys(fields)
+        failure['price'] = None
+        arguments = field_arguments(locator_info, fields)
+        return self._load_and_read(url, locator_info, lambda _: self.driver.execute_script(EXTRACT_FIELDS_SCRIPT, arguments), failure)
+
+    @property
+    def hub(self):
+        """The hub the active session runs on, when sessions are balanced across hubs."""
+        driver = self.driver
+        return self._session_hubs.get(driver) if driver is not None else None
+
+    def _rebalance(self):
+        """Moves the session to another hub if its hub is being drained or is much busier than the others."""
+        hub = self.hub if self.hubs else None
+        if hub and self.hubs.should_move(hub):
+            self.manager.recycle(f"moving the session off {hub}")
+
+    def _load_and_read(self, url: str, locator_info: dict, read, failure):
+        """Navigates to the URL, waits for the located element and returns read(element), or `failure` on error."""
+        self._rebalance()
+        self._aborted.clear()
+        if not self.manager.acquire():
             logging.error("WebDriver not available. Scraping aborted.")
-            return "Error"
+            return failure
             
+        timings = {}
+        started = time.perf_counter()
         try:
-            self.driver.get(url)
-            locator_method = getattr(By, locator_info['by'])
-            wait = WebDriverWait(self.driver, 15) # Increased wait time for robustness
-            
+            with self.metrics.timer("navigate"):
+                self.driver.get(url)
+            timings['navigate'] = time.perf_counter() - started
             # Wait for the element to be visible
-            price_element = wait.until(
-                EC.visibility_of_element_located((locator_method, locator_info['value']))
-            )
-            return price_element.text.strip()
+            with self.metrics.timer("wait"):
+                price_element = self._wait_for_element(url, locator_info)
+            with self.metrics.timer("extract"):
+                return read(price_element)
         except TimeoutException:
             logging.error(f"Timeout while waiting for element at {url}")
-            return "Error"
+            self._capture_failure(url, locator_info, "timeout", timings, started)
+            return failure
+        except FetchAborted:
+            logging.debug(f"Scraping {url} was aborted, its result is no longer needed.")
+            return failure
+        except PageErrorDetected as e:
+            logging.error(f"Error page detected at {url} ('{e}'), not waiting for the price.")
+            self._capture_failure(url, locator_info, f"error page: {e}", timings, started)
+            return failure
+        except WebDriverException as e:
+            logging.error(f"An error occurred while scraping {url}: {e}")
+            # The session may be broken, so only the metadata is captured
+            self._capture_failure(url, locator_info, f"webdriver: {e}", timings, started, with_page=False)
+            self.manager.report_failure()
+            return failure
         except Exception as e:
             logging.error(f"An error occurred while scraping {url}: {e}")
-            return "Error"
+            self._capture_failure(url, locator_info, str(e), timings, started)
+            return failure
+        finally:
+            if self.lean_mode and self.driver:
+                self._collect_lean_stats()
+            self.manager.record_page()
+
+    def _capture_failure(self, url: str, locator_info: dict, reason: str, timings: dict, started: float,
+                         with_page: bool = True):
+        """Hands a failed scrape to the failure capture, if one is configured; never raises."""
+        if not self.failures:
+            return
+        timings['total'] = time.perf_counter() - started
+        try:
+            self.failures.capture(self.driver if with_page else None, url, locator_info, reason, timings)
+        except Exception as e:
+            logging.warning(f"Could not capture the failure at {url}: {e}")
+
+    def abort(self):
+        """
+        Aborts the scrape in progress, if any, from another thread: its element wait ends at the next
+        poll and it returns its failure value. The next scrape clears the abort.
+        """
+        self._aborted.set()
+
+    def last_changed(self, url: str):
+        """When the URL's price last changed on the page; only live tabs watch for changes, so always None here."""
+        return None
+
+    def warm_up(self, url: str) -> bool:
+        """
+        Loads a page once before the first scrape, so the browser start-up, DNS, TLS and HTTP cache
+        costs are not paid by the first timed scrape.
+
+        Returns:
+            True if the page loaded; failures are only logged, the first scrape retries anyway.
+        """
+        if not self.manager.acquire():
+            return False
+        try:
+            with self.metrics.timer("warm_up"):
+                self.driver.get(url)
+            return True
+        except Exception as e:
+            logging.warning(f"Warm-up navigation to {url} failed: {e}")
+            return False
+        finally:
+            self.manager.record_page()
 
     def close(self):
-        """Closes the WebDriver session."""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None # Ensure driver is cleared after quitting
+        """Closes the WebDriver session, including any warm standby session."""
+        self.manager.close()
@@ -0,0 +1,175 @@
+import math
+import re
+import threading
+import time
+from collections import deque
+from typing import Optional
+from urllib.parse import urlsplit
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+# Text of pages that will never show a price: outages, blocks and consent walls
+DEFAULT_FAIL_FAST_PATTERNS = (
+    r"access denied",
+    r"403 forbidden",
+    r"page not found",
+    r"502 bad gateway",
+    r"service (temporarily )?unavailable",
+    r"too many requests",
+    r"are you a robot",
+    r"verify you are human",
+    r"before you continue",
+)
+
+# The title and the start of the visible text, read in one round trip
+PAGE_TEXT_SCRIPT = """
+const body = document.body ? document.body.innerText.slice(0, 2000) : '';
+return (document.title || '') + '\\n' + body;
+"""
+
+
+class PageErrorDetected(Exception):
+    """Raised when a page matches a known error or consent pattern, so waiting for the price is pointless."""
+
+
+class FetchAborted(Exception):
+    """Raised when a wait is aborted because its result is no longer needed, e.g. another source won a hedge."""
+
+
+class AdaptiveWait:
+    """
+    Derives the element wait timeout and poll frequency per domain and locator from recent
+    latencies, and fails fast on known error pages instead of waiting out the timeout.
+
+    The timeout is the recent p99 times `factor`, clamped to [floor, ceiling]. A timeout counts
+    as a sample of the full timeout, so a site that slows down gets longer waits again.
+    """
+
+    def __init__(self, factor: float = 3.0, floor: float = 2.0, ceiling: float = 15.0, min_samples: int = 5,
+                 window: int = 50, poll_min: float = 0.05, poll_max: float = 0.5,
+                 patterns=DEFAULT_FAIL_FAST_PATTERNS, check_interval: float = 0.5, clock=time.monotonic):
+        """
+        Initializes the waits.
+
+        Args:
+            factor (float): The multiple of the recent p99 used as timeout.
+            floor (float): The shortest timeout in seconds.
+            ceiling (float): The longest timeout in seconds, also used until enough samples exist.
+            min_samples (int): The samples a key needs before its timeout adapts.
+            window (int): How many recent samples are kept per key.
+            poll_min (float): The shortest poll interval in seconds.
+            poll_max (float): The longest poll interval in seconds (Selenium's default).
+            patterns (iterable): Case-insensitive regular expressions marking error pages.
+            check_interval (float): The minimum seconds between two error-page checks of one wait.
+            clock (callable): A monotonic clock returning seconds.
+        """
+        self.factor = factor
+        self.floor = floor
+        self.ceiling = ceiling
+        self.min_samples = max(1, min_samples)
+        self.window = window
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.check_interval = check_interval
+        self.clock = clock
+        self.pattern = re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE) if patterns else None
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> Optional["AdaptiveWait"]:
+        """Builds the waits from the 'adaptive_wait' config section, or returns None if it is not enabled."""
+        if not settings or not settings.get('enabled'):
+            return None
+        return cls(
+            factor=settings.get('factor', 3.0),
+            floor=settings.get('floor_seconds', 2.0),
+            ceiling=settings.get('ceiling_seconds', 15.0),
+            min_samples=settings.get('min_samples', 5),
+            window=settings.get('window', 50),
+            patterns=settings.get('fail_fast_patterns', DEFAULT_FAIL_FAST_PATTERNS),
+        )
+
+    @staticmethod
+    def key(url: str, locator_info: dict) -> tuple:
+        return (urlsplit(url).netloc, locator_info['by'], locator_info['value'])
+
+    def record(self, key: tuple, seconds: float):
+        """Adds one time-to-visible sample for a key."""
+        with self._lock:
+            samples = self._samples.get(key)
+            if samples is None:
+                samples = self._samples[key] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def _quantile(self, key: tuple, q: float) -> Optional[float]:
+        with self._lock:
+            samples = self._samples.get(key)
+            if not samples or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        return ordered[max(0, math.ceil(q * len(ordered)) - 1)]  # Nearest rank
+
+    def timeout(self, key: tuple) -> float:
+        """Returns the wait timeout for a key."""
+        p99 = self._quantile(key, 0.99)
+        if p99 is None:
+            return self.ceiling
+        return min(self.ceiling, max(self.floor, p99 * self.factor))
+
+    def poll_frequency(self, key: tuple) -> float:
+        """Returns the poll interval for a key: a quarter of the median latency, within [poll_min, poll_max]."""
+        p50 = self._quantile(key, 0.5)
+        if p50 is None:
+            return self.poll_max
+        return min(self.poll_max, max(self.poll_min, p50 / 4))
+
+    def until_visible(self, driver, url: str, locator_info: dict, abort: Optional[threading.Event] = None):
+        """
+        Waits for the located element to be visible.
+
+        Args:
+            abort (threading.Event, optional): Ends the wait early once set.
+
+        Returns:
+            The visible element.
+
+        Raises:
+            TimeoutException: If the element did not become visible within the adaptive timeout.
+            PageErrorDetected: If the page matched an error or consent pattern first.
+            FetchAborted: If `abort` was set first.
+        """
+        # Imported here: selenium's support package pulls in the whole remote WebDriver and slows startup
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        key = self.key(url, locator_info)
+        visible = EC.visibility_of_element_located((getattr(By, locator_info['by']), locator_info['value']))
+        started = self.clock()
+        next_check = [started]
+
+        def condition(driver):
+            if abort is not None and abort.is_set():
+                raise FetchAborted()
+            try:
+                element = visible(driver)
+            except (NoSuchElementException, StaleElementReferenceException):
+                element = False
+            if element or self.pattern is None:
+                return element
+            now = self.clock()
+            if now >= next_check[0]:
+                next_check[0] = now + self.check_interval
+                match = self.pattern.search(driver.execute_script(PAGE_TEXT_SCRIPT) or "")
+                if match:
+                    raise PageErrorDetected(match.group(0))
+            return False
+
+        timeout = self.timeout(key)
+        try:
+            element = WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency(key)).until(condition)
+        except TimeoutException:
+            self.record(key, timeout)
+            raise
+        self.record(key, self.clock() - started)
+        return element
@@ -0,0 +1,283 @@
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    asset TEXT PRIMARY KEY,
+    interval REAL NOT NULL,
+    due REAL NOT NULL,
+    owner TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (due);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    asset TEXT NOT NULL,
+    price REAL,
+    fields TEXT NOT NULL,
+    worker TEXT NOT NULL,
+    finished REAL NOT NULL
+);
+"""
+
+
+class WorkQueue:
+    """
+    A durable queue of scrape jobs in a SQLite file shared by one coordinator and any number
+    of worker processes on the same host.
+
+    Every asset is one job row with the time it is next due. A worker claims a due job by
+    taking a lease on it; when the lease expires before the job is completed (the worker died
+    or hung), the next claim takes the job over. Completing a job reschedules it one interval
+    after it was due, so the schedule does not drift by the scrape time, and queues its result
+    for the coordinator.
+    """
+
+    def __init__(self, path: str, lease_seconds: float = 120.0, clock=time.time):
+        """
+        Opens (and creates, if needed) the queue.
+
+        Args:
+            path (str): The SQLite file.
+            lease_seconds (float): How long a claimed job stays with its worker; keep it above the slowest scrape.
+            clock (callable): Returns the current unix time in seconds.
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.clock = clock
+        # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the write lock up front, so two workers never claim the same job
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def sync(self, intervals: dict):
+        """
+        Makes the job table match the tracked assets: new assets are due now, removed ones are dropped
+        and a shorter interval brings the next run forward. Leases and due times of other jobs are kept.
+
+        Args:
+            intervals (dict): Maps asset names to their scraping intervals in seconds.
+        """
+        now = self.clock()
+        with self._transaction() as db:
+            known = {row[0] for row in db.execute("SELECT asset FROM jobs")}
+            db.executemany("DELETE FROM jobs WHERE asset = ?", [(name,) for name in known - intervals.keys()])
+            db.executemany(
+                "INSERT INTO jobs (asset, interval, due) VALUES (?, ?, ?) "
+                "ON CONFLICT (asset) DO UPDATE SET interval = excluded.interval, due = MIN(due, ? + excluded.interval)",
+                [(name, interval, now, now) for name, interval in intervals.items()],
+            )
+
+    def claim(self, worker: str, limit: int = 1) -> list:
+        """
+        Leases up to `limit` due jobs to a worker, the longest overdue first.
+
+        Returns:
+            The names of the claimed assets.
+        """
+        now = self.clock()
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT asset, owner FROM jobs WHERE due <= ? AND (owner IS NULL OR lease_until <= ?) ORDER BY due LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            for asset, owner in rows:
+                if owner and owner != worker:
+                    logging.warning(f"Lease on {asset} held by {owner} expired; {worker} takes the job over.")
+            db.executemany(
+                "UPDATE jobs SET owner = ?, lease_until = ? WHERE asset = ?",
+                [(worker, now + self.lease_seconds, asset) for asset, _ in rows],
+            )
+        return [asset for asset, _ in rows]
+
+    def complete(self, asset: str, worker: str, result: Optional[tuple]) -> bool:
+        """
+        Releases a job, reschedules it one interval after it was due and queues its result.
+        A job that ran past its next due time skips the runs it missed instead of running
+        again at once, so it stays on its grid of due + n * interval.
+
+        Args:
+            asset (str): The asset name.
+            worker (str): The worker holding the lease.
+            result (tuple, optional): (price, fields) to hand to the coordinator; None reports nothing.
+
+        Returns:
+            False if the worker no longer held the lease (another worker took the job over), in which
+            case the result is dropped.
+        """
+        now = self.clock()
+        with self._transaction() as db:
+            updated = db.execute(
+                # The smallest due + n * interval (n >= 1) after now
+                "UPDATE jobs SET owner = NULL, lease_until = NULL, "
+                "due = due + interval * MAX(1, CAST((? - due) / interval AS INTEGER) + 1) WHERE asset = ? AND owner = ?",
+                (now, asset, worker),
+            ).rowcount
+            if updated and result is not None:
+                price, fields = result
+                db.execute(
+                    "INSERT INTO results (asset, price, fields, worker, finished) VALUES (?, ?, ?, ?, ?)",
+                    (asset, price, json.dumps(fields), worker, now),
+                )
+        if not updated:
+            logging.warning(f"{worker} lost its lease on {asset}; dropping the result.")
+        return bool(updated)
+
+    def take_results(self, limit: int = 100) -> list:
+        """
+        Removes and returns the oldest queued results.
+
+        Returns:
+            (asset, price, fields, worker) tuples in completion order.
+        """
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT id, asset, price, fields, worker FROM results ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+            if rows:
+                db.execute("DELETE FROM results WHERE id <= ?", (rows[-1][0],))
+        return [(asset, price, json.loads(fields), worker) for _, asset, price, fields, worker in rows]
+
+    def next_due(self) -> Optional[float]:
+        """Returns the unix time the next unleased job is due, or None if there are no jobs."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT MIN(CASE WHEN owner IS NULL THEN due ELSE MAX(due, lease_until) END) FROM jobs"
+            ).fetchone()
+        return row[0]
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._db.close()
+
+
+def default_worker_id() -> str:
+    """Returns an id unique to this process on this host."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class QueueWorker:
+    """
+    Claims due jobs from a WorkQueue and scrapes them, with one claim loop per session it can drive.
+    Throughput grows with the number of worker processes and the sessions (Grid nodes) behind them.
+    """
+
+    def __init__(self, queue: WorkQueue, fetch, worker_id: Optional[str] = None, threads: int = 1,
+                 idle_seconds: float = 1.0):
+        """
+        Initializes the worker.
+
+        Args:
+            queue (WorkQueue): The shared queue.
+            fetch (callable): Takes an asset name and returns (price, fields), or None to report nothing.
+            worker_id (str, optional): The name leases are taken under; defaults to host and process.
+            threads (int): How many jobs are scraped at once; match the scraper pool size.
+            idle_seconds (float): The longest sleep when no job is due.
+        """
+        self.queue = queue
+        self.fetch = fetch
+        self.worker_id = worker_id or default_worker_id()
+        self.threads = max(1, threads)
+        self.idle_seconds = idle_seconds
+
+    def run_once(self) -> bool:
+        """Claims and completes one job. Returns False if none was due."""
+        claimed = self.queue.claim(self.worker_id)
+        if not claimed:
+            return False
+        asset = claimed[0]
+        try:
+            result = self.fetch(asset)
+        except Exception as e:
+            logging.error(f"Job {asset} failed on {self.worker_id}: {e}")
+            result = None
+        self.queue.complete(asset, self.worker_id, result)
+        return True
+
+    def _loop(self, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                if self.run_once():
+                    continue
+                next_due = self.queue.next_due()
+            except sqlite3.Error as e:
+                logging.error(f"Work queue unavailable: {e}")
+                next_due = None
+            wait = self.idle_seconds if next_due is None else next_due - self.queue.clock()
+            stop.wait(min(self.idle_seconds, max(0.05, wait)))
+
+    def run(self, stop: threading.Event):
+        """Runs the claim loops until `stop` is set."""
+        loops = [
+            threading.Thread(target=self._loop, args=(stop,), name=f"queue-worker-{index}", daemon=True)
+            for index in range(self.threads)
+        ]
+        for loop in loops:
+            loop.start()
+        for loop in loops:
+            loop.join()
+
+
+class QueueCoordinator:
+    """Keeps the queue's jobs in line with the config and hands finished results to a callback."""
+
+    def __init__(self, queue: WorkQueue, on_result, poll_seconds: float = 0.5):
+        """
+        Initializes the coordinator.
+
+        Args:
+            queue (WorkQueue): The shared queue.
+            on_result (callable): Called with (asset, price, fields) for every finished job.
+            poll_seconds (float): Seconds between result polls.
+        """
+        self.queue = queue
+        self.on_result = on_result
+        self.poll_seconds = poll_seconds
+
+    def sync(self, assets):
+        """Expands the tracked assets into jobs."""
+        self.queue.sync({asset.name: asset.interval for asset in assets})
+
+    def drain(self) -> int:
+        """Delivers every queued result. Returns how many were delivered."""
+        delivered = 0
+        while True:
+            results = self.queue.take_results()
+            for asset, price, fields, _ in results:
+                try:
+                    self.on_result(asset, price, fields)
+                except Exception as e:
+                    logging.error(f"Handling the result of {asset} failed: {e}")
+            delivered += len(results)
+            if not results:
+                return delivered
+
+    def run(self, stop: threading.Event):
+        """Delivers results until `stop` is set."""
+        while not stop.wait(self.poll_seconds):
+            try:
+                self.drain()
+            except sqlite3.Error as e:
+                logging.error(f"Work queue unavailable: {e}")
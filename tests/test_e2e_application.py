@@ -39,12 +39,11 @@ def test_e2e_in_process_application_run(mocker, local_http_server, capsys):
     """
     A hybrid E2E test that runs the main application logic in-process.
     - It uses a real local webdriver to scrape a page from a real local HTTP server.
-    - It mocks external services like notifications and the main loop's sleep.
+    - It mocks external services like notifications.
     """
     # 1. Mock configuration and external services
     mock_load_json = mocker.patch('main.load_json')
     mock_notifier_class = mocker.patch('main.TelegramNotifier')
-    mock_sleep = mocker.patch('time.sleep')
 
     # 2. Define the mock configuration to use the local scraper and server
     mock_config = {
@@ -71,14 +70,19 @@ def test_e2e_in_process_application_run(mocker, local_http_server, capsys):
     mock_notifier_instance = MagicMock()
     mock_notifier_class.return_value = mock_notifier_instance
 
-    # This generator stops the main loop on the first call to time.sleep
-    # and allows subsequent calls that might occur during cleanup (e.g., in driver.quit()).
-    def sleep_generator():
-        yield KeyboardInterrupt
-        while True:
-            yield None
+    # The scheduler runs forever, so the second scrape raises KeyboardInterrupt to stop it.
+    # The first scrape goes through the real Scraper against the local server.
+    from scrapers.scraper import Scraper
+    real_scrape = Scraper.scrape
+    scrapes = []
 
-    mock_sleep.side_effect = sleep_generator()
+    def scrape_once(self, url, locator_info):
+        if scrapes:
+            raise KeyboardInterrupt
+        scrapes.append(url)
+        return real_scrape(self, url, locator_info)
+
+    mocker.patch.object(Scraper, 'scrape', scrape_once)
 
     # 4. Run the main application
     from main import main
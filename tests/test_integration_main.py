@@ -70,12 +70,11 @@ def test_main_loop_sends_alert_on_price_change(mocker):
     mock_load_json = mocker.patch('main.load_json')
     mock_scraper_class = mocker.patch('main.Scraper')
     mock_notifier_class = mocker.patch('main.TelegramNotifier')
-    mock_sleep = mocker.patch('time.sleep')
 
     # 2. Define the mock configuration
     mock_config = {
         "settings": {
-            "scraping_interval_seconds": 1,
+            "scraping_interval_seconds": 0.01,
             "selenium_hub_url": "http://fake-hub:4444"
         },
         "assets": {
@@ -94,30 +93,27 @@ def test_main_loop_sends_alert_on_price_change(mocker):
 
     # 3. Configure the mock scraper instance
     mock_scraper_instance = MagicMock()
-    # Let's simulate the price dropping
-    mock_scraper_instance.scrape.side_effect = ["65000.00", "59000.00"] 
+    # Let's simulate the price dropping. The scheduler runs forever, so the third
+    # scrape raises KeyboardInterrupt to stop it, just like Ctrl+C would.
+    mock_scraper_instance.scrape.side_effect = ["65000.00", "59000.00", KeyboardInterrupt]
     mock_scraper_class.return_value = mock_scraper_instance
 
     # 4. Configure the mock notifier instance
     mock_notifier_instance = MagicMock()
     mock_notifier_class.return_value = mock_notifier_instance
 
-    # 5. We need to stop the infinite loop. We'll patch `time.sleep` to raise an exception
-    # after a few calls, which will exit the `while True` loop.
-    mock_sleep.side_effect = [None, KeyboardInterrupt] # First call sleeps, second one stops the loop
-
-    # 6. Run the main function
+    # 5. Run the main function
     try:
         main()
     except KeyboardInterrupt:
         pass # We expect this to happen to stop the loop
 
-    # 7. Assertions
+    # 6. Assertions
     # Check that the startup alert was sent
     mock_notifier_instance.send_alert.assert_any_call("🚀 Scraper wystartował i rozpoczyna cykliczne sprawdzanie cen.")
 
-    # Check that the scraper was called twice
-    assert mock_scraper_instance.scrape.call_count == 2
+    # Check that the scraper was called on every scheduled run
+    assert mock_scraper_instance.scrape.call_count == 3
     
     # Check that the price drop triggered an alert
     expected_alert_message = "🔔 ALERT for BTC 🔔\nPrice is BELOW 60000 at 59000.0"
@@ -125,3 +121,28 @@ def test_main_loop_sends_alert_on_price_change(mocker):
     
     # Check that the scraper was closed
     mock_scraper_instance.close.assert_called_once()
+
+def test_main_loop_does_not_repeat_alert_while_price_stays_past_level(mocker):
+    """
+    Test that the main loop sends an alert once per crossing, not on every cycle
+    while the price stays below the threshold.
+    """
+    mocker.patch('main.load_json').return_value = {
+        "settings": {"scraping_interval_seconds": 0.01, "selenium_hub_url": "http://fake-hub:4444"},
+        "assets": {"CRYPTO": {"BTC": {"url": "http://fake-url.com/btc"}}},
+        "alerts": {"BTC": {"below": 60000}},
+        "locators": {"tradingview.com": {"by": "CLASS_NAME", "value": "price"}}
+    }
+    mock_scraper_instance = MagicMock()
+    mock_scraper_instance.scrape.side_effect = ["59000.00", "58000.00", "61000.00", "59500.00", KeyboardInterrupt]
+    mocker.patch('main.Scraper').return_value = mock_scraper_instance
+    mock_notifier_instance = MagicMock()
+    mocker.patch('main.TelegramNotifier').return_value = mock_notifier_instance
+
+    main()
+
+    alerts = [call.args[0] for call in mock_notifier_instance.send_alert.call_args_list if "ALERT" in call.args[0]]
+    assert alerts == [
+        "🔔 ALERT for BTC 🔔\nPrice is BELOW 60000 at 59000.0",
+        "🔔 ALERT for BTC 🔔\nPrice is BELOW 60000 at 59500.0",
+    ]
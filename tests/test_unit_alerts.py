@@ -0,0 +1,97 @@
+import pytest
+from unittest.mock import MagicMock
+from scrapers.alerts import AlertEngine, parse_rules
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_alert_fires_only_on_crossing():
+    """Test that an alert is sent once when the level is crossed, not on every tick past it."""
+    engine = AlertEngine({"BTC": {"below": 60000}})
+
+    assert engine.evaluate("BTC", 61000) == []
+    assert engine.evaluate("BTC", 59000) == ["🔔 ALERT for BTC 🔔\nPrice is BELOW 60000 at 59000"]
+    assert engine.evaluate("BTC", 58000) == []
+    assert engine.evaluate("BTC", 61000) == []
+    assert len(engine.evaluate("BTC", 59500)) == 1
+
+def test_hysteresis_band_prevents_flapping():
+    """Test that a rule re-arms only after the price moves back past the hysteresis band."""
+    engine = AlertEngine({"DINO": {"above": 1000, "hysteresis": 20}})
+
+    assert len(engine.evaluate("DINO", 1001)) == 1
+    assert engine.evaluate("DINO", 990) == []  # Inside the band, still triggered
+    assert engine.evaluate("DINO", 1005) == []
+    assert engine.evaluate("DINO", 979) == []  # Re-armed
+    assert len(engine.evaluate("DINO", 1002)) == 1
+
+def test_cooldown_suppresses_repeated_alerts():
+    """Test that a rule crossing again within its cooldown stays silent."""
+    clock = FakeClock()
+    engine = AlertEngine({"ETH": {"above": 3000, "cooldown_seconds": 600}}, clock=clock)
+
+    assert len(engine.evaluate("ETH", 3100)) == 1
+    engine.evaluate("ETH", 2900)
+    clock.now = 300
+    assert engine.evaluate("ETH", 3100) == []
+    engine.evaluate("ETH", 2900)
+    clock.now = 700
+    assert len(engine.evaluate("ETH", 3100)) == 1
+
+def test_many_rules_per_asset_fire_in_one_tick():
+    """Test that a jump across several levels fires each crossed rule once."""
+    engine = AlertEngine({"BTC": [{"above": level} for level in (70000, 71000, 72000, 80000)]})
+
+    messages = engine.evaluate("BTC", 72500)
+
+    assert len(messages) == 3
+    assert engine.evaluate("BTC", 72600) == []
+
+def test_parse_rules_supports_percentage_hysteresis():
+    """Test that 'hysteresis_pct' is converted into an absolute band."""
+    [rule] = parse_rules({"Gold": {"below": 2000, "hysteresis_pct": 1}})
+
+    assert rule.direction == "below"
+    assert rule.rearm_level == pytest.approx(2020)
+
+def test_check_sends_through_notifier():
+    """Test that check() forwards fired alerts to the notifier."""
+    notifier = MagicMock()
+    AlertEngine({"BTC": {"above": 1}}).check("BTC", 2, notifier)
+    notifier.send_alert.assert_called_once_with("🔔 ALERT for BTC 🔔\nPrice is ABOVE 1 at 2")
+
+def test_update_keeps_state_of_unchanged_rules():
+    """Test that reloading the rules does not re-send an alert whose level is still crossed."""
+    engine = AlertEngine({"BTC": {"below": 60000}})
+    assert len(engine.evaluate("BTC", 59000)) == 1
+
+    engine.update({"BTC": {"below": 60000}, "ETH": {"above": 3000}})
+
+    assert engine.evaluate("BTC", 58000) == []
+    assert len(engine.evaluate("ETH", 3100)) == 1
+
+def test_percent_change_rule_fires_on_moves_within_the_window():
+    """Test that a pct_change rule fires when the price moves more than its level inside the window."""
+    clock = FakeClock()
+    engine = AlertEngine({"BTC": {"indicator": "pct_change", "window_seconds": 3600, "above": 3, "below": -3}}, clock=clock)
+
+    assert engine.evaluate("BTC", 60000) == []
+    clock.now = 1800
+    assert engine.evaluate("BTC", 61000) == []
+    clock.now = 3000
+    assert engine.evaluate("BTC", 62000) == [
+        "🔔 ALERT for BTC 🔔\nChange % (1h) is ABOVE 3 at 3.3333 (price 62000)"
+    ]
+    clock.now = 7000  # The 60000 tick has left the window
+    assert engine.evaluate("BTC", 62100) == []
+
+def test_parse_rules_rejects_unknown_indicator_or_window():
+    """Test that indicator rules need a known indicator and a positive window."""
+    with pytest.raises(ValueError):
+        parse_rules({"BTC": {"indicator": "rsi", "window_seconds": 60, "above": 70}})
+    with pytest.raises(ValueError):
+        parse_rules({"BTC": {"indicator": "stddev", "above": 70}})
@@ -0,0 +1,115 @@
+import json
+import os
+import pytest
+from main import load_json
+from scrapers.config import AppConfig, ConfigError, ConfigWatcher, asset_interval
+
+@pytest.fixture
+def raw_config():
+    return {
+        "settings": {"scraping_interval_seconds": 900, "category_intervals": {"crypto": 30}, "selenium_hub_url": "http://hub"},
+        "assets": {"crypto": {"BTC/USDT": {"url": "https://btc"}}, "stocks": {"DINO": {"url": "https://dino", "interval_seconds": 120}}},
+        "alerts": {"BTC/USDT": {"below": 60000}},
+        "locators": {"tradingview.com": {"by": "CLASS_NAME", "value": "price", "decimal_separator": "."}},
+    }
+
+def test_from_dict_resolves_assets(raw_config):
+    """Test that every asset gets its interval, locator and decimal separator resolved up front."""
+    config = AppConfig.from_dict(raw_config)
+
+    assets = {asset.name: asset for asset in config.assets}
+    assert assets["BTC/USDT"].interval == 30
+    assert assets["DINO"].interval == 120
+    assert assets["DINO"].locator_info == {"by": "CLASS_NAME", "value": "price"}
+    assert assets["DINO"].decimal_separator == "."
+    assert config.settings.selenium_hub_url == "http://hub"
+    assert config.settings.selenium_hubs == ("http://hub",)
+
+def test_selenium_hub_url_accepts_a_list_of_hubs(raw_config):
+    """Test that several hubs can be configured, the first one standing in as selenium_hub_url."""
+    raw_config["settings"]["selenium_hub_url"] = ["http://hub-a", "http://hub-b"]
+
+    settings = AppConfig.from_dict(raw_config).settings
+
+    assert settings.selenium_hubs == ("http://hub-a", "http://hub-b")
+    assert settings.selenium_hub_url == "http://hub-a"
+
+@pytest.mark.parametrize("mutate", [
+    lambda config: config.pop("alerts"),
+    lambda config: config["settings"].pop("selenium_hub_url"),
+    lambda config: config["settings"].update(selenium_hub_url=["http://hub", ""]),
+    lambda config: config["locators"]["tradingview.com"].update(by="BY_MAGIC"),
+    lambda config: config["settings"].update(scraping_interval_seconds=0),
+    lambda config: config["settings"].update(scraping_interval_seconds="often"),
+    lambda config: config["settings"].update(scraper_pool_size=None),
+    lambda config: config["settings"].update(category_intervals={"crypto": "fast"}),
+    lambda config: config["assets"]["stocks"]["DINO"].update(interval_seconds=0),
+    lambda config: config["assets"]["stocks"]["DINO"].update(interval_seconds=-30),
+    lambda config: config["assets"]["stocks"]["DINO"].update(interval_seconds="hourly"),
+    lambda config: config["alerts"].update({"BTC/USDT": {"below": "cheap"}}),
+    lambda config: config["locators"]["tradingview.com"].update(fields={"volume": {"by": "LINK_TEXT", "value": "Vol"}}),
+])
+def test_from_dict_rejects_invalid_config(raw_config, mutate):
+    """Test that incomplete or invalid configs raise ConfigError."""
+    mutate(raw_config)
+    with pytest.raises(ConfigError):
+        AppConfig.from_dict(raw_config)
+
+@pytest.mark.parametrize("category, asset_details, expected", [
+    ("crypto", {"url": "u", "interval_seconds": 5}, 5),
+    ("crypto", {"url": "u"}, 30),
+    ("stocks", {"url": "u"}, 900),
+])
+def test_asset_interval_precedence(category, asset_details, expected):
+    """Test that an asset's own interval wins over its category's, which wins over the global one."""
+    settings = {"scraping_interval_seconds": 900, "category_intervals": {"crypto": 30}}
+    assert asset_interval(category, asset_details, settings) == expected
+
+def test_watcher_applies_valid_changes_and_ignores_invalid_ones(tmp_path, raw_config):
+    """Test that the watcher hands over a changed valid config and skips a broken one."""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(raw_config))
+    applied = []
+    watcher = ConfigWatcher(str(path), load_json, applied.append)
+
+    assert watcher.check() is False
+
+    raw_config["assets"]["crypto"]["ETH/USDT"] = {"url": "https://eth"}
+    path.write_text(json.dumps(raw_config))
+    os.utime(path, ns=(1, 1))
+    assert watcher.check() is True
+    assert [asset.name for asset in applied[0].assets] == ["BTC/USDT", "ETH/USDT", "DINO"]
+
+    raw_config.pop("locators")
+    path.write_text(json.dumps(raw_config))
+    os.utime(path, ns=(2, 2))
+    assert watcher.check() is False
+    assert len(applied) == 1
+
+def test_assets_get_trading_calendars(raw_config):
+    """Test that an asset's own calendar wins over its category's and unknown calendars are rejected."""
+    raw_config["settings"]["market_hours"] = {
+        "categories": {"stocks": "gpw"},
+        "calendars": {"gpw": {"timezone": "Europe/Warsaw", "sessions": [{"open": "09:00", "close": "17:05"}]}},
+    }
+    assets = {asset.name: asset for asset in AppConfig.from_dict(raw_config).assets}
+    assert assets["DINO"].calendar == "gpw"
+    assert assets["BTC/USDT"].calendar is None
+
+    raw_config["assets"]["crypto"]["BTC/USDT"]["calendar"] = "nyse"
+    with pytest.raises(ConfigError):
+        AppConfig.from_dict(raw_config)
+
+def test_asset_sources_use_the_locator_of_their_domain(raw_config):
+    """Test that every listed URL becomes a source whose locator is resolved from its domain."""
+    raw_config["locators"]["binance.com"] = {"by": "CSS_SELECTOR", "value": ".showPrice", "decimal_separator": ","}
+    raw_config["assets"]["crypto"]["BTC/USDT"]["urls"] = ["https://www.binance.com/en/trade/BTC_USDT", "https://other.example/btc"]
+
+    btc = next(asset for asset in AppConfig.from_dict(raw_config).assets if asset.name == "BTC/USDT")
+
+    assert [source.url for source in btc.sources] == [
+        "https://btc", "https://www.binance.com/en/trade/BTC_USDT", "https://other.example/btc"
+    ]
+    assert btc.sources[1].locator_info == {"by": "CSS_SELECTOR", "value": ".showPrice"}
+    assert btc.sources[1].decimal_separator == ","
+    assert btc.sources[2].locator_info == btc.locator_info == {"by": "CLASS_NAME", "value": "price"}
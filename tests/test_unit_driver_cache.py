@@ -0,0 +1,50 @@
+import os
+from unittest.mock import MagicMock
+from scrapers.driver_cache import DriverCache
+
+def _binary(tmp_path, name="chromedriver"):
+    path = tmp_path / name
+    path.write_text("#!/bin/sh\n")
+    os.chmod(path, 0o755)
+    return str(path)
+
+def test_resolved_driver_is_reused_until_it_expires(tmp_path):
+    """Test that the installer runs once, and again only after max_age."""
+    binary = _binary(tmp_path)
+    installer = MagicMock(return_value=binary)
+    now = [1000.0]
+    cache = DriverCache(str(tmp_path / "cache"), max_age=60, installer=installer, clock=lambda: now[0])
+
+    assert cache.resolve() == binary
+    assert DriverCache(str(tmp_path / "cache"), max_age=60, installer=installer, clock=lambda: now[0]).resolve() == binary
+    assert installer.call_count == 1
+
+    now[0] += 61
+    cache.resolve()
+    assert installer.call_count == 2
+
+def test_offline_mode_never_downloads(tmp_path, monkeypatch):
+    """Test that offline mode uses a stale cached binary, then PATH, and never calls the installer."""
+    binary = _binary(tmp_path)
+    DriverCache(str(tmp_path / "cache"), installer=lambda: binary, clock=lambda: 0.0).resolve()
+    installer = MagicMock()
+
+    stale = DriverCache(str(tmp_path / "cache"), max_age=1, offline=True, installer=installer, clock=lambda: 1e9)
+    assert stale.resolve() == binary
+
+    monkeypatch.setenv("PATH", str(tmp_path))
+    empty = DriverCache(str(tmp_path / "empty"), installer=installer)
+    empty.offline = True
+    assert empty.resolve() == binary
+    installer.assert_not_called()
+
+def test_failed_download_falls_back_to_stale_binary(tmp_path):
+    """Test that a failing installer leaves the last resolved binary in use."""
+    binary = _binary(tmp_path)
+    DriverCache(str(tmp_path / "cache"), installer=lambda: binary, clock=lambda: 0.0).resolve()
+    installer = MagicMock(side_effect=OSError("no network"))
+
+    cache = DriverCache(str(tmp_path / "cache"), max_age=1, installer=installer, clock=lambda: 1e9)
+
+    assert cache.resolve() == binary
+    installer.assert_called_once()
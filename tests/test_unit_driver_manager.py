@@ -0,0 +1,106 @@
+import pytest
+from unittest.mock import MagicMock
+from scrapers.driver_manager import DriverManager
+
+class FakeClock:
+    """A manually advanced clock for backoff and health-check timing."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def test_reconnects_after_backoff(clock):
+    """Test that a failed session creation is retried only once the backoff has elapsed."""
+    driver = MagicMock()
+    factory = MagicMock(side_effect=[None, None, driver])
+    manager = DriverManager(factory, backoff_initial=1, clock=clock)
+
+    assert manager.acquire() is None
+    assert factory.call_count == 1
+
+    clock.now = 1.0
+    assert manager.acquire() is None  # Second attempt fails, backoff doubles to 2s
+    clock.now = 2.5
+    assert manager.acquire() is None
+    clock.now = 3.0
+    assert manager.acquire() is driver
+    assert factory.call_count == 3
+
+def test_dead_session_is_replaced_after_failure_report(clock):
+    """Test that a session failing its health check is swapped for a new one."""
+    dead, fresh = MagicMock(), MagicMock()
+    dead.execute_script.side_effect = Exception("session deleted")
+    manager = DriverManager(MagicMock(side_effect=[dead, fresh]), clock=clock)
+
+    manager.report_failure()
+
+    assert manager.driver is fresh
+    assert manager.generation == 1
+
+def test_warm_standby_takes_over(clock):
+    """Test that failover uses the pre-warmed standby session instead of starting a new one."""
+    active, standby, next_standby = MagicMock(), MagicMock(), MagicMock()
+    active.execute_script.side_effect = Exception("gone")
+    factory = MagicMock(side_effect=[active, standby, next_standby])
+    manager = DriverManager(factory, warm_standby=True, clock=clock)
+
+    manager.report_failure()
+    manager._standby_thread.join()
+
+    assert manager.driver is standby
+    assert manager._standby is next_standby
+    manager.close()
+    next_standby.quit.assert_called_once()
+
+def test_reaped_standby_is_not_handed_over(clock):
+    """Test that a standby session the Grid reaped while idle is retired and a new session opened instead."""
+    active, reaped, fresh, next_standby = MagicMock(), MagicMock(), MagicMock(), MagicMock()
+    active.execute_script.side_effect = Exception("gone")
+    reaped.execute_script.side_effect = Exception("invalid session id")
+    factory = MagicMock(side_effect=[active, reaped, fresh, next_standby])
+    manager = DriverManager(factory, warm_standby=True, clock=clock)
+    manager._standby_thread.join()
+
+    manager.report_failure()
+    manager._standby_thread.join()
+
+    assert manager.driver is fresh
+    assert manager._standby is next_standby
+    manager.close()
+
+def test_session_recycled_after_page_limit(clock):
+    """Test that the session is replaced once it has served the configured number of pages."""
+    first, second = MagicMock(), MagicMock()
+    manager = DriverManager(MagicMock(side_effect=[first, second]), max_pages=3, clock=clock)
+
+    for _ in range(3):
+        manager.record_page()
+
+    assert manager.driver is second
+    assert manager.pages == 0
+
+def test_session_recycled_above_js_heap_ceiling(clock):
+    """Test that the session is replaced when Chrome reports a JS heap above the ceiling."""
+    first, second = MagicMock(), MagicMock()
+    first.execute_cdp_cmd.return_value = {"metrics": [{"name": "JSHeapTotalSize", "value": 600 * 1024 * 1024}]}
+    manager = DriverManager(MagicMock(side_effect=[first, second]), max_js_heap_mb=512, memory_check_every=2, clock=clock)
+
+    manager.record_page()
+    assert manager.driver is first
+    manager.record_page()
+    assert manager.driver is second
+
+def test_closed_manager_does_not_reconnect(clock):
+    """Test that a closed manager never opens a new session."""
+    factory = MagicMock(return_value=MagicMock())
+    manager = DriverManager(factory, clock=clock)
+    manager.close()
+
+    clock.now = 1000
+    assert manager.acquire() is None
+    assert factory.call_count == 1
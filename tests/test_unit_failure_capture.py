@@ -0,0 +1,67 @@
+import base64
+import gzip
+import json
+import os
+from unittest.mock import MagicMock
+from scrapers.failure_capture import FailureCapture, trim_page_source
+
+LOCATOR = {'by': 'CLASS_NAME', 'value': 'price'}
+
+def _driver(page="<html><script>var big = 1;</script><p>Access denied</p></html>"):
+    driver = MagicMock()
+    driver.get_screenshot_as_base64.return_value = base64.b64encode(b"PNG").decode()
+    driver.page_source = page
+    return driver
+
+def test_capture_writes_screenshot_source_and_metadata(tmp_path):
+    """Test that a capture is written off-thread as a PNG, a gzipped trimmed page and a JSON record."""
+    capture = FailureCapture(str(tmp_path), clock=lambda: 1760000000.0)
+
+    assert capture.capture(_driver(), "https://site.example/btc", LOCATOR, "timeout", {'navigate': 1.5})
+    capture.close()
+
+    names = sorted(os.listdir(tmp_path))
+    assert [name.split('.', 1)[1] for name in names] == ["html.gz", "json", "png"]
+    record = json.loads((tmp_path / names[1]).read_text(encoding='utf-8'))
+    assert record["url"] == "https://site.example/btc" and record["reason"] == "timeout"
+    assert record["timings_ms"] == {"navigate": 1500.0}
+    assert (tmp_path / record["screenshot"]).read_bytes() == b"PNG"
+    page = gzip.decompress((tmp_path / record["page_source"]).read_bytes()).decode()
+    assert "Access denied" in page and "var big" not in page
+
+def test_failures_of_one_asset_are_sampled(tmp_path):
+    """Test that repeated failures of a URL are captured once per interval, other URLs independently."""
+    now = [0.0]
+    capture = FailureCapture(str(tmp_path), min_interval=60, clock=lambda: now[0])
+    driver = _driver()
+
+    assert capture.capture(driver, "https://a.example/x", LOCATOR, "timeout")
+    assert not capture.capture(driver, "https://a.example/x", LOCATOR, "timeout")
+    assert capture.capture(driver, "https://b.example/y", LOCATOR, "timeout")
+    now[0] = 61
+    assert capture.capture(driver, "https://a.example/x", LOCATOR, "timeout")
+    capture.close()
+
+    assert driver.get_screenshot_as_base64.call_count == 3
+
+def test_ring_evicts_oldest_captures_including_earlier_runs(tmp_path):
+    """Test that the entry cap deletes the oldest captures, counting those left by a previous run."""
+    now = [0.0]
+    first = FailureCapture(str(tmp_path), max_entries=2, min_interval=0, clock=lambda: now[0])
+    for second in (1, 2):
+        now[0] = second
+        first.capture(None, "https://a.example/x", LOCATOR, "timeout")
+    first.close()
+
+    now[0] = 3
+    second = FailureCapture(str(tmp_path), max_entries=2, min_interval=0, clock=lambda: now[0])
+    second.capture(None, "https://a.example/x", LOCATOR, "timeout")
+    second.close()
+
+    assert sorted(name[:13] for name in os.listdir(tmp_path)) == ["0000000002000", "0000000003000"]
+
+def test_trim_page_source_cuts_long_pages():
+    """Test that long pages are cut with a note of how much was dropped."""
+    trimmed = trim_page_source("<style>a{}</style>" + "x" * 20, 20)
+
+    assert trimmed == "<style></style>xxxxx\n<!-- trimmed 15 characters -->"
@@ -0,0 +1,70 @@
+import os
+import pytest
+from scrapers.history import PriceHistory, RECORD
+
+@pytest.fixture
+def history(tmp_path):
+    store = PriceHistory(str(tmp_path), fsync_interval=60)
+    yield store
+    store.close()
+
+def test_append_and_latest(history):
+    """Test that the latest tick is returned after appends."""
+    history.append("BTC/USDT", 65000.0, timestamp=100.0)
+    history.append("BTC/USDT", 65100.0, timestamp=130.0)
+
+    assert history.latest("BTC/USDT") == (130.0, 65100.0)
+    assert history.latest("ETH/USDT") is None
+
+def test_asset_names_are_safe_file_names(history):
+    """Test that a slash in the asset name does not create a subdirectory."""
+    history.append("BTC/USDT", 1.0, timestamp=1.0)
+    assert os.path.dirname(history.path("BTC/USDT")) == history.directory
+    assert os.path.exists(history.path("BTC/USDT"))
+
+def test_range_is_inclusive_and_zero_copy(history):
+    """Test that range queries bisect on timestamps and return views over the mapped file."""
+    for index in range(10):
+        history.append("DINO", 400.0 + index, timestamp=index * 30.0)
+
+    series = history.range("DINO", 60.0, 150.0)
+
+    assert list(series.timestamps) == [60.0, 90.0, 120.0, 150.0]
+    assert list(series.prices) == [402.0, 403.0, 404.0, 405.0]
+    assert isinstance(series.prices, memoryview)
+    assert len(history.range("DINO", 1000.0, 2000.0)) == 0
+
+def test_downsample_builds_ohlc_buckets(history):
+    """Test that downsampling aggregates ticks into open/high/low/close buckets."""
+    for timestamp, price in [(0, 10.0), (30, 12.0), (50, 9.0), (60, 11.0), (90, 13.0)]:
+        history.append("Gold", price, timestamp=timestamp)
+
+    assert history.downsample("Gold", 0, 120, 60) == [
+        (0, 10.0, 12.0, 9.0, 9.0),
+        (60, 11.0, 13.0, 11.0, 13.0),
+    ]
+
+def test_history_survives_reopen_and_ignores_torn_record(tmp_path):
+    """Test that data is read back after a restart and a partially written record is skipped."""
+    store = PriceHistory(str(tmp_path))
+    store.append("EUR/USD", 1.08, timestamp=1.0)
+    store.append("EUR/USD", 1.09, timestamp=2.0)
+    store.close()
+
+    with open(store.path("EUR/USD"), 'ab') as f:
+        f.write(RECORD.pack(3.0, 1.1)[:5])
+
+    reopened = PriceHistory(str(tmp_path))
+    assert reopened.latest("EUR/USD") == (2.0, 1.09)
+    assert list(reopened.range("EUR/USD", 0, 10).prices) == [1.08, 1.09]
+
+    reopened.append("EUR/USD", 1.11, timestamp=4.0)
+    assert list(reopened.range("EUR/USD", 0, 10).prices) == [1.08, 1.09, 1.11]
+    reopened.close()
+
+def test_timestamps_never_go_backwards(history):
+    """Test that a clock step backwards does not break the sorted order range queries rely on."""
+    history.append("S&P 500", 5000.0, timestamp=100.0)
+    history.append("S&P 500", 5001.0, timestamp=90.0)
+
+    assert list(history.range("S&P 500", 0, 200).timestamps) == [100.0, 100.0]
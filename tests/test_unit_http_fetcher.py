@@ -0,0 +1,98 @@
+import os
+import pytest
+import requests
+from unittest.mock import MagicMock
+from scrapers.http_fetcher import HttpFetcher, FetchRouter, extract_text
+from scrapers.pool import ScraperPool
+
+E2E_PAGE = os.path.join(os.path.dirname(__file__), 'test_data', 'e2e_page.html')
+
+@pytest.fixture
+def e2e_html():
+    with open(E2E_PAGE, encoding='utf-8') as f:
+        return f.read()
+
+@pytest.mark.parametrize("locator, expected", [
+    ({'by': 'CLASS_NAME', 'value': 'price-class'}, "999.99"),
+    ({'by': 'CSS_SELECTOR', 'value': 'span.price-class'}, "999.99"),
+    ({'by': 'CSS_SELECTOR', 'value': 'p .price-class'}, "999.99"),
+    ({'by': 'TAG_NAME', 'value': 'h1'}, "Test Asset"),
+    ({'by': 'CSS_SELECTOR', 'value': 'div .price-class'}, None),
+    ({'by': 'ID', 'value': 'missing'}, None),
+    ({'by': 'XPATH', 'value': '//span'}, None),
+])
+def test_extract_text_from_server_rendered_page(e2e_html, locator, expected):
+    """Test that the HTML parser resolves supported locators and rejects the rest."""
+    assert extract_text(e2e_html, locator) == expected
+
+def test_extract_text_empty_placeholder_is_a_miss():
+    """Test that an element rendered empty (filled later by JS) counts as missing."""
+    html = '<div><span id="price"></span><img src="x.png"></div>'
+    assert extract_text(html, {'by': 'ID', 'value': 'price'}) is None
+
+def test_http_fetcher_returns_none_on_request_error(mocker):
+    """Test that network errors make the fast path miss instead of raising."""
+    fetcher = HttpFetcher()
+    mocker.patch.object(fetcher.session, 'get', side_effect=requests.exceptions.ConnectionError("down"))
+
+    assert fetcher.fetch("http://fake-url.com", {'by': 'ID', 'value': 'price'}) is None
+
+def test_http_fetcher_reads_fields_from_one_response(mocker):
+    """Test that fetch_fields extracts the price and every field from a single GET."""
+    fetcher = HttpFetcher()
+    get = mocker.patch.object(fetcher.session, 'get')
+    get.return_value.text = '<div><span id="price">1.5</span><span class="chg">+2%</span></div>'
+    fields = {'change': {'by': 'CLASS_NAME', 'value': 'chg'}, 'volume': {'by': 'ID', 'value': 'vol'}}
+
+    assert fetcher.fetch_fields("http://fake-url.com", {'by': 'ID', 'value': 'price'}, fields) == {
+        'price': "1.5", 'change': "+2%", 'volume': None,
+    }
+    get.assert_called_once()
+    assert fetcher.fetch_fields("http://fake-url.com", {'by': 'ID', 'value': 'price'},
+                                {'volume': {'by': 'XPATH', 'value': '//td'}}) is None
+
+def test_router_stops_trying_http_after_repeated_misses():
+    """Test that a URL is routed straight to Selenium once the fast path keeps missing."""
+    fetcher = MagicMock()
+    fetcher.fetch.return_value = None
+    router = FetchRouter(fetcher, miss_limit=2, probe_interval=3)
+
+    for _ in range(2):
+        assert router.prefers_http("u")
+        router.fetch("u", {})
+
+    # Two skips, then the third attempt re-probes the fast path
+    assert [router.prefers_http("u") for _ in range(3)] == [False, False, True]
+
+def test_pool_falls_back_to_selenium_when_fast_path_misses():
+    """Test that the pool uses Selenium only when the HTTP fast path cannot find the element."""
+    fetcher = MagicMock()
+    fetcher.fetch.side_effect = ["123.45", None]
+    scraper = MagicMock()
+    scraper.scrape.return_value = "678.90"
+    pool = ScraperPool("http://fake-hub:4444/wd/hub", scraper_factory=lambda _: scraper, router=FetchRouter(fetcher))
+
+    assert pool.scrape("http://a", {}) == "123.45"
+    scraper.scrape.assert_not_called()
+    assert pool.scrape("http://a", {}) == "678.90"
+    scraper.scrape.assert_called_once_with("http://a", {})
+
+    stats = pool.router.stats()["http://a"]
+    assert (stats["http_ok"], stats["http_miss"], stats["selenium_ok"]) == (1, 1, 1)
+    pool.close()
+
+def test_pool_falls_back_to_selenium_when_fast_path_finds_a_placeholder():
+    """Test that HTTP text that is not a price, as on a JS-only page, counts as a miss and goes to Selenium."""
+    fetcher = MagicMock()
+    fetcher.fetch.return_value = "—"
+    scraper = MagicMock()
+    scraper.scrape.return_value = "678.90"
+    router = FetchRouter(fetcher, miss_limit=2, is_price=lambda text: any(char.isdigit() for char in text))
+    pool = ScraperPool("http://fake-hub:4444/wd/hub", scraper_factory=lambda _: scraper, router=router)
+
+    assert [pool.scrape("http://a", {}) for _ in range(3)] == ["678.90"] * 3
+
+    stats = router.stats()["http://a"]
+    assert (stats["http_ok"], stats["http_miss"], stats["selenium_ok"]) == (0, 2, 3)
+    assert fetcher.fetch.call_count == 2
+    pool.close()
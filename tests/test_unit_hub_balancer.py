@@ -0,0 +1,101 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from scrapers.hub_balancer import HubBalancer, parse_status
+
+def _grid_status(free, busy=0, availability="UP"):
+    slots = [{"session": None}] * free + [{"session": {"sessionId": "s"}}] * busy
+    return {"value": {"ready": free > 0, "nodes": [{"availability": availability, "slots": slots}]}}
+
+class FakeHub:
+    """A stand-in Selenium hub that serves a settable /wd/hub/status."""
+
+    def __init__(self, status):
+        self.status = status
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/wd/hub/status" or hub.status is None:
+                    self.send_error(503)
+                    return
+                body = json.dumps(hub.status).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/wd/hub"
+        threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def hubs():
+    started = [FakeHub(_grid_status(free=1, busy=3)), FakeHub(_grid_status(free=4))]
+    yield started
+    for hub in started:
+        hub.close()
+
+def test_parse_status_counts_free_slots_of_healthy_nodes():
+    """Test that only slots of UP nodes count, and that hubs without node details count as one slot."""
+    status = _grid_status(free=2, busy=1)
+    status["value"]["nodes"].append({"availability": "DOWN", "slots": [{"session": None}] * 5})
+
+    assert parse_status(status) == (True, 3, 2)
+    assert parse_status({"value": {"ready": False}}) == (False, 1, 0)
+
+def test_new_sessions_go_to_the_least_loaded_hub(hubs):
+    """Test that sessions fill the hub with more free capacity first, counting sessions sent since the poll."""
+    busy, idle = hubs
+    balancer = HubBalancer([busy.url, idle.url])
+
+    chosen = [balancer.choose() for _ in range(4)]
+
+    assert chosen[:3] == [idle.url] * 3
+    assert balancer.free_slots() == 5
+    balancer.close()
+
+def test_unhealthy_hub_is_drained_and_comes_back(hubs):
+    """Test that a hub failing its /status gets no new sessions and its sessions are told to move."""
+    busy, idle = hubs
+    balancer = HubBalancer([idle.url, busy.url])
+    idle.status = None
+    balancer.poll()
+
+    assert balancer.should_move(idle.url)
+    assert {balancer.choose() for _ in range(3)} == {busy.url}
+
+    idle.status = _grid_status(free=4)
+    balancer.poll()
+    assert not balancer.should_move(idle.url)
+    assert balancer.choose() == idle.url
+    balancer.close()
+
+def test_sessions_move_off_a_hub_that_became_much_busier(hubs):
+    """Test rebalancing: a hub whose load exceeds the least loaded hub's by the margin sheds sessions."""
+    busy, idle = hubs
+    balancer = HubBalancer([busy.url, idle.url], rebalance_margin=0.5)
+
+    assert balancer.should_move(busy.url)
+    assert not balancer.should_move(idle.url)
+    balancer.close()
+
+def test_full_hub_stays_healthy_and_keeps_its_sessions(hubs):
+    """Test that a reachable hub with every slot busy (ready: false) is full, not drained."""
+    full, other = hubs
+    full.status = _grid_status(free=0, busy=2)
+    other.status = _grid_status(free=2, busy=2)
+    balancer = HubBalancer([full.url, other.url], rebalance_margin=0.5)
+
+    assert parse_status(full.status) == (True, 2, 0)
+    assert not balancer.should_move(full.url)
+    assert balancer.choose() == other.url
+    balancer.close()
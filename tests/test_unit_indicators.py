@@ -0,0 +1,51 @@
+import random
+import statistics
+import pytest
+from scrapers.indicators import RollingWindow
+
+def test_indicators_match_a_full_rescan():
+    """Test that the incremental indicators equal a recomputation over the ticks in the window."""
+    rng = random.Random(7)
+    window = RollingWindow(60)
+    ticks = []
+    for second in range(0, 600, 7):
+        price = 60000 + rng.uniform(-500, 500)
+        window.add(second, price)
+        ticks.append((second, price))
+        prices = [p for t, p in ticks if t >= second - 60]
+
+        assert window.value("sma") == pytest.approx(statistics.fmean(prices))
+        assert window.value("min") == min(prices)
+        assert window.value("max") == max(prices)
+        if len(prices) > 1:
+            assert window.value("pct_change") == pytest.approx((prices[-1] - prices[0]) / prices[0] * 100)
+            assert window.value("stddev") == pytest.approx(statistics.stdev(prices), rel=1e-6)
+
+def test_indicators_need_enough_ticks():
+    """Test that change and volatility are undefined for a single tick."""
+    window = RollingWindow(60)
+    window.add(0, 100.0)
+
+    assert window.value("sma") == window.value("ema") == 100.0
+    assert window.value("pct_change") is None
+    assert window.value("stddev") is None
+
+def test_ema_weights_ticks_by_elapsed_time():
+    """Test that the EMA moves further toward a new price the longer ago the previous tick was."""
+    quick, slow = RollingWindow(60), RollingWindow(60)
+    quick.add(0, 100.0)
+    quick.add(1, 200.0)
+    slow.add(0, 100.0)
+    slow.add(60, 200.0)
+
+    assert 100 < quick.value("ema") < slow.value("ema") < 200
+
+def test_old_ticks_leave_the_window():
+    """Test that an old extreme stops counting once it is older than the window."""
+    window = RollingWindow(10)
+    window.add(0, 500.0)
+    window.add(5, 100.0)
+    window.add(15, 110.0)
+
+    assert window.value("max") == 110.0
+    assert window.value("pct_change") == pytest.approx(10.0)
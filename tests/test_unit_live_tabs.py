@@ -0,0 +1,77 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from scrapers.live_tabs import LiveTabScraper, INSTALL_OBSERVER_SCRIPT, READ_OBSERVER_SCRIPT
+
+LOCATOR = {'by': 'CLASS_NAME', 'value': 'price'}
+
+@pytest.fixture
+def mock_driver():
+    """Fixture to mock webdriver.Remote with a driver that tracks window handles."""
+    with patch('selenium.webdriver.Remote') as mock_remote, \
+         patch('selenium.webdriver.support.ui.WebDriverWait') as mock_wait_class:
+        driver = MagicMock()
+        driver.current_window_handle = "tab-1"
+
+        def new_window(kind):
+            driver.current_window_handle = f"tab-{driver.switch_to.new_window.call_count + 1}"
+
+        driver.switch_to.new_window.side_effect = new_window
+        mock_remote.return_value = driver
+        mock_wait_class.return_value.until.return_value = MagicMock(name="element")
+        yield driver
+
+def test_first_scrape_opens_tab_and_installs_observer(mock_driver):
+    """Test that the first scrape of a URL navigates once and attaches the observer."""
+    mock_driver.execute_script.return_value = "100.5"
+    scraper = LiveTabScraper("http://fake-hub:4444/wd/hub")
+
+    assert scraper.scrape("http://a", LOCATOR) == "100.5"
+    mock_driver.get.assert_called_once_with("http://a")
+    assert mock_driver.execute_script.call_args.args[0] == INSTALL_OBSERVER_SCRIPT
+    assert scraper.tabs == {"http://a": "tab-1"}
+
+def test_later_scrapes_read_without_navigating(mock_driver):
+    """Test that repeated scrapes read the observed value instead of reloading the page."""
+    mock_driver.execute_script.side_effect = ["100.5", {"value": "101.0", "changedAt": 1700000000000}]
+    scraper = LiveTabScraper("http://fake-hub:4444/wd/hub")
+
+    scraper.scrape("http://a", LOCATOR)
+    assert scraper.scrape("http://a", LOCATOR) == "101.0"
+
+    mock_driver.get.assert_called_once()
+    assert mock_driver.execute_script.call_args.args[0] == READ_OBSERVER_SCRIPT
+    assert scraper.last_changed("http://a") == 1700000000.0
+
+def test_stale_element_reloads_tab(mock_driver):
+    """Test that a tab whose element disappeared is refreshed and observed again."""
+    mock_driver.execute_script.side_effect = ["100.5", None, "102.0"]
+    scraper = LiveTabScraper("http://fake-hub:4444/wd/hub")
+
+    scraper.scrape("http://a", LOCATOR)
+    assert scraper.scrape("http://a", LOCATOR) == "102.0"
+    mock_driver.refresh.assert_called_once()
+
+def test_each_url_gets_its_own_tab_up_to_limit(mock_driver):
+    """Test that new URLs open new tabs and the least recently used tab is closed at the limit."""
+    mock_driver.execute_script.return_value = "1"
+    scraper = LiveTabScraper("http://fake-hub:4444/wd/hub", max_tabs=2)
+
+    scraper.scrape("http://a", LOCATOR)
+    scraper.scrape("http://b", LOCATOR)
+    scraper.scrape("http://c", LOCATOR)
+
+    assert list(scraper.tabs) == ["http://b", "http://c"]
+    mock_driver.close.assert_called_once()
+
+def test_webdriver_error_closes_the_failed_tab(mock_driver):
+    """Test that a tab whose read fails is closed, not just forgotten, so its window does not leak."""
+    from selenium.common.exceptions import WebDriverException
+    mock_driver.execute_script.side_effect = ["1", "2", WebDriverException("tab crashed"), "ok"]
+    scraper = LiveTabScraper("http://fake-hub:4444/wd/hub")
+    scraper.scrape("http://a", LOCATOR)
+    scraper.scrape("http://b", LOCATOR)
+
+    assert scraper.scrape("http://a", LOCATOR) == "Error"
+
+    assert list(scraper.tabs) == ["http://b"]
+    mock_driver.close.assert_called_once()
@@ -0,0 +1,56 @@
+import json
+import logging
+import queue
+import pytest
+from scrapers.log_pipeline import DroppingQueueHandler, JsonFormatter, LogPipeline, PriceChangeFilter, log_price
+
+def price_record(asset, price):
+    record = logging.LogRecord("prices", logging.INFO, __file__, 1, f"Cena dla {asset}: {price}", None, None)
+    record.asset, record.price = asset, price
+    return record
+
+def test_json_formatter_includes_structured_fields():
+    """Test that a price record becomes one JSON line with its asset, price, latency and source."""
+    record = price_record("BTC", 60000.5)
+    record.latency_ms, record.source = 812.3, "https://btc"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "Cena dla BTC: 60000.5"
+    assert (entry["asset"], entry["price"], entry["latency_ms"], entry["source"]) == ("BTC", 60000.5, 812.3, "https://btc")
+    assert "fields" not in entry
+
+@pytest.mark.parametrize("mode, expected", [
+    ("all", [True, True, True, True, True]),
+    ("change_only", [True, False, False, True, True]),
+    ("sample", [True, False, True, True, True]),
+])
+def test_price_change_filter_modes(mode, expected):
+    """Test that unchanged prices are dropped or sampled while changes and errors always pass."""
+    price_filter = PriceChangeFilter(mode, sample_every=2)
+    records = [price_record("BTC", 1.0), price_record("BTC", 1.0), price_record("BTC", 1.0),
+               price_record("BTC", 2.0), price_record("BTC", None)]
+
+    assert [price_filter.filter(record) for record in records] == expected
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test that logging never blocks the caller when the writer falls behind."""
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    handler.handle(price_record("BTC", 1.0))
+    handler.handle(price_record("BTC", 2.0))
+
+    assert handler.dropped == 1
+
+def test_pipeline_writes_price_lines_to_rotating_json_file(tmp_path, capsys):
+    """Test that price lines go through the pipeline into the JSON file instead of stdout."""
+    pipeline = LogPipeline.from_settings({"enabled": True, "mode": "change_only", "console": False}, str(tmp_path))
+    pipeline.start()
+    try:
+        for price in (1.0, 1.0, 2.0):
+            log_price(f"Cena dla BTC: {price}", "BTC", price, latency_ms=5.0)
+    finally:
+        pipeline.stop()
+
+    lines = [json.loads(line) for line in (tmp_path / "scraper.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert [line["price"] for line in lines] == [1.0, 2.0]
+    assert capsys.readouterr().out == ""
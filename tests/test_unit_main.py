@@ -1,6 +1,17 @@
 # tests/test_unit_main.py
 import pytest
-from main import clean_price
+from unittest.mock import MagicMock
+from main import StartupTimer, apply_config, clean_price, clean_prices, fetch_price, scrape_asset, warm_up_sessions
+from scrapers.config import AppConfig
+
+def make_config(assets=None, locator=None, **settings):
+    """Builds a valid config with one stock, DINO, by default; tests pass only the parts they check."""
+    return AppConfig.from_dict({
+        "settings": {"selenium_hub_url": "http://hub", **settings},
+        "assets": assets or {"stocks": {"DINO": {"url": "d"}}},
+        "alerts": {"DINO": {"below": 1}},
+        "locators": {"tradingview.com": {"by": "ID", "value": "price", **(locator or {})}},
+    })
 
 @pytest.mark.parametrize("input_price, expected_output", [
     ("1,234.56", 1234.56),
@@ -17,3 +28,122 @@ from main import clean_price
 def test_clean_price(input_price, expected_output):
     """Test the clean_price function with various formats."""
     assert clean_price(input_price) == expected_output
+
+@pytest.mark.parametrize("input_price, decimal_separator, expected_output", [
+    ("1,234", ",", 1.234),
+    ("1,234", ".", 1234.0),
+    ("1.234", ",", 1234.0),
+    ("1.234.567,89", ",", 1234567.89),
+    ("1,234,567.89", ".", 1234567.89),
+])
+def test_clean_price_with_format_hint(input_price, decimal_separator, expected_output):
+    """Test that a decimal separator hint removes the guessing for ambiguous inputs."""
+    assert clean_price(input_price, decimal_separator) == expected_output
+
+@pytest.mark.parametrize("input_price, expected_output", [
+    ("1 234,56 zł", 1234.56),
+    ("€ 99.5", 99.5),
+    ("١٢٣", 123.0),  # Arabic-Indic digits take the slow path
+])
+def test_clean_price_non_ascii_input(input_price, expected_output):
+    """Test that currency signs, non-breaking spaces and non-ASCII digits are handled."""
+    assert clean_price(input_price) == expected_output
+
+def test_clean_prices_batch():
+    """Test that the batch API matches clean_price element by element."""
+    inputs = ["1,234.56", None, "Error", "abc", "42"]
+    assert clean_prices(inputs) == [clean_price(value) for value in inputs]
+
+def test_apply_config_reschedules_only_changed_assets():
+    """Test that a reload adds, re-times and removes jobs and swaps the alert rules in place."""
+    old = make_config({"crypto": {"BTC": {"url": "b"}, "ETH": {"url": "e"}, "SOL": {"url": "s"}}})
+    new = make_config({"crypto": {"BTC": {"url": "b"}, "ETH": {"url": "e", "interval_seconds": 10}, "ADA": {"url": "a"}}})
+    scheduler, alert_engine = MagicMock(), MagicMock()
+
+    apply_config(old, new, scheduler, lambda asset: asset.name, alert_engine)
+
+    scheduler.remove.assert_called_once_with("SOL")
+    assert sorted(call.args[0] for call in scheduler.add.call_args_list) == ["ADA", "ETH"]
+    alert_engine.update.assert_called_once_with(new.alerts)
+
+def test_scrape_asset_serves_last_price_while_market_closed(capsys):
+    """Test that a closed market is not scraped and its last known price is reported instead."""
+    asset = make_config().assets[0]
+    scraper, market = MagicMock(), MagicMock()
+    market.should_scrape.return_value = False
+    market.last_price.return_value = 412.5
+
+    scrape_asset(asset, scraper, MagicMock(), MagicMock(), market=market)
+
+    scraper.scrape.assert_not_called()
+    assert "Cena dla DINO: 412.5 (rynek zamknięty)" in capsys.readouterr().out
+
+def test_scrape_asset_reports_extra_fields(capsys):
+    """Test that locator fields are scraped with the price and numeric ones are cleaned."""
+    asset = make_config(locator={"decimal_separator": ".", "fields": {
+        "volume": {"by": "ID", "value": "vol"},
+        "status": {"by": "CSS_SELECTOR", "value": ".status", "numeric": False},
+    }}).assets[0]
+    scraper, alert_engine = MagicMock(), MagicMock()
+    scraper.scrape_fields.return_value = {"price": "412.50", "volume": "1,200", "status": "Open"}
+    scraper.last_changed.return_value = None
+
+    scrape_asset(asset, scraper, alert_engine, MagicMock())
+
+    scraper.scrape.assert_not_called()
+    alert_engine.check.assert_called_once()
+    assert "Cena dla DINO: 412.5 (volume: 1200.0, status: Open)" in capsys.readouterr().out
+
+def test_scrape_asset_reports_when_a_live_price_last_changed(capsys):
+    """Test that the time a live tab saw the price change is reported with the price."""
+    asset = make_config(locator={"decimal_separator": "."}).assets[0]
+    scraper = MagicMock()
+    scraper.scrape.return_value = "412.50"
+    scraper.last_changed.return_value = 1700000000.0
+
+    scrape_asset(asset, scraper, MagicMock(), MagicMock())
+
+    scraper.last_changed.assert_called_once_with("d")
+    assert "changed_at: 1700000000.0" in capsys.readouterr().out
+
+def test_fetch_price_works_with_a_scraper_that_only_scrapes():
+    """Test that scrapers without last_changed(), like the benchmark's HTTP-only one, still give prices."""
+    class ScrapeOnly:
+        def scrape(self, url, locator_info):
+            return "412.50"
+
+    asset = make_config(locator={"decimal_separator": "."}).assets[0]
+
+    assert fetch_price(asset, ScrapeOnly()) == (412.5, {}, "d")
+
+def test_warm_up_sessions_loads_one_page_per_site():
+    """Test that warm-up loads the first asset page of each site, and can be switched off."""
+    assets = {"stocks": {
+        "DINO": {"url": "https://a.example/dino"}, "CDR": {"url": "https://a.example/cdr"},
+        "PKO": {"url": "https://b.example/pko"},
+    }}
+    config = make_config(assets)
+    scraper = MagicMock()
+
+    warm_up_sessions(scraper, config.assets, config.settings)
+
+    urls = scraper.warm_up.call_args[0][0]
+    assert len(urls) == 2 and "https://b.example/pko" in urls
+
+    disabled = make_config(assets, startup={"warm_up": False})
+    assert warm_up_sessions(MagicMock(), disabled.assets, disabled.settings) == 0
+
+def test_startup_timer_reports_phases(caplog):
+    """Test that the startup report lists every phase and the total time."""
+    now = [0.0]
+    timer = StartupTimer(0.0, clock=lambda: now[0])
+    now[0] = 0.5
+    timer.mark("imports")
+    timer.timed("sessions", lambda: now.__setitem__(0, 3.0))
+    timer.mark("sessions_wait")
+
+    with caplog.at_level("INFO"):
+        total = timer.report()
+
+    assert total == 3.0
+    assert "Start gotowy po 3.00 s: importy 0.50 s, sesje przeglądarki (równolegle) 2.50 s, oczekiwanie na sesje 2.50 s." in caplog.text
@@ -0,0 +1,70 @@
+import datetime
+import pytest
+from zoneinfo import ZoneInfo
+from scrapers.config import Asset
+from scrapers.market_hours import MarketHours, TradingCalendar, parse_days
+
+GPW = TradingCalendar.from_dict({
+    "timezone": "Europe/Warsaw",
+    "sessions": [{"days": "mon-fri", "open": "09:00", "close": "17:05"}],
+    "holidays": ["2026-12-25"],
+    "early_closes": {"2026-12-31": "14:00"},
+})
+COMEX = TradingCalendar.from_dict({
+    "timezone": "America/New_York",
+    "sessions": [{"days": "sun-thu", "open": "18:00", "close": "17:00"}],
+})
+
+def at(zone, *args):
+    return datetime.datetime(*args, tzinfo=ZoneInfo(zone)).timestamp()
+
+def asset(name, calendar):
+    return Asset(name, "stocks", "https://example.com", 60, {"by": "ID", "value": "p"}, None, calendar, ())
+
+def test_parse_days_handles_ranges_lists_and_wrapping():
+    """Test weekday specs, including ranges that wrap past Sunday."""
+    assert parse_days("mon-fri") == {0, 1, 2, 3, 4}
+    assert parse_days("sun-thu") == {6, 0, 1, 2, 3}
+    assert parse_days("mon,wed") == {0, 2}
+    with pytest.raises(ValueError):
+        parse_days("funday")
+
+@pytest.mark.parametrize("moment, expected", [
+    ((2026, 10, 19, 10, 0), True),     # Monday morning
+    ((2026, 10, 19, 8, 59), False),    # Before the open
+    ((2026, 10, 19, 17, 5), False),    # At the close
+    ((2026, 10, 18, 12, 0), False),    # Sunday
+    ((2026, 12, 25, 12, 0), False),    # Holiday
+    ((2026, 12, 31, 13, 59), True),    # Early close day, still open
+    ((2026, 12, 31, 14, 0), False),
+])
+def test_gpw_sessions_holidays_and_early_closes(moment, expected):
+    """Test a regular weekday session in its own time zone."""
+    assert GPW.is_open(at("Europe/Warsaw", *moment)) is expected
+
+@pytest.mark.parametrize("moment, expected", [
+    ((2026, 10, 18, 18, 30), True),    # Sunday evening open
+    ((2026, 10, 19, 16, 59), True),    # Still the Sunday session
+    ((2026, 10, 19, 17, 30), False),   # Daily break
+    ((2026, 10, 23, 16, 0), True),     # Friday, the Thursday session
+    ((2026, 10, 23, 18, 30), False),   # Friday evening, no new session
+    ((2026, 10, 24, 12, 0), False),    # Saturday
+])
+def test_overnight_sessions(moment, expected):
+    """Test a session that opens in the evening and closes the next day."""
+    assert COMEX.is_open(at("America/New_York", *moment)) is expected
+
+def test_closed_market_is_scraped_only_on_heartbeat():
+    """Test that closed assets get one scrape, then only heartbeats, while 24/7 assets always run."""
+    now = [at("Europe/Warsaw", 2026, 10, 18, 12, 0)]  # Sunday
+    market = MarketHours({"gpw": GPW}, heartbeat=3600, clock=lambda: now[0])
+    dino, btc = asset("DINO", "gpw"), asset("BTC", None)
+
+    assert market.should_scrape(dino) is True
+    market.remember("DINO", 400.0)
+    now[0] += 60
+    assert market.should_scrape(dino) is False
+    assert market.should_scrape(btc) is True
+    assert market.last_price("DINO") == 400.0
+    now[0] += 3600
+    assert market.should_scrape(dino) is True
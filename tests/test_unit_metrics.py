@@ -0,0 +1,74 @@
+import threading
+import requests
+from scrapers.metrics import Metrics, MetricsServer, Histogram
+
+def test_histogram_buckets_and_quantiles():
+    """Test that observations land in the right bucket and quantiles use bucket bounds."""
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.05, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.quantile(0.5) == 0.1
+    assert histogram.quantile(0.99) == 2.0
+
+def test_track_binds_asset_per_thread():
+    """Test that timers without an explicit asset use the one bound on their own thread."""
+    metrics = Metrics()
+
+    def work(asset):
+        with metrics.track(asset):
+            with metrics.timer("navigate"):
+                pass
+            metrics.increment("scrapes", "success")
+
+    threads = [threading.Thread(target=work, args=(asset,)) for asset in ("BTC", "ETH")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    metrics.observe("notify", 0.2, asset="")
+
+    summary = metrics.summary()
+    assert set(summary) == {"BTC", "ETH", ""}
+    assert summary["BTC"]["phases"]["navigate"]["count"] == 1
+    assert summary["ETH"]["scrapes"] == {"success": 1}
+    assert metrics.asset == ""
+
+def test_render_prometheus_text():
+    """Test that histograms are cumulative and label values are escaped."""
+    metrics = Metrics(buckets=(0.1, 1.0))
+    metrics.observe("wait", 0.05, asset='S&P "500"')
+    metrics.observe("wait", 0.5, asset='S&P "500"')
+    metrics.increment("scrapes", "error", asset="BTC")
+
+    text = metrics.render()
+
+    labels = 'asset="S&P \\"500\\"",phase="wait"'
+    assert f'price_scraper_phase_seconds_bucket{{{labels},le="0.1"}} 1' in text
+    assert f'price_scraper_phase_seconds_bucket{{{labels},le="1"}} 2' in text
+    assert f'price_scraper_phase_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f'price_scraper_phase_seconds_count{{{labels}}} 2' in text
+    assert '# TYPE price_scraper_scrapes_total counter' in text
+    assert 'price_scraper_scrapes_total{asset="BTC",outcome="error"} 1' in text
+
+def test_disabled_metrics_record_nothing():
+    """Test that a disabled registry is a no-op."""
+    metrics = Metrics(enabled=False)
+    with metrics.track("BTC"), metrics.timer("navigate"):
+        metrics.increment("scrapes", "success")
+
+    assert metrics.summary() == {}
+
+def test_server_exposes_metrics():
+    """Test that the endpoint serves the registry at /metrics and nothing else."""
+    metrics = Metrics()
+    metrics.increment("scrapes", "success", asset="BTC")
+    server = MetricsServer(metrics, port=0)
+    try:
+        response = requests.get(f"http://127.0.0.1:{server.port}/metrics", timeout=5)
+        assert response.status_code == 200
+        assert 'price_scraper_scrapes_total{asset="BTC",outcome="success"} 1' in response.text
+        assert requests.get(f"http://127.0.0.1:{server.port}/", timeout=5).status_code == 404
+    finally:
+        server.close()
@@ -1,6 +1,10 @@
 # tests/test_unit_notifications.py
+import threading
+import time
 import pytest
-from scrapers.notifications import TelegramNotifier
+from unittest.mock import MagicMock
+from scrapers.metrics import Metrics
+from scrapers.notifications import FAILED, SENT, SKIPPED, TelegramNotifier, NotificationDispatcher
 
 def test_telegram_notifier_send_alert_success(mocker):
     """
@@ -15,7 +19,7 @@ def test_telegram_notifier_send_alert_success(mocker):
     
     # Initialize the notifier and send an alert
     notifier = TelegramNotifier()
-    notifier.send_alert("Test message")
+    assert notifier.send_alert("Test message") == SENT
     
     # Assert that requests.post was called once with the correct URL and payload
     expected_url = "https://api.telegram.org/botfake_token/sendMessage"
@@ -39,7 +43,7 @@ def test_telegram_notifier_send_alert_not_configured(mocker):
     
     # Initialize the notifier and attempt to send an alert
     notifier = TelegramNotifier()
-    notifier.send_alert("Test message")
+    assert notifier.send_alert("Test message") == SKIPPED
     
     # Assert that requests.post was not called
     mock_post.assert_not_called()
@@ -56,3 +60,141 @@ def test_telegram_notifier_init_warning_not_configured(mocker, caplog):
     
     # Assert that the expected warning message is in the logs
     assert "Telegram token or chat ID not set. Notifications are disabled." in caplog.text
+
+def test_telegram_notifier_returns_retry_after_on_rate_limit(mocker):
+    """
+    Test that a 429 response is not treated as a failure but returns Telegram's 'retry_after'.
+    """
+    mocker.patch('os.getenv', side_effect=lambda key: {'TELEGRAM_TOKEN': 'fake_token', 'TELEGRAM_CHAT_ID': 'fake_chat_id'}.get(key))
+    session = MagicMock()
+    session.post.return_value.status_code = 429
+    session.post.return_value.json.return_value = {"ok": False, "parameters": {"retry_after": 7}}
+
+    notifier = TelegramNotifier(session=session)
+
+    assert notifier.send_alert("Test message") == 7.0
+
+def test_telegram_notifier_reports_failed_send(mocker):
+    """Test that an HTTP error is reported as a failure instead of passing for a sent message."""
+    import requests
+    mocker.patch('os.getenv', side_effect=lambda key: {'TELEGRAM_TOKEN': 'fake_token', 'TELEGRAM_CHAT_ID': 'fake_chat_id'}.get(key))
+    session = MagicMock()
+    session.post.return_value.status_code = 500
+    session.post.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError("500 Server Error")
+
+    assert TelegramNotifier(session=session).send_alert("Test message") == FAILED
+
+def test_dispatcher_does_not_block_caller():
+    """
+    Test that send_alert returns immediately even when delivery is slow.
+    """
+    release = threading.Event()
+    notifier = MagicMock()
+    notifier.send_alert.side_effect = lambda message: release.wait(5) and None
+    dispatcher = NotificationDispatcher(notifier)
+
+    started = time.monotonic()
+    dispatcher.send_alert("one")
+    dispatcher.send_alert("two")
+    assert time.monotonic() - started < 0.1
+
+    release.set()
+    dispatcher.close()
+    assert [call.args[0] for call in notifier.send_alert.call_args_list] == ["one", "two"]
+
+def test_dispatcher_coalesces_alerts_in_window():
+    """
+    Test that alerts raised within the coalesce window are merged into one message.
+    """
+    notifier = MagicMock()
+    notifier.send_alert.return_value = None
+    dispatcher = NotificationDispatcher(notifier, coalesce_window=0.2)
+
+    dispatcher.send_alert("first")
+    dispatcher.send_alert("second")
+    dispatcher.close()
+
+    notifier.send_alert.assert_called_once_with("first\n\nsecond")
+
+def test_dispatcher_retries_after_rate_limit():
+    """
+    Test that a rate-limited message is resent after Telegram's 'retry_after'.
+    """
+    notifier = MagicMock()
+    delivered = threading.Event()
+    results = iter([0.05, SENT])
+
+    def send(message):
+        result = next(results)
+        if result == SENT:
+            delivered.set()
+        return result
+
+    notifier.send_alert.side_effect = send
+    dispatcher = NotificationDispatcher(notifier, rate_per_second=100)
+
+    dispatcher.send_alert("alert")
+    assert delivered.wait(2)  # Closing early would drop the alert instead of retrying it
+    dispatcher.close()
+
+    assert notifier.send_alert.call_count == 2
+
+def test_dispatcher_close_interrupts_a_long_retry_after():
+    """Test that closing does not wait out a long 'retry_after' and counts the alert as failed."""
+    limited = threading.Event()
+    notifier = MagicMock()
+    notifier.send_alert.side_effect = lambda message: limited.set() or 60
+    metrics = Metrics()
+    dispatcher = NotificationDispatcher(notifier, rate_per_second=100, metrics=metrics)
+
+    dispatcher.send_alert("alert")
+    assert limited.wait(2)
+    started = time.monotonic()
+    dispatcher.close()
+
+    assert time.monotonic() - started < 1
+    assert metrics.summary()[""]["notifications"] == {"rate_limited": 1, "failed": 1}
+
+def test_dispatcher_counts_sent_failed_and_skipped_apart():
+    """Test that only delivered messages count as sent; failures and an unconfigured notifier are counted apart."""
+    notifier = MagicMock()
+    notifier.send_alert.side_effect = [SENT, FAILED, SKIPPED, RuntimeError("boom")]
+    metrics = Metrics()
+    dispatcher = NotificationDispatcher(notifier, rate_per_second=100, burst=10, metrics=metrics)
+
+    for index in range(4):
+        dispatcher.send_alert(f"alert {index}")
+    dispatcher.close()
+
+    assert metrics.summary()[""]["notifications"] == {"sent": 1, "failed": 2, "skipped": 1}
+
+def test_dispatcher_drops_alerts_when_queue_is_full():
+    """
+    Test that a full queue drops new alerts instead of blocking the scraper.
+    """
+    release = threading.Event()
+    notifier = MagicMock()
+    notifier.send_alert.side_effect = lambda message: release.wait(5) and None
+    dispatcher = NotificationDispatcher(notifier, max_queue=1)
+
+    for index in range(5):
+        dispatcher.send_alert(f"alert {index}")
+
+    assert dispatcher.dropped >= 3
+    release.set()
+    dispatcher.close()
+
+def test_telegram_notifier_against_fake_api_honours_rate_limit(monkeypatch):
+    """Test that a custom API URL is used and a 429 from the fake Bot API yields its retry_after."""
+    from benchmarks.fake_telegram import FakeTelegram
+    monkeypatch.setenv('TELEGRAM_TOKEN', 'fake_token')
+    monkeypatch.setenv('TELEGRAM_CHAT_ID', '42')
+    fake = FakeTelegram(rate_per_second=0.1, burst=1)
+    try:
+        notifier = TelegramNotifier(api_url=fake.url)
+        assert notifier.send_alert("first") == SENT
+        assert notifier.send_alert("second") == 10
+        assert [(chat_id, text) for _, chat_id, text in fake.messages] == [("42", "first")]
+        assert fake.rejected == 1
+    finally:
+        fake.close()
@@ -0,0 +1,161 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from scrapers.pool import ScraperPool
+
+def test_pool_opens_configured_number_of_sessions():
+    """Test that the pool creates one scraper per configured session."""
+    factory = MagicMock()
+    pool = ScraperPool("http://fake-hub:4444/wd/hub", size=3, scraper_factory=factory)
+
+    assert factory.call_count == 3
+    factory.assert_called_with("http://fake-hub:4444/wd/hub")
+    pool.close()
+
+def test_pool_scrape_many_keeps_job_order():
+    """Test that results are returned in the same order as the submitted jobs."""
+    def factory(_):
+        scraper = MagicMock()
+        scraper.scrape.side_effect = lambda url, locator: url.upper()
+        return scraper
+
+    pool = ScraperPool("http://fake-hub:4444/wd/hub", size=2, scraper_factory=factory)
+    locator = {'by': 'CLASS_NAME', 'value': 'price'}
+    results = pool.scrape_many([("a", locator), ("b", locator), ("c", locator)])
+
+    assert results == ["A", "B", "C"]
+    pool.close()
+
+def test_pool_runs_scrapes_in_parallel():
+    """Test that two sessions scrape at the same time instead of one after another."""
+    barrier = threading.Barrier(2, timeout=5)
+
+    def factory(_):
+        scraper = MagicMock()
+        # Both scrapes must be in flight at once for the barrier to release
+        scraper.scrape.side_effect = lambda url, locator: str(barrier.wait())
+        return scraper
+
+    pool = ScraperPool("http://fake-hub:4444/wd/hub", size=2, scraper_factory=factory)
+    results = pool.scrape_many([("a", {}), ("b", {})])
+
+    assert sorted(results) == ["0", "1"]
+    pool.close()
+
+def test_pool_close_closes_every_session():
+    """Test that closing the pool quits every WebDriver session."""
+    scrapers = [MagicMock(), MagicMock()]
+    pool = ScraperPool("http://fake-hub:4444/wd/hub", size=2, scraper_factory=MagicMock(side_effect=scrapers))
+
+    pool.close()
+
+    for scraper in scrapers:
+        scraper.close.assert_called_once()
+
+@pytest.mark.parametrize("size", [0, -1])
+def test_pool_size_has_lower_bound_of_one(size):
+    """Test that an invalid pool size still opens a single session."""
+    factory = MagicMock()
+    pool = ScraperPool("http://fake-hub:4444/wd/hub", size=size, scraper_factory=factory)
+
+    assert pool.size == 1
+    assert factory.call_count == 1
+    pool.close()
+
+def make_pool(responses, size=2, hedge_after=None):
+    """Builds a pool whose scrapers answer per URL: a value, or a threading.Event to block on first."""
+    def scrape(url, locator):
+        response = responses[url]
+        if isinstance(response, threading.Event):
+            response.wait(5)
+            return "slow"
+        return response
+
+    def factory(_):
+        scraper = MagicMock()
+        scraper.scrape.side_effect = scrape
+        # Aborting ends every blocked scrape, like an aborted element wait
+        scraper.abort.side_effect = lambda: [event.set() for event in responses.values() if isinstance(event, threading.Event)]
+        return scraper
+
+    return ScraperPool("http://fake-hub:4444/wd/hub", size=size, scraper_factory=factory, hedge_after=hedge_after)
+
+def parse(index, text):
+    return None if text == "Error" else text
+
+def test_scrape_first_hedges_a_slow_primary():
+    """Test that a second source starts after the budget and its answer wins."""
+    release = threading.Event()
+    pool = make_pool({"primary": release, "backup": "101.5"}, hedge_after=0.05)
+
+    assert pool.scrape_first([("primary", {}), ("backup", {})], parse) == ("101.5", 1)
+    release.set()
+    pool.close()
+
+def test_scrape_first_aborts_the_losing_source():
+    """Test that a source still loading when another wins is aborted, so its session is freed."""
+    release = threading.Event()
+    pool = make_pool({"primary": release, "backup": "101.5"}, hedge_after=0.05)
+
+    assert pool.scrape_first([("primary", {}), ("backup", {})], parse) == ("101.5", 1)
+    assert release.is_set()
+    pool.close()
+
+def test_scrape_first_skips_the_hedge_without_an_idle_session():
+    """Test that with a single session the slow source is not hedged, as the hedge could only queue behind it."""
+    release = threading.Event()
+    pool = make_pool({"primary": release, "backup": "101.5"}, size=1, hedge_after=0.05)
+    threading.Timer(0.3, release.set).start()
+
+    assert pool.scrape_first([("primary", {}), ("backup", {})], parse) == ("slow", 0)
+    assert all(call.args[0] == "primary" for call in pool._scrapers[0].scrape.call_args_list)
+    pool.close()
+
+def test_scrape_first_fails_over_without_hedging():
+    """Test that a failed source moves on to the next one even when hedging is disabled."""
+    pool = make_pool({"primary": "Error", "backup": "99.0"})
+
+    assert pool.scrape_first([("primary", {}), ("backup", {})], parse) == ("99.0", 1)
+    assert pool.scrape_first([("backup", {}), ("primary", {})], parse) == ("99.0", 0)
+    pool.close()
+
+def test_scrape_first_returns_none_when_every_source_fails():
+    """Test that exhausting all sources gives (None, None)."""
+    pool = make_pool({"a": "Error", "b": "Error"})
+
+    assert pool.scrape_first([("a", {}), ("b", {})], parse) == (None, None)
+    pool.close()
+
+def test_pool_warm_up_visits_every_page_and_every_session():
+    """Test that warm-up spreads pages over the sessions and that every session navigates."""
+    visits = []
+
+    def factory(_):
+        scraper = MagicMock()
+        scraper.warm_up.side_effect = lambda url: visits.append((scraper, url)) or url != "bad"
+        return scraper
+
+    pool = ScraperPool("http://fake-hub:4444/wd/hub", size=3, scraper_factory=factory)
+
+    assert pool.warm_up(["a", "bad"]) == 2
+    assert {url for _, url in visits} == {"a", "bad"}
+    assert {scraper for scraper, _ in visits} == set(pool._scrapers)
+    pool.close()
+
+def test_pool_affinity_pins_each_url_to_one_session():
+    """Test that with affinity every URL is always served by the same session, URLs spread evenly."""
+    def factory(_):
+        scraper = MagicMock()
+        scraper.scrape.side_effect = lambda url, locator: url
+        scraper.last_changed.side_effect = lambda url: 1700000000.0
+        return scraper
+
+    pool = ScraperPool("http://fake-hub:4444/wd/hub", size=2, scraper_factory=factory, affinity=True)
+    pool.scrape_many([(url, {}) for url in ("a", "b", "a", "b", "c", "a")])
+
+    served = {url: {scraper for scraper in pool._scrapers
+                    if any(call.args[0] == url for call in scraper.scrape.call_args_list)} for url in "abc"}
+    assert all(len(scrapers) == 1 for scrapers in served.values())
+    assert served["a"] != served["b"]
+    assert pool.last_changed("a") == 1700000000.0 and pool.last_changed("unknown") is None
+    pool.close()
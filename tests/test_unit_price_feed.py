@@ -0,0 +1,51 @@
+import json
+import urllib.request
+from scrapers.price_feed import PriceFeed, PriceFeedServer
+
+def test_subscriber_gets_snapshot_then_filtered_ticks():
+    """Test that a new subscriber first receives the latest prices, then only the assets it asked for."""
+    feed = PriceFeed(clock=lambda: 1.0)
+    feed.publish("BTC", 60000.0)
+    feed.publish("ETH", 3000.0)
+
+    subscriber = feed.subscribe(frozenset({"BTC"}))
+    feed.publish("ETH", 3001.0)
+    feed.publish("BTC", 60001.0, {"volume": 5.0}, "https://btc")
+
+    assert subscriber.queue.get_nowait() == {"asset": "BTC", "price": 60000.0, "ts": 1.0}
+    assert subscriber.queue.get_nowait() == {
+        "asset": "BTC", "price": 60001.0, "ts": 1.0, "fields": {"volume": 5.0}, "source": "https://btc",
+    }
+    assert subscriber.queue.empty()
+
+def test_slow_subscriber_is_dropped_without_blocking_publish():
+    """Test that a full buffer disconnects its subscriber while others keep receiving ticks."""
+    feed = PriceFeed(buffer_size=2)
+    slow, fast = feed.subscribe(), feed.subscribe()
+
+    for price in (1.0, 2.0, 3.0):
+        feed.publish("BTC", price)
+        fast.queue.get_nowait()
+
+    assert slow.dropped and feed.dropped == 1
+    assert slow.queue.get_nowait() is None  # The end-of-stream marker
+    feed.publish("BTC", 4.0)
+    assert fast.queue.get_nowait()["price"] == 4.0
+
+def test_server_streams_ndjson_and_serves_snapshot():
+    """Test the HTTP endpoints: a snapshot array and an NDJSON stream starting with the snapshot."""
+    feed = PriceFeed()
+    feed.publish("BTC", 60000.0)
+    server = PriceFeedServer(feed, port=0)
+    base = f"http://127.0.0.1:{server.port}"
+    try:
+        with urllib.request.urlopen(f"{base}/snapshot?assets=BTC,ETH", timeout=5) as response:
+            assert [tick["price"] for tick in json.loads(response.read())] == [60000.0]
+
+        with urllib.request.urlopen(f"{base}/prices?assets=BTC", timeout=5) as stream:
+            assert json.loads(stream.readline())["price"] == 60000.0
+            feed.publish("ETH", 3000.0)
+            feed.publish("BTC", 60001.0)
+            assert json.loads(stream.readline())["price"] == 60001.0
+    finally:
+        server.close()
@@ -0,0 +1,75 @@
+import json
+import os
+from main import clean_price, run_replay
+from scrapers.alerts import AlertEngine
+from scrapers.config import AppConfig
+from scrapers.history import PriceHistory
+from scrapers.replay import VirtualClock, open_ticks, replay
+
+CONFIG = {
+    "settings": {"selenium_hub_url": "http://hub"},
+    "assets": {"crypto": {"BTC/USDT": {"url": "https://btc"}}, "stocks": {"DINO": {"url": "https://dino", "decimal_separator": ","}}},
+    "alerts": {"BTC/USDT": {"above": 70000, "cooldown_seconds": 3600}, "DINO": {"below": 400}},
+    "locators": {"tradingview.com": {"by": "CLASS_NAME", "value": "price"}},
+}
+
+def test_replay_merges_inputs_and_runs_cooldowns_on_virtual_time(tmp_path):
+    """Test that CSV and NDJSON ticks are merged by time and cooldowns follow the replayed timestamps."""
+    (tmp_path / "btc.csv").write_text(
+        "timestamp,asset,price\n0,BTC/USDT,69000\n100,BTC/USDT,\"71,000\"\n200,BTC/USDT,69000\n"
+        "300,BTC/USDT,71000\n4000,BTC/USDT,69000\n4100,BTC/USDT,71500\n", encoding="utf-8")
+    (tmp_path / "dino.ndjson").write_text(
+        json.dumps({"ts": "1970-01-01T00:02:30Z", "asset": "DINO", "price": "399,50"}) + "\n"
+        + json.dumps({"ts": 250, "asset": "DINO", "price": "n/a"}) + "\n", encoding="utf-8")
+    clock = VirtualClock()
+
+    report = replay(open_ticks([str(tmp_path / "btc.csv"), str(tmp_path / "dino.ndjson")]),
+                    AlertEngine(CONFIG["alerts"], clock=clock), clock, clean_price, {"DINO": ","})
+
+    assert [(ts, asset) for ts, asset, _ in report.alerts] == [(100, "BTC/USDT"), (150, "DINO"), (4100, "BTC/USDT")]
+    assert report.ticks == 8 and report.parse_errors == {"DINO": 1}
+    assert report.suppressed == 1
+
+def test_replay_reads_price_history_files(tmp_path):
+    """Test that a PriceHistory directory replays every asset in time order."""
+    history = PriceHistory(str(tmp_path))
+    for timestamp, asset, price in [(1, "BTC/USDT", 69000.0), (2, "DINO", 390.0), (3, "BTC/USDT", 70500.0)]:
+        history.append(asset, price, timestamp)
+    history.close()
+
+    assert list(open_ticks([str(tmp_path)])) == [(1, "BTC/USDT", 69000.0), (2, "DINO", 390.0), (3, "BTC/USDT", 70500.0)]
+
+def test_run_replay_parses_html_snapshots_with_asset_locators(tmp_path, capsys):
+    """Test that saved pages go through the locator and clean_price before the alert rules."""
+    for timestamp, price in [(10, "405,00"), (20, "399,90")]:
+        page = tmp_path / "DINO" / f"{timestamp}.html"
+        page.parent.mkdir(exist_ok=True)
+        page.write_text(f'<div><span class="price">{price} PLN</span></div>', encoding="utf-8")
+
+    report = run_replay(AppConfig.from_dict(CONFIG), [str(tmp_path)])
+
+    assert [(ts, asset) for ts, asset, _ in report.alerts] == [(20, "DINO")]
+    assert "Price is BELOW 400 at 399.9" in capsys.readouterr().out
+
+def test_malformed_ndjson_lines_are_skipped_and_counted(tmp_path, capsys):
+    """Test that broken JSON lines are skipped and reported instead of ending the replay."""
+    path = tmp_path / "prices.ndjson"
+    path.write_text(
+        json.dumps({"ts": 0, "asset": "BTC/USDT", "price": 71000}) + "\n{not json\n[1, 2]\n"
+        + json.dumps({"ts": "yesterday", "asset": "BTC/USDT", "price": 1}) + "\n"
+        + json.dumps({"ts": 10, "asset": "BTC/USDT", "price": 72000}) + "\n", encoding="utf-8")
+
+    report = run_replay(AppConfig.from_dict(CONFIG), [str(path)])
+
+    assert report.ticks == 2 and report.skipped == {str(path): 3}
+    assert "pominiętych rekordów: 3" in capsys.readouterr().out
+
+def test_malformed_csv_rows_are_skipped_and_counted(tmp_path):
+    """Test that rows with a bad timestamp or missing columns are skipped, and unparsable prices counted as parse errors."""
+    path = tmp_path / "prices.csv"
+    path.write_text("ts,asset,price\n0,BTC/USDT,abc\nsoon,BTC/USDT,71000\n5,BTC/USDT\n10,BTC/USDT,71000\n", encoding="utf-8")
+
+    report = run_replay(AppConfig.from_dict(CONFIG), [str(path)], as_json=True)
+
+    assert report.ticks == 2 and report.parse_errors == {"BTC/USDT": 1}
+    assert report.as_dict()["skipped_records"] == {str(path): 2}
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+import time
+from scrapers.scheduler import AssetScheduler
+
+def run_for(scheduler, seconds):
+    """Runs the scheduler for a fixed wall-clock time, then stops it."""
+    async def runner():
+        try:
+            await asyncio.wait_for(scheduler.run(), seconds)
+        except asyncio.TimeoutError:
+            pass
+    asyncio.run(runner())
+    scheduler.close()
+
+def test_jobs_run_on_their_own_intervals():
+    """Test that a fast job runs more often than a slow one."""
+    scheduler = AssetScheduler(max_concurrency=2)
+    calls = {"fast": 0, "slow": 0}
+    scheduler.add("fast", 0.02, lambda: calls.__setitem__("fast", calls["fast"] + 1))
+    scheduler.add("slow", 1.0, lambda: calls.__setitem__("slow", calls["slow"] + 1))
+
+    run_for(scheduler, 0.3)
+
+    assert calls["slow"] == 1
+    assert calls["fast"] >= 5
+
+def test_overdue_runs_are_skipped_not_piled_up():
+    """Test that a job slower than its interval skips missed slots instead of queueing them."""
+    scheduler = AssetScheduler()
+    scheduler.add("slow-job", 0.01, lambda: time.sleep(0.05))
+
+    run_for(scheduler, 0.3)
+
+    job = scheduler.jobs["slow-job"]
+    assert job.skipped > 0
+    assert job.runs <= 7
+
+def test_concurrency_is_bounded():
+    """Test that no more than max_concurrency jobs run at the same time."""
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def job():
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.02)
+        with lock:
+            state["running"] -= 1
+
+    scheduler = AssetScheduler(max_concurrency=2)
+    for index in range(5):
+        scheduler.add(f"asset-{index}", 0.05, job)
+
+    run_for(scheduler, 0.2)
+
+    assert state["peak"] == 2
+
+def test_failing_job_is_rescheduled(caplog):
+    """Test that an exception in one run does not stop the job from running again."""
+    scheduler = AssetScheduler()
+    calls = []
+
+    def job():
+        calls.append(1)
+        raise RuntimeError("boom")
+
+    scheduler.add("broken", 0.02, job)
+    run_for(scheduler, 0.15)
+
+    assert len(calls) >= 2
+    assert "Job broken failed: boom" in caplog.text
+
+def test_removed_job_stops_running():
+    """Test that removing a job drops it from the schedule."""
+    scheduler = AssetScheduler()
+    calls = []
+    scheduler.add("gone", 0.01, lambda: calls.append(1))
+    scheduler.remove("gone")
+
+    run_for(scheduler, 0.05)
+
+    assert calls == []
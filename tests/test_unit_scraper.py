@@ -1,4 +1,5 @@
 # tests/test_unit_scraper.py
+import json
 import pytest
 from unittest.mock import MagicMock, patch
 from selenium.common.exceptions import TimeoutException, WebDriverException
@@ -48,7 +49,7 @@ def test_scraper_scrape_success(mock_webdriver):
     mock_wait = MagicMock()
     mock_wait.until.return_value = mock_element
     
-    with patch('scrapers.scraper.WebDriverWait', return_value=mock_wait) as mock_WebDriverWait:
+    with patch('selenium.webdriver.support.ui.WebDriverWait', return_value=mock_wait) as mock_WebDriverWait:
         scraper = Scraper("http://fake-hub:4444/wd/hub")
         
         # Call the scrape method
@@ -68,7 +69,7 @@ def test_scraper_scrape_timeout(mock_webdriver, caplog):
     mock_wait = MagicMock()
     mock_wait.until.side_effect = TimeoutException("Element not found")
     
-    with patch('scrapers.scraper.WebDriverWait', return_value=mock_wait):
+    with patch('selenium.webdriver.support.ui.WebDriverWait', return_value=mock_wait):
         scraper = Scraper("http://fake-hub:4444/wd/hub")
         result = scraper.scrape("http://fake-url.com", {'by': 'ID', 'value': 'price'})
         
@@ -95,3 +96,154 @@ def test_scrape_with_no_driver(caplog):
         
         assert result == "Error"
         assert "WebDriver not available. Scraping aborted." in caplog.text
+
+LEAN_MODE = {
+    "enabled": True,
+    "page_load_strategy": "eager",
+    "disable_images": True,
+    "blocked_resource_types": ["Font"],
+    "blocked_url_patterns": ["*analytics*"],
+}
+
+def test_scraper_lean_mode_options(mock_webdriver):
+    """Test that lean mode relaxes the page-load strategy, disables images and blocks resources."""
+    mock_remote, mock_driver_instance = mock_webdriver
+    Scraper("http://fake-hub:4444/wd/hub", lean_mode=LEAN_MODE)
+
+    options = mock_remote.call_args.kwargs['options']
+    assert options.page_load_strategy == "eager"
+    assert "--blink-settings=imagesEnabled=false" in options.arguments
+
+    blocked = mock_driver_instance.execute_cdp_cmd.call_args_list[-1].args
+    assert blocked[0] == "Network.setBlockedURLs"
+    assert "*analytics*" in blocked[1]["urls"]
+    assert "*.woff2" in blocked[1]["urls"]
+
+def test_scraper_lean_mode_disabled_by_default(mock_webdriver):
+    """Test that the default scraper keeps the normal page-load strategy and blocks nothing."""
+    mock_remote, mock_driver_instance = mock_webdriver
+    Scraper("http://fake-hub:4444/wd/hub", lean_mode={"enabled": False, "page_load_strategy": "none"})
+
+    assert mock_remote.call_args.kwargs['options'].page_load_strategy == "normal"
+    mock_driver_instance.execute_cdp_cmd.assert_not_called()
+
+def test_scraper_lean_mode_counts_blocked_requests(mock_webdriver):
+    """Test that blocked and downloaded requests are read from the performance log after a scrape."""
+    _, mock_driver_instance = mock_webdriver
+
+    def log_entry(method, **params):
+        return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+    mock_driver_instance.execute.return_value = {"value": [
+        log_entry("Network.loadingFailed", blockedReason="inspector", type="Font"),
+        log_entry("Network.loadingFailed", errorText="net::ERR_FAILED", type="Script"),
+        log_entry("Network.loadingFinished", encodedDataLength=2048),
+    ]}
+    mock_wait = MagicMock()
+    mock_wait.until.return_value.text = "1.0"
+
+    with patch('selenium.webdriver.support.ui.WebDriverWait', return_value=mock_wait):
+        scraper = Scraper("http://fake-hub:4444/wd/hub", lean_mode=LEAN_MODE)
+        scraper.scrape("http://fake-url.com", {'by': 'ID', 'value': 'price'})
+
+    assert scraper.lean_stats == {"requests_blocked": 1, "bytes_avoided_estimate": 25000, "bytes_downloaded": 2048}
+
+def test_scrape_records_phase_timings(mock_webdriver):
+    """Test that navigate, wait and extract are timed under the asset bound by the caller."""
+    from scrapers.metrics import Metrics
+    mock_wait = MagicMock()
+    mock_wait.until.return_value = MagicMock(text="1.0")
+    metrics = Metrics()
+
+    with patch('selenium.webdriver.support.ui.WebDriverWait', return_value=mock_wait):
+        scraper = Scraper("http://fake-hub:4444/wd/hub", metrics=metrics)
+        with metrics.track("BTC"):
+            scraper.scrape("http://fake-url.com", {'by': 'CLASS_NAME', 'value': 'price'})
+
+    assert set(metrics.summary()["BTC"]["phases"]) == {"navigate", "wait", "extract", "cycle"}
+
+def test_scrape_error_page_fails_fast_without_recycling_session(mock_webdriver):
+    """Test that a detected error page returns "Error" and keeps the session."""
+    from scrapers.waits import PageErrorDetected
+    waits = MagicMock()
+    waits.until_visible.side_effect = PageErrorDetected("Access Denied")
+    scraper = Scraper("http://fake-hub:4444/wd/hub", waits=waits)
+    scraper.manager.report_failure = MagicMock()
+
+    assert scraper.scrape("http://fake-url.com", {'by': 'CLASS_NAME', 'value': 'price'}) == "Error"
+    scraper.manager.report_failure.assert_not_called()
+
+def test_abort_ends_the_element_wait_without_a_failure(mock_webdriver):
+    """Test that an aborted scrape stops waiting, returns "Error" and is neither captured nor a session failure."""
+    mock_wait = MagicMock()
+    failures = MagicMock()
+
+    with patch('selenium.webdriver.support.ui.WebDriverWait', return_value=mock_wait):
+        scraper = Scraper("http://fake-hub:4444/wd/hub", failures=failures)
+        scraper.manager.report_failure = MagicMock()
+
+        def until(condition):
+            scraper.abort()  # As another thread would, while the wait polls
+            return condition(scraper.driver)
+
+        mock_wait.until.side_effect = until
+        assert scraper.scrape("http://fake-url.com", {'by': 'CLASS_NAME', 'value': 'price'}) == "Error"
+
+        # The next scrape is not aborted
+        mock_wait.until.side_effect = None
+        mock_wait.until.return_value = MagicMock(text="1.0")
+        assert scraper.scrape("http://fake-url.com", {'by': 'CLASS_NAME', 'value': 'price'}) == "1.0"
+
+    failures.capture.assert_not_called()
+    scraper.manager.report_failure.assert_not_called()
+
+def test_scrape_fields_reads_every_field_in_one_round_trip(mock_webdriver):
+    """Test that the price and all fields come from one navigation and one script call."""
+    _, mock_driver_instance = mock_webdriver
+    mock_driver_instance.execute_script.return_value = {"price": "1.0", "volume": "12K"}
+    mock_wait = MagicMock()
+    mock_wait.until.return_value = MagicMock(text="1.0")
+
+    with patch('selenium.webdriver.support.ui.WebDriverWait', return_value=mock_wait):
+        scraper = Scraper("http://fake-hub:4444/wd/hub")
+        record = scraper.scrape_fields("http://fake-url.com", {'by': 'ID', 'value': 'price'},
+                                       {"volume": {'by': 'XPATH', 'value': '//td[2]'}})
+
+    assert record == {"price": "1.0", "volume": "12K"}
+    mock_driver_instance.get.assert_called_once_with("http://fake-url.com")
+    mock_driver_instance.execute_script.assert_called_once()
+    assert mock_driver_instance.execute_script.call_args.args[1] == [["price", "ID", "price"], ["volume", "XPATH", "//td[2]"]]
+
+def test_scrape_timeout_is_handed_to_failure_capture(mock_webdriver):
+    """Test that a timed-out scrape is captured with its URL, locator and timings."""
+    _, mock_driver_instance = mock_webdriver
+    mock_wait = MagicMock()
+    mock_wait.until.side_effect = TimeoutException("timeout")
+    failures = MagicMock()
+
+    with patch('selenium.webdriver.support.ui.WebDriverWait', return_value=mock_wait):
+        scraper = Scraper("http://fake-hub:4444/wd/hub", failures=failures)
+        result = scraper.scrape("http://fake-url.com", {'by': 'CLASS_NAME', 'value': 'price'})
+
+    assert result == "Error"
+    driver, url, locator, reason, timings = failures.capture.call_args[0]
+    assert driver is mock_driver_instance and url == "http://fake-url.com" and reason == "timeout"
+    assert set(timings) == {"navigate", "total"}
+
+def test_scraper_opens_sessions_on_the_chosen_hub_and_moves_off_drained_ones(mock_webdriver):
+    """Test that the balancer picks the hub of each session and a drained hub's session is replaced."""
+    mock_remote, _ = mock_webdriver
+    mock_remote.side_effect = lambda **kwargs: MagicMock()
+    hubs = MagicMock()
+    hubs.choose.side_effect = ["http://hub-a/wd/hub", "http://hub-b/wd/hub"]
+    hubs.should_move.side_effect = lambda hub: hub == "http://hub-a/wd/hub"
+
+    with patch('selenium.webdriver.support.ui.WebDriverWait'):
+        scraper = Scraper("http://hub-a/wd/hub", hubs=hubs)
+        assert scraper.hub == "http://hub-a/wd/hub"
+        scraper.scrape("http://fake-url.com", {'by': 'CLASS_NAME', 'value': 'price'})
+
+    assert scraper.hub == "http://hub-b/wd/hub"
+    assert [call.kwargs['command_executor'] for call in mock_remote.call_args_list] == [
+        "http://hub-a/wd/hub", "http://hub-b/wd/hub",
+    ]
@@ -0,0 +1,77 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from scrapers.waits import AdaptiveWait, FetchAborted, PageErrorDetected
+
+LOCATOR = {'by': 'CLASS_NAME', 'value': 'price'}
+KEY = AdaptiveWait.key("https://www.tradingview.com/symbols/BTCUSD/", LOCATOR)
+
+def test_timeout_starts_at_ceiling_and_adapts_within_bounds():
+    """Test that the timeout uses the ceiling until enough samples exist, then p99 x factor clamped."""
+    waits = AdaptiveWait(factor=3, floor=2, ceiling=15, min_samples=3)
+    assert waits.timeout(KEY) == 15
+    assert waits.poll_frequency(KEY) == 0.5
+
+    for seconds in (0.8, 1.0, 1.2):
+        waits.record(KEY, seconds)
+    assert waits.timeout(KEY) == pytest.approx(3.6)
+    assert waits.poll_frequency(KEY) == pytest.approx(0.25)
+
+    for _ in range(3):
+        waits.record(KEY, 0.1)
+    assert waits.timeout(("other.com", "ID", "x")) == 15
+
+def test_timeouts_widen_the_next_wait():
+    """Test that a timeout is recorded as a full-length sample, so a slowed site gets longer waits."""
+    waits = AdaptiveWait(factor=3, floor=1, ceiling=15, min_samples=1)
+    waits.record(KEY, 1.0)
+    assert waits.timeout(KEY) == 3.0
+
+    waits.record(KEY, waits.timeout(KEY))
+    assert waits.timeout(KEY) == 9.0
+
+def test_until_visible_returns_element_and_records_latency():
+    """Test that a visible element is returned and its wait becomes a sample."""
+    element = MagicMock()
+    element.is_displayed.return_value = True
+    driver = MagicMock()
+    driver.find_element.return_value = element
+    waits = AdaptiveWait(min_samples=1)
+
+    assert waits.until_visible(driver, "https://www.tradingview.com/symbols/BTCUSD/", LOCATOR) is element
+    assert waits.timeout(KEY) == waits.floor
+
+def test_until_visible_fails_fast_on_consent_page():
+    """Test that a known consent wall raises at once instead of waiting for the timeout."""
+    driver = MagicMock()
+    driver.find_element.side_effect = NoSuchElementException()
+    driver.execute_script.return_value = "Before you continue to Google\nWe use cookies"
+    waits = AdaptiveWait(ceiling=15)
+
+    with pytest.raises(PageErrorDetected, match="(?i)before you continue"):
+        waits.until_visible(driver, "https://www.tradingview.com/symbols/BTCUSD/", LOCATOR)
+    driver.find_element.assert_called_once()
+
+def test_until_visible_stops_when_aborted():
+    """Test that an aborted wait ends at once and is not recorded as a latency sample."""
+    driver = MagicMock()
+    abort = threading.Event()
+    abort.set()
+    waits = AdaptiveWait(min_samples=1)
+
+    with pytest.raises(FetchAborted):
+        waits.until_visible(driver, "https://www.tradingview.com/symbols/BTCUSD/", LOCATOR, abort=abort)
+    driver.find_element.assert_not_called()
+    assert waits.timeout(KEY) == waits.ceiling
+
+def test_until_visible_times_out_on_unknown_page():
+    """Test that a page without the element and without error text still times out."""
+    driver = MagicMock()
+    driver.find_element.side_effect = NoSuchElementException()
+    driver.execute_script.return_value = "Loading..."
+    waits = AdaptiveWait(floor=0.1, ceiling=0.1, poll_min=0.01, poll_max=0.01)
+
+    with pytest.raises(TimeoutException):
+        waits.until_visible(driver, "https://www.tradingview.com/symbols/BTCUSD/", LOCATOR)
+    assert waits.timeout(KEY) == 0.1
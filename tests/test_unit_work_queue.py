@@ -0,0 +1,115 @@
+import threading
+import pytest
+from scrapers.work_queue import QueueCoordinator, QueueWorker, WorkQueue
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = WorkQueue(str(tmp_path / "queue.db"), lease_seconds=60, clock=clock)
+    yield queue
+    queue.close()
+
+def test_claimed_job_is_leased_once_and_rescheduled_on_completion(queue, clock):
+    """Test that a due job goes to one worker and is due again one interval after completion."""
+    queue.sync({"BTC": 30, "ETH": 60})
+
+    assert queue.claim("w1", limit=1) == ["BTC"]
+    assert queue.claim("w2", limit=5) == ["ETH"]
+    assert queue.claim("w3") == []
+
+    assert queue.complete("BTC", "w1", (60000.0, {}))
+    assert queue.next_due() == clock.now + 30
+    clock.now += 30
+    assert queue.claim("w3") == ["BTC"]
+
+def test_completion_keeps_due_times_on_the_interval_grid(queue, clock):
+    """Test that slow and late jobs are rescheduled on due + n * interval, not one interval after they finished."""
+    queue.sync({"BTC": 30})
+
+    queue.claim("w1")
+    clock.now += 5
+    queue.complete("BTC", "w1", None)
+    assert queue.next_due() == 1030
+
+    clock.now = 1032
+    queue.claim("w1")
+    clock.now = 1075  # Ran past the next due time at 1060
+    queue.complete("BTC", "w1", None)
+    assert queue.next_due() == 1090
+
+    clock.now = 1090
+    queue.claim("w1")
+    clock.now = 1120  # Finished exactly on the next due time, which is then already past
+    queue.complete("BTC", "w1", None)
+    assert queue.next_due() == 1150
+
+def test_expired_lease_is_taken_over_and_late_result_dropped(queue, clock):
+    """Test that a dead worker's job moves to another worker and its late completion is rejected."""
+    queue.sync({"BTC": 30})
+    queue.claim("dead")
+
+    clock.now += 61
+    assert queue.claim("alive") == ["BTC"]
+    assert not queue.complete("BTC", "dead", (1.0, {}))
+    assert queue.complete("BTC", "alive", (2.0, {"volume": 5.0}))
+    assert queue.take_results() == [("BTC", 2.0, {"volume": 5.0}, "alive")]
+    assert queue.take_results() == []
+
+def test_sync_keeps_schedules_and_drops_removed_assets(queue, clock):
+    """Test that re-syncing keeps due times, drops removed assets and pulls shortened intervals forward."""
+    queue.sync({"BTC": 300, "ETH": 300})
+    queue.claim("w1", limit=2)
+    queue.complete("BTC", "w1", None)
+    queue.complete("ETH", "w1", None)
+
+    queue.sync({"BTC": 300, "SOL": 300})
+    assert queue.claim("w1", limit=5) == ["SOL"]
+    queue.sync({"BTC": 10})
+    clock.now += 10
+    assert queue.claim("w1", limit=5) == ["BTC"]
+    assert queue.take_results() == []
+
+def test_jobs_survive_reopening_the_queue(tmp_path, clock):
+    """Test that leases and schedules are durable across processes opening the same file."""
+    path = str(tmp_path / "queue.db")
+    first = WorkQueue(path, lease_seconds=60, clock=clock)
+    first.sync({"BTC": 30})
+    first.claim("w1")
+    first.close()
+
+    second = WorkQueue(path, lease_seconds=60, clock=clock)
+    assert second.claim("w2") == []
+    assert second.complete("BTC", "w1", (1.0, {}))
+    second.close()
+
+def test_workers_and_coordinator_process_every_asset(tmp_path):
+    """Test that workers scrape every job once and the coordinator receives every result."""
+    queue = WorkQueue(str(tmp_path / "queue.db"))
+    queue.sync({f"A{index}": 3600 for index in range(20)})
+    scraped = []
+    lock = threading.Lock()
+
+    def fetch(name):
+        with lock:
+            scraped.append(name)
+        return (1.0, {})
+
+    for worker_id in ("w1", "w2"):
+        worker = QueueWorker(queue, fetch, worker_id)
+        while worker.run_once():
+            pass
+    received = []
+    QueueCoordinator(queue, lambda asset, price, fields: received.append(asset)).drain()
+    queue.close()
+
+    assert sorted(scraped) == sorted(received) == sorted(f"A{index}" for index in range(20))